@@ -0,0 +1,167 @@
+# file algorithms/all_pairs.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .dijkstra import dijkstra_distances_csr
+
+
+class NegativeCycleError(ValueError):
+    """Đồ thị có chu trình âm -> khoảng cách ngắn nhất không xác định."""
+
+
+class DistanceMatrix:
+    """
+    Ma trận khoảng cách mọi cặp đỉnh.
+    - matrix:   float64[n, n], hàng/cột theo thứ tự csr.node_ids (inf: không tới được)
+    - node_ids: ID đỉnh của từng hàng/cột
+    - method:   thuật toán đã dùng ("floyd_warshall" / "dijkstra" / "johnson")
+    """
+
+    def __init__(self, node_ids, matrix, method):
+        self.node_ids = node_ids
+        self.matrix = matrix
+        self.method = method
+
+    def __len__(self):
+        return self.matrix.size
+
+    def rows_to_json(self, row_start, row_count, integer=False):
+        """Một khối hàng dạng list lồng nhau (null = không tới được) để trả JSON từng phần."""
+        block = self.matrix[row_start:row_start + row_count]
+        finite = np.isfinite(block)
+        values = np.where(finite, block, 0)
+        if integer:
+            values = values.astype(np.int64)
+        return [
+            [v if ok else None for v, ok in zip(row, mask)]
+            for row, mask in zip(values.tolist(), finite.tolist())
+        ]
+
+    def to_bytes(self):
+        """
+        Dạng nhị phân gọn (little-endian):
+        b"APSP" | uint32 n | int64[n] node_ids | float64[n*n] ma trận theo hàng.
+        """
+        n = len(self.node_ids)
+        return b"".join([
+            b"APSP",
+            np.uint32(n).astype('<u4').tobytes(),
+            self.node_ids.astype('<i8').tobytes(),
+            np.ascontiguousarray(self.matrix, dtype='<f8').tobytes(),
+        ])
+
+
+def all_pairs_shortest_paths(csr, method='auto', workers=None, dense_ratio=0.1, floyd_max_vertices=3000):
+    """
+    Khoảng cách ngắn nhất giữa mọi cặp đỉnh. method:
+    - "floyd_warshall": O(n^3) nhưng vector hóa từng bước k bằng NumPy, hợp với đồ thị dày.
+    - "dijkstra": chạy Dijkstra từ mọi đỉnh, chia đều cho nhiều tiến trình (đồ thị thưa).
+    - "johnson": như "dijkstra" sau khi hiệu chỉnh trọng số âm bằng Bellman-Ford.
+    - "auto": có trọng số âm -> johnson; dày (m >= dense_ratio * n^2) và
+      n <= floyd_max_vertices -> floyd_warshall; còn lại -> dijkstra.
+    Trả về DistanceMatrix. Chu trình âm -> NegativeCycleError.
+    """
+    n, m = csr.num_vertices, csr.num_edges
+    has_negative = bool(m) and csr.weights.min() < 0
+
+    if method == 'auto':
+        if has_negative:
+            method = 'johnson'
+        elif n <= floyd_max_vertices and m >= dense_ratio * n * n:
+            method = 'floyd_warshall'
+        else:
+            method = 'dijkstra'
+
+    if method == 'floyd_warshall':
+        matrix = floyd_warshall_numpy(csr)
+    elif method == 'johnson' or (method == 'dijkstra' and has_negative):
+        method = 'johnson'
+        matrix = johnson(csr, workers)
+    elif method == 'dijkstra':
+        matrix = repeated_dijkstra(csr, workers=workers)
+    else:
+        raise ValueError(f"Unknown all-pairs method: {method}")
+    return DistanceMatrix(csr.node_ids, matrix, method)
+
+
+def floyd_warshall_numpy(csr):
+    """Floyd-Warshall: với mỗi k, cập nhật cả ma trận D = min(D, D[:, k] + D[k, :]) một lần."""
+    n = csr.num_vertices
+    dist = np.full((n, n), np.inf)
+    # Cạnh song song: giữ trọng số nhỏ nhất
+    np.minimum.at(dist, (csr.src, csr.dst), csr.weights)
+    if not csr.is_directed:
+        np.minimum.at(dist, (csr.dst, csr.src), csr.weights)
+    np.fill_diagonal(dist, np.minimum(dist.diagonal(), 0))
+
+    for k in range(n):
+        np.minimum(dist, dist[:, k:k + 1] + dist[k:k + 1, :], out=dist)
+
+    if np.any(dist.diagonal() < 0):
+        raise NegativeCycleError("Graph contains a negative cycle.")
+    return dist
+
+
+# --- Dijkstra lặp song song (tiến trình con dùng chung đồ thị qua initializer) ---
+_worker_graph = None
+_worker_weights = None
+
+
+def _init_worker(csr, slot_weights):
+    global _worker_graph, _worker_weights
+    _worker_graph, _worker_weights = csr, slot_weights
+
+
+def _distance_rows(sources):
+    return np.vstack([dijkstra_distances_csr(_worker_graph, s, _worker_weights) for s in sources])
+
+
+def repeated_dijkstra(csr, slot_weights=None, workers=None):
+    """Dijkstra từ mọi đỉnh; chia nguồn thành các khối và chạy trên nhiều tiến trình."""
+    n = csr.num_vertices
+    if n == 0:
+        return np.empty((0, 0))
+    workers = workers or os.cpu_count() or 1
+    chunks = np.array_split(np.arange(n), min(n, workers * 4))
+
+    if workers == 1 or n < 64:
+        _init_worker(csr, slot_weights)
+        rows = [_distance_rows(chunk.tolist()) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(csr, slot_weights)) as pool:
+            rows = list(pool.map(_distance_rows, [chunk.tolist() for chunk in chunks]))
+    return np.vstack(rows)
+
+
+def bellman_ford_potentials(csr):
+    """
+    Thế vị h của Johnson: khoảng cách từ một đỉnh ảo nối tới mọi đỉnh với trọng số 0,
+    tính bằng Bellman-Ford nới lỏng toàn bộ cạnh mỗi vòng (vector hóa).
+    """
+    n = csr.num_vertices
+    h = np.zeros(n)
+    src, dst, w = csr.src, csr.dst, csr.weights
+    if not csr.is_directed:
+        src, dst, w = np.concatenate([src, dst]), np.concatenate([dst, src]), np.concatenate([w, w])
+
+    for _ in range(n):
+        candidate = h[src] + w
+        updated = h.copy()
+        np.minimum.at(updated, dst, candidate)
+        if np.array_equal(updated, h):
+            return h
+        h = updated
+    raise NegativeCycleError("Graph contains a negative cycle.")
+
+
+def johnson(csr, workers=None):
+    """Johnson: hiệu chỉnh w'(u, v) = w + h(u) - h(v) >= 0, Dijkstra lặp, rồi trả lại độ dài gốc."""
+    h = bellman_ford_potentials(csr)
+    tails = np.repeat(np.arange(csr.num_vertices), np.diff(csr.offsets))
+    reweighted = csr.slot_weights + h[tails] - h[csr.targets]
+    np.maximum(reweighted, 0, out=reweighted) # Khử sai số làm tròn
+    dist = repeated_dijkstra(csr, reweighted, workers)
+    return dist - h[:, None] + h[None, :]
@@ -0,0 +1,108 @@
+# file algorithms/batch.py
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .bfs import bfs_csr
+from .dfs import dfs_csr
+from .dijkstra import dijkstra_csr, dijkstra_tree_csr
+
+BATCH_ALGORITHMS = ('bfs', 'dfs', 'dijkstra')
+
+
+class BatchQueryError(ValueError):
+    """Truy vấn trong batch không hợp lệ (thuật toán lạ, thiếu startId...)."""
+
+
+def parse_queries(queries, max_queries):
+    """
+    Chuẩn hóa danh sách truy vấn: [{"algorithm", "startId", "endId"?, "mode"?}, ...]
+    -> list tuple (algorithm, start_id, end_id, mode) gửi được cho tiến trình con.
+    """
+    if not isinstance(queries, list) or not queries:
+        raise BatchQueryError("'queries' must be a non-empty list.")
+    if len(queries) > max_queries:
+        raise BatchQueryError(f"Too many queries in one batch ({max_queries} max).")
+
+    parsed = []
+    for query in queries:
+        if not isinstance(query, dict):
+            raise BatchQueryError("Each query must be an object.")
+        algorithm = query.get('algorithm')
+        if algorithm not in BATCH_ALGORITHMS:
+            raise BatchQueryError(f"Unsupported batch algorithm: {algorithm}")
+        try:
+            start_id = int(query['startId'])
+            end_id = int(query['endId']) if query.get('endId') is not None else None
+        except (KeyError, TypeError, ValueError):
+            raise BatchQueryError("Each query needs an integer 'startId' (and optional 'endId').")
+        parsed.append((algorithm, start_id, end_id, query.get('mode', 'path')))
+    return parsed
+
+
+def run_query(csr, query):
+    """Chạy một truy vấn; kết quả cùng dạng với endpoint đơn lẻ tương ứng (/api/bfs, ...)."""
+    algorithm, start_id, end_id, mode = query
+    if algorithm in ('bfs', 'dfs'):
+        traverse = bfs_csr if algorithm == 'bfs' else dfs_csr
+        order, edges = traverse(csr, start_id)
+        pairs = csr.edge_pairs(edges)
+        return {"status": "success", "path": order, "visited_edges": [{"u": u, "v": v} for u, v in pairs]}
+
+    # Dijkstra: có endId -> đường đi 1 cặp (dừng sớm); không có (hoặc mode "tree") -> cả cây
+    if end_id is None or mode == 'tree':
+        tree = dijkstra_tree_csr(csr, start_id)
+        if tree is None:
+            return {"status": "error", "message": "Start vertex not found."}
+        return {"status": "success", **tree.to_dict()}
+    distance, path = dijkstra_csr(csr, start_id, end_id)
+    if distance == float('inf'):
+        return {"status": "error", "message": "No path found between these nodes."}
+    return {"status": "success", "distance": distance, "path": path}
+
+
+# --- Tiến trình con: gắn đồ thị dùng chung một lần (initializer), sau đó chỉ nhận truy vấn ---
+_worker_graph = None
+_worker_shm = None
+
+
+def _attach_worker(handle):
+    from graph.shared_graph import attach_graph
+
+    global _worker_graph, _worker_shm
+    _worker_graph, _worker_shm = attach_graph(handle)
+
+
+def _run_chunk(chunk):
+    return [(index, run_query(_worker_graph, query)) for index, query in chunk]
+
+
+def run_batch(csr, queries, workers=None, min_parallel=8):
+    """
+    Chạy nhiều truy vấn trên cùng một đồ thị, yield (vị trí truy vấn, kết quả) theo thứ tự HOÀN THÀNH.
+    - Nhiều truy vấn và có nhiều CPU: chia truy vấn thành các khối, chạy trên ProcessPoolExecutor;
+      đồ thị được chép MỘT lần vào shared memory và mọi tiến trình con đọc chung.
+    - Còn lại: chạy tuần tự ngay trong tiến trình hiện tại.
+    """
+    workers = workers or os.cpu_count() or 1
+    indexed = list(enumerate(queries))
+    if workers == 1 or len(indexed) < min_parallel:
+        for index, query in indexed:
+            yield index, run_query(csr, query)
+        return
+
+    from graph.shared_graph import SharedCSRGraph
+
+    # Khối nhỏ để kết quả về dần (stream), nhưng đủ lớn để bớt chi phí gửi/nhận
+    chunk_size = max(1, min(32, len(indexed) // (workers * 4)))
+    chunks = [indexed[i:i + chunk_size] for i in range(0, len(indexed), chunk_size)]
+    with SharedCSRGraph(csr) as shared:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_worker,
+                                 initargs=(shared.handle,)) as pool:
+            futures = [pool.submit(_run_chunk, chunk) for chunk in chunks]
+            try:
+                for future in as_completed(futures):
+                    yield from future.result()
+            finally:
+                # Client ngắt kết nối giữa chừng -> bỏ các khối chưa chạy
+                for future in futures:
+                    future.cancel()
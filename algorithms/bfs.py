@@ -1,36 +1,30 @@
 #  file algorithms/bfs.py
 from collections import deque
+import numpy as np
 
-def bfs_traversal(graph_model, start_id):
+def bfs_traversal(graph_model, start_id, trace=None):
     """
     Duyệt BFS. Trả về: (traversal_order, traversal_edges)
     - traversal_order: Danh sách ID các đỉnh đã duyệt.
     - traversal_edges: Danh sách các cạnh (Object Edge) đã đi qua.
+    trace: utils.trace.Trace (tùy chọn) - ghi sự kiện discover / visit cho hoạt cảnh.
     """
     visited = set()
     queue = deque([start_id])
     visited.add(start_id)
+    if trace is not None:
+        trace.discover(start_id)
 
     traversal_order = [start_id]
     traversal_edges = []
 
     while queue:
         u_id = queue.popleft()
+        if trace is not None:
+            trace.visit(u_id)
 
-        # Lấy danh sách kề và sắp xếp theo ID để kết quả nhất quán
-        neighbors = []
-        # Tìm các cạnh nối với u_id
-        connected_edges = []
-
-        for edge in graph_model.edges:
-            neighbor_id = None
-            if edge.start_vertex.id == u_id:
-                neighbor_id = edge.end_vertex.id
-            elif not graph_model.is_directed and edge.end_vertex.id == u_id:
-                neighbor_id = edge.start_vertex.id
-
-            if neighbor_id is not None:
-                neighbors.append((neighbor_id, edge))
+        # Lấy danh sách kề từ chỉ mục (chỉ duyệt các cạnh nối với u_id)
+        neighbors = graph_model.get_neighbors(u_id)
 
         # Sắp xếp theo ID đỉnh hàng xóm (bé trước lớn sau)
         neighbors.sort(key=lambda x: x[0])
@@ -41,5 +35,58 @@ def bfs_traversal(graph_model, start_id):
                 queue.append(v_id)
                 traversal_order.append(v_id)
                 traversal_edges.append(edge_obj) # Lưu lại cạnh này để tô màu
+                if trace is not None:
+                    trace.discover(v_id, u_id)
+
+    return traversal_order, traversal_edges
+
+
+def bfs_levels_csr(csr, start_index, visited):
+    """
+    Duyệt BFS theo từng tầng trên CSRGraph (vector hóa bằng NumPy).
+    Mỗi tầng yield (các đỉnh mới, slot cạnh dẫn tới chúng) theo đúng thứ tự
+    của BFS tuần tự (hàng đợi FIFO, hàng xóm ID nhỏ trước).
+    visited: mảng bool[n], được cập nhật tại chỗ.
+    """
+    visited[start_index] = True
+    frontier = np.array([start_index], dtype=np.int64)
+    while frontier.size:
+        slots = csr.row_slots(frontier)
+        nbrs = csr.targets[slots]
+        fresh = ~visited[nbrs]
+        slots, nbrs = slots[fresh], nbrs[fresh]
+        # Lần xuất hiện đầu tiên của mỗi đỉnh chính là lần nó được phát hiện
+        _, first = np.unique(nbrs, return_index=True)
+        first.sort()
+        frontier = nbrs[first].astype(np.int64)
+        visited[frontier] = True
+        if frontier.size:
+            yield frontier, slots[first]
+
 
+def bfs_steps_csr(csr, start_id):
+    """
+    BFS trên CSRGraph dạng generator: mỗi tầng yield (ID các đỉnh mới, chỉ số cạnh gốc dẫn tới chúng).
+    Tầng đầu là ([start_id], []). Người gọi có thể gửi dần từng tầng (stream) thay vì giữ cả kết quả.
+    """
+    start = csr.index_of(start_id)
+    yield [start_id], []
+    if start is None:
+        return
+
+    visited = np.zeros(csr.num_vertices, dtype=bool)
+    for vertices, slots in bfs_levels_csr(csr, start, visited):
+        yield csr.node_ids[vertices].tolist(), csr.slot_edges[slots].tolist()
+
+
+def bfs_csr(csr, start_id):
+    """
+    BFS trên CSRGraph. Trả về: (traversal_order, traversal_edges)
+    - traversal_order: Danh sách ID các đỉnh đã duyệt.
+    - traversal_edges: Chỉ số các cạnh gốc đã đi qua (xem csr.edge_pairs).
+    """
+    traversal_order, traversal_edges = [], []
+    for vertices, edges in bfs_steps_csr(csr, start_id):
+        traversal_order.extend(vertices)
+        traversal_edges.extend(edges)
     return traversal_order, traversal_edges
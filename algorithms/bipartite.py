@@ -1,5 +1,6 @@
 # file algorithms/bipartite.py
-from collections import deque
+import numpy as np
+from .bfs import bfs_levels_csr
 
 def check_bipartite(graph_model):
     """
@@ -9,41 +10,110 @@ def check_bipartite(graph_model):
     Trả về:
         - Kết quả (True/False)
         - Dictionary màu {vertex_id: 0 hoặc 1} để vẽ lên giao diện.
+    Dùng lại engine tuyến tính trên CSR (xem bipartite_csr) thay cho việc dựng lại
+    danh sách hàng xóm từ mọi cạnh ở mỗi đỉnh lấy ra khỏi hàng đợi.
     """
-    color_map = {} # Lưu trạng thái màu: {id: 0/1}
-
-    # Duyệt qua tất cả các đỉnh (đề phòng đồ thị bị ngắt quãng - disconnected components)
-    for start_node_id in graph_model.vertices:
-        if start_node_id not in color_map:
-            # Gán màu đầu tiên là 0 (Xanh)
-            color_map[start_node_id] = 0
-            queue = deque([start_node_id])
-
-            while queue:
-                u_id = queue.popleft()
-                current_color = color_map[u_id]
-                next_color = 1 - current_color # Đảo màu: 0->1, 1->0
-
-                # Lấy danh sách hàng xóm (xét như vô hướng để kiểm tra cấu trúc)
-                neighbors = []
-                for edge in graph_model.edges:
-                    neighbor = None
-                    if edge.start_vertex.id == u_id:
-                        neighbor = edge.end_vertex.id
-                    elif edge.end_vertex.id == u_id:
-                        neighbor = edge.start_vertex.id
-
-                    if neighbor is not None:
-                        neighbors.append(neighbor)
-
-                # Kiểm tra màu các hàng xóm
-                for v_id in neighbors:
-                    if v_id not in color_map:
-                        # Chưa có màu -> Tô màu ngược lại và đẩy vào hàng đợi
-                        color_map[v_id] = next_color
-                        queue.append(v_id)
-                    elif color_map[v_id] == current_color:
-                        # Đã có màu mà lại TRÙNG màu với u -> Mâu thuẫn -> Không phải 2 phía
-                        return False, {}
-
-    return True, color_map
+    from graph.csr_graph import CSRGraph
+
+    return check_bipartite_csr(CSRGraph.from_graph_model(graph_model))
+
+
+class BipartiteResult:
+    """
+    Kết quả tô 2 màu theo chỉ số đỉnh (xét như vô hướng):
+    - colors:      int8[n]  tính chẵn lẻ của tầng BFS trong thành phần của đỉnh (0/1)
+    - odd_cycle:   None nếu là 2 phía; ngược lại (đỉnh, cạnh) của một chu trình lẻ làm
+      bằng chứng - đỉnh đầu == đỉnh cuối, cạnh thứ k nối đỉnh k và k + 1.
+    """
+
+    def __init__(self, csr, colors, odd_cycle=None):
+        self.csr = csr
+        self.colors = colors
+        self.odd_cycle = odd_cycle
+
+    def __len__(self):
+        """Số phần tử đang giữ: mảng màu + chu trình lẻ (kích thước khi lưu trong result_cache)."""
+        cycle = 0 if self.odd_cycle is None else len(self.odd_cycle[0]) + len(self.odd_cycle[1])
+        return len(self.colors) + cycle
+
+    @property
+    def is_bipartite(self):
+        return self.odd_cycle is None
+
+    def color_map(self):
+        return dict(zip(self.csr.node_ids.tolist(), self.colors.tolist()))
+
+    def to_dict(self):
+        if self.is_bipartite:
+            return {"is_bipartite": True, "colors": self.color_map()}
+        vertices, edges = self.odd_cycle
+        return {
+            "is_bipartite": False,
+            "colors": {},
+            "odd_cycle": self.csr.node_ids[vertices].tolist(),
+            "odd_cycle_edges": [{"u": u, "v": v} for u, v in self.csr.edge_pairs(edges)],
+        }
+
+
+def bipartite_csr(csr):
+    """
+    Tô 2 màu trên CSRGraph trong O(V + E) (xét như vô hướng): màu = tính chẵn lẻ của
+    tầng BFS trong từng thành phần liên thông; đồ thị là 2 phía khi và chỉ khi không có
+    cạnh nào nối 2 đỉnh cùng màu.
+    Cây BFS (cạnh cha của mỗi đỉnh) được giữ lại: cạnh (a, b) cùng màu nằm trong cùng
+    một tầng, nên a -> ... -> tổ tiên chung <- ... <- b cộng cạnh (a, b) là chu trình lẻ.
+    """
+    graph = csr.undirected()
+    n = graph.num_vertices
+    colors = np.zeros(n, dtype=np.int8)
+    parent_edge = np.full(n, -1, dtype=np.int64)
+    visited = np.zeros(n, dtype=bool)
+
+    for start in range(n):
+        if visited[start]:
+            continue
+        level = 0
+        for vertices, slots in bfs_levels_csr(graph, start, visited):
+            level += 1
+            colors[vertices] = level % 2
+            parent_edge[vertices] = graph.slot_edges[slots]
+
+    conflicts = np.flatnonzero(colors[graph.src] == colors[graph.dst])
+    if len(conflicts) == 0:
+        return BipartiteResult(csr, colors)
+    return BipartiteResult(csr, colors, _odd_cycle(graph, parent_edge, int(conflicts[0])))
+
+
+def _odd_cycle(graph, parent_edge, edge):
+    """Chu trình lẻ qua cạnh cùng màu edge = (a, b): leo cây BFS từ a và b tới tổ tiên chung."""
+    src, dst = graph.src.tolist(), graph.dst.tolist()
+    parent_edge = parent_edge.tolist()
+    a, b = src[edge], dst[edge]
+    if a == b:
+        return [a, a], [edge] # Khuyên
+
+    def parent(v):
+        e = parent_edge[v]
+        return src[e] if dst[e] == v else dst[e]
+
+    # a, b cùng tầng (cùng màu, cạnh BFS chỉ nối tầng kề nhau hoặc cùng tầng)
+    path_a, path_b = [a], [b]
+    while path_a[-1] != path_b[-1]:
+        path_a.append(parent(path_a[-1]))
+        path_b.append(parent(path_b[-1]))
+
+    # tổ tiên chung -> ... -> a -> b -> ... -> tổ tiên chung
+    vertices = path_a[::-1] + path_b
+    edges = [parent_edge[v] for v in path_a[:-1]][::-1] + [edge] + [parent_edge[v] for v in path_b[:-1]]
+    return vertices, edges
+
+
+def check_bipartite_csr(csr):
+    """
+    Kiểm tra 2 phía trên CSRGraph (xem bipartite_csr).
+    Trả về giống check_bipartite: (True/False, {vertex_id: 0/1}).
+    """
+    result = bipartite_csr(csr)
+    if not result.is_bipartite:
+        return False, {}
+    return True, result.color_map()
@@ -0,0 +1,222 @@
+# file algorithms/components.py
+from collections import deque
+
+import numpy as np
+
+from .dfs import dfs_forest_csr
+from .union_find import UnionFind
+
+
+class ComponentLabels:
+    """
+    Nhãn thành phần theo chỉ số đỉnh: labels[i] = số thứ tự thành phần của đỉnh i.
+    Thành phần được đánh số theo đỉnh có ID nhỏ nhất của nó (thành phần chứa đỉnh 0 là 0...),
+    nên mọi thuật toán (Tarjan, Kosaraju, Union-Find) cho cùng một kết quả.
+    """
+
+    def __init__(self, csr, labels):
+        self.csr = csr
+        self.labels = _canonical(labels)
+        self.count = int(self.labels.max()) + 1 if len(self.labels) else 0
+
+    def __len__(self):
+        """Số đỉnh có nhãn (kích thước khi lưu trong result_cache); số thành phần là count."""
+        return len(self.labels)
+
+    def sizes(self):
+        return np.bincount(self.labels, minlength=self.count)
+
+    def members(self):
+        """Danh sách chỉ số đỉnh của từng thành phần (mỗi thành phần tăng dần)."""
+        order = np.argsort(self.labels, kind='stable')
+        return np.split(order, np.cumsum(self.sizes())[:-1]) if self.count else []
+
+    def same_component(self, indices):
+        """True nếu mọi đỉnh (chỉ số) trong indices thuộc cùng một thành phần."""
+        labels = self.labels[np.asarray(indices, dtype=np.int64)]
+        return len(labels) == 0 or bool(np.all(labels == labels[0]))
+
+    def to_dict(self):
+        node_ids = self.csr.node_ids
+        return {
+            "count": self.count,
+            "components": [node_ids[vertices].tolist() for vertices in self.members()],
+            "labels": dict(zip(node_ids.tolist(), self.labels.tolist())),
+        }
+
+
+def _canonical(labels):
+    """Đánh số lại nhãn theo thứ tự xuất hiện đầu tiên (đỉnh chỉ số nhỏ nhất)."""
+    labels = np.asarray(labels, dtype=np.int64)
+    if len(labels) == 0:
+        return labels
+    _, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    rank = np.empty(len(first), dtype=np.int64)
+    rank[np.argsort(first)] = np.arange(len(first))
+    return rank[inverse]
+
+
+# ----------------------------------------------------------------------
+# Thành phần liên thông yếu (bỏ qua chiều cạnh)
+# ----------------------------------------------------------------------
+def weak_components_csr(csr):
+    """
+    Thành phần liên thông (có hướng: liên thông yếu) bằng Union-Find trên mảng cạnh:
+    O(E α(V)), không cần dựng chỉ mục kề vô hướng. Khuyên bị bỏ qua.
+    """
+    sets = UnionFind(csr.num_vertices)
+    union = sets.union
+    loops = csr.src == csr.dst
+    for a, b in zip(csr.src[~loops].tolist(), csr.dst[~loops].tolist()):
+        union(a, b)
+        if sets.count == 1:
+            break
+    return ComponentLabels(csr, sets.labels())
+
+
+# ----------------------------------------------------------------------
+# Thành phần liên thông mạnh
+# ----------------------------------------------------------------------
+def strong_components_csr(csr, method='tarjan'):
+    """
+    Thành phần liên thông mạnh (vô hướng: trùng với thành phần liên thông), O(V + E),
+    DFS lặp (không đệ quy).
+    - "tarjan": một lượt DFS với low-link.
+    - "kosaraju": thứ tự hoàn tất của DFS trên đồ thị (dfs_forest_csr), rồi duyệt đồ thị
+      đảo chiều theo thứ tự hoàn tất giảm dần.
+    """
+    if method == 'kosaraju':
+        return ComponentLabels(csr, _kosaraju(csr))
+    return ComponentLabels(csr, _tarjan(csr))
+
+
+def _tarjan(csr):
+    n = csr.num_vertices
+    offsets = csr.offsets.tolist()
+    targets = csr.targets.tolist()
+    pointer = offsets[:-1]
+    index = [-1] * n
+    low = [0] * n
+    on_stack = bytearray(n)
+    labels = [-1] * n
+    component_stack = []
+    clock = 0
+    count = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = clock
+        clock += 1
+        component_stack.append(root)
+        on_stack[root] = 1
+        stack = [root]
+        while stack:
+            u = stack[-1]
+            i = pointer[u]
+            if i < offsets[u + 1]:
+                pointer[u] = i + 1
+                v = targets[i]
+                if index[v] == -1:
+                    index[v] = low[v] = clock
+                    clock += 1
+                    component_stack.append(v)
+                    on_stack[v] = 1
+                    stack.append(v)
+                elif on_stack[v] and index[v] < low[u]:
+                    low[u] = index[v]
+                continue
+
+            stack.pop()
+            if stack and low[u] < low[stack[-1]]:
+                low[stack[-1]] = low[u]
+            if low[u] == index[u]:
+                # u là gốc của một thành phần: lấy ra mọi đỉnh phía trên u trên ngăn xếp
+                while True:
+                    w = component_stack.pop()
+                    on_stack[w] = 0
+                    labels[w] = count
+                    if w == u:
+                        break
+                count += 1
+    return labels
+
+
+def _kosaraju(csr):
+    n = csr.num_vertices
+    finish = dfs_forest_csr(csr).finish
+    reverse = csr.reverse()
+    offsets = reverse.offsets.tolist()
+    targets = reverse.targets.tolist()
+    labels = [-1] * n
+    count = 0
+
+    for root in np.argsort(-finish, kind='stable').tolist():
+        if labels[root] != -1:
+            continue
+        labels[root] = count
+        stack = [root]
+        while stack:
+            u = stack.pop()
+            for v in targets[offsets[u]:offsets[u + 1]]:
+                if labels[v] == -1:
+                    labels[v] = count
+                    stack.append(v)
+        count += 1
+    return labels
+
+
+# ----------------------------------------------------------------------
+# Sắp xếp tô-pô
+# ----------------------------------------------------------------------
+def topological_order_csr(csr):
+    """
+    Thuật toán Kahn (hàng đợi các đỉnh bán bậc vào 0, theo thứ tự chỉ số), O(V + E).
+    Trả về (order, cycle):
+    - Đồ thị không chu trình (DAG): (chỉ số đỉnh theo thứ tự tô-pô, None).
+    - Có chu trình: (phần đã sắp được, (đỉnh, cạnh) của một chu trình làm bằng chứng).
+      Mọi đỉnh còn lại sau Kahn đều có cạnh vào từ một đỉnh còn lại, nên lần ngược theo
+      các cạnh vào đó chắc chắn quay lại một đỉnh đã đi qua.
+    """
+    n = csr.num_vertices
+    offsets = csr.offsets.tolist()
+    targets = csr.targets.tolist()
+    in_degree = np.bincount(csr.dst, minlength=n).tolist()
+
+    queue = deque(i for i in range(n) if in_degree[i] == 0)
+    order = []
+    while queue:
+        u = queue.popleft()
+        order.append(u)
+        for v in targets[offsets[u]:offsets[u + 1]]:
+            in_degree[v] -= 1
+            if in_degree[v] == 0:
+                queue.append(v)
+
+    if len(order) == n:
+        return order, None
+    return order, _find_cycle(csr, in_degree)
+
+
+def _find_cycle(csr, in_degree):
+    """Chu trình trong tập đỉnh Kahn chưa lấy ra (in_degree > 0). Trả về (đỉnh, cạnh) theo chiều cạnh."""
+    reverse = csr.reverse()
+    offsets = reverse.offsets.tolist()
+    targets = reverse.targets.tolist()
+    slot_edges = reverse.slot_edges.tolist()
+    u = next(i for i, d in enumerate(in_degree) if d > 0)
+    position = {}
+    path, edges = [], []
+    while u not in position:
+        position[u] = len(path)
+        path.append(u)
+        for i in range(offsets[u], offsets[u + 1]):
+            if in_degree[targets[i]] > 0:
+                edges.append(slot_edges[i])
+                u = targets[i]
+                break
+
+    start = position[u]
+    # Đường đi lần ngược: path[k] <- path[k + 1] qua edges[k]; đảo lại để theo chiều cạnh
+    vertices = [u] + path[start + 1:][::-1] + [u]
+    return vertices, edges[start:][::-1]
@@ -1,87 +1,159 @@
 # file algorithms/conversion.py
+import numpy as np
 
-def get_adjacency_matrix(model):
-    """Chuyển đổi sang Ma trận kề (Adjacency Matrix)"""
-    # 1. Lấy danh sách ID các đỉnh và sắp xếp để ma trận đẹp
-    vertex_ids = sorted(model.vertices.keys())
-    n = len(vertex_ids)
-
-    # 2. Tạo map để biết đỉnh ID nào ứng với chỉ số hàng/cột nào (0, 1, 2...)
-    # Ví dụ: Đỉnh ID=5 ứng với index=0, ID=9 ứng với index=1
-    id_to_index = {v_id: i for i, v_id in enumerate(vertex_ids)}
-
-    # 3. Khởi tạo ma trận n x n toàn số 0
-    matrix = [[0] * n for _ in range(n)]
-
-    # 4. Điền trọng số vào ma trận
-    for edge in model.edges:
-        u = edge.start_vertex.id
-        v = edge.end_vertex.id
-        weight = edge.weight if edge.weight is not None else 1
+# Các hàm *_csr làm việc thẳng trên CSRGraph, bộ nhớ O(V + E):
+# - Ma trận kề dạng chữ chỉ dựng các ô của "trang" (cửa sổ hàng/cột) được yêu cầu.
+# - Danh sách kề / danh sách cạnh được sinh từng dòng (iter_*), không ghép chuỗi lớn.
+# - Ma trận thưa (CSR/COO) lấy luôn từ chỉ mục CSR; ma trận dày NumPy chỉ khi được yêu cầu.
+# Các hàm nhận GraphModel (get_*) giữ nguyên định dạng cũ và dùng lại bản CSR.
 
-        # Lấy index trong ma trận
-        i = id_to_index[u]
-        j = id_to_index[v]
 
-        matrix[i][j] = weight
-
-        # Nếu là vô hướng thì điền cả chiều ngược lại
-        if not model.is_directed:
-            matrix[j][i] = weight
-
-    # 5. Chuyển thành String đẹp để hiển thị
-    # Header (Tên các đỉnh)
-    labels = [str(model.vertices[vid].label) for vid in vertex_ids]
-    header = "      " + "  ".join(f"{lbl:>4}" for lbl in labels)
-
-    rows = []
-    for i in range(n):
-        row_label = labels[i]
-        row_data = "  ".join(f"{val:>4}" for val in matrix[i])
-        rows.append(f"{row_label:>4} | {row_data}")
+def get_adjacency_matrix(model):
+    """Chuyển đổi sang Ma trận kề (Adjacency Matrix)"""
+    return adjacency_matrix_text(_to_csr(model))
 
-    return header + "\n" + ("-" * len(header)) + "\n" + "\n".join(rows)
 
 def get_adjacency_list(model):
     """Chuyển đổi sang Danh sách kề (Adjacency List)"""
-    adj_list = {v_id: [] for v_id in model.vertices}
+    return "\n".join(iter_adjacency_list_lines(_to_csr(model)))
 
-    for edge in model.edges:
-        u = edge.start_vertex.id
-        v = edge.end_vertex.id
-        w = edge.weight if edge.weight is not None else 1
-
-        # Thêm vào danh sách của u
-        adj_list[u].append(f"{model.vertices[v].label}(w={w})")
-
-        # Nếu vô hướng, thêm vào danh sách của v
-        if not model.is_directed:
-            adj_list[v].append(f"{model.vertices[u].label}(w={w})")
-
-    # Tạo string kết quả
-    lines = []
-    for v_id in sorted(adj_list.keys()):
-        label = model.vertices[v_id].label
-        neighbors = ", ".join(adj_list[v_id])
-        lines.append(f"{label} -> [{neighbors}]")
-
-    return "\n".join(lines)
 
 def get_edge_list(model):
     """Chuyển đổi sang Danh sách cạnh (Edge List)"""
-    lines = []
-    # Header
-    lines.append(f"{'Start':<10} {'End':<10} {'Weight':<10}")
-    lines.append("-" * 35)
-
-    for edge in model.edges:
-        u_lbl = edge.start_vertex.label
-        v_lbl = edge.end_vertex.label
-        w = edge.weight if edge.weight is not None else 1
-
-        lines.append(f"{str(u_lbl):<10} {str(v_lbl):<10} {str(w):<10}")
+    return "\n".join(iter_edge_list_lines(_to_csr(model)))
+
+
+def _to_csr(model):
+    from graph.csr_graph import CSRGraph
+
+    return CSRGraph.from_graph_model(model)
+
+
+# ----------------------------------------------------------------------
+# Ma trận kề
+# ----------------------------------------------------------------------
+def adjacency_matrix_text(csr, row_start=0, row_count=None, col_start=0, col_count=None):
+    """
+    Ma trận kề dạng chữ (hàng/cột theo thứ tự ID), chỉ gồm cửa sổ
+    hàng [row_start, row_start + row_count) x cột [col_start, col_start + col_count)
+    (None = tới hết). Mỗi hàng chỉ duyệt các cạnh kề của nó -> O(số ô trong trang + bậc).
+    """
+    rows = _window(csr.num_vertices, row_start, row_count)
+    cols = _window(csr.num_vertices, col_start, col_count)
+    labels = vertex_labels(csr)
+    header = "      " + "  ".join(f"{labels[j]:>4}" for j in cols)
+
+    zero = f"{0:>4}"
+    lines = [header, "-" * len(header)]
+    for i in rows:
+        cells = [zero] * len(cols)
+        a, b = csr.row(i)
+        targets = csr.targets[a:b]
+        # Đỉnh kề trong một hàng đã được sắp xếp -> cắt đúng khoảng cột bằng tìm nhị phân
+        lo, hi = np.searchsorted(targets, (cols.start, cols.stop))
+        for j, w in zip(targets[lo:hi].tolist(), weight_strings(csr, csr.slot_weights[a + lo:a + hi])):
+            cells[j - cols.start] = f"{w:>4}"
+        lines.append(f"{labels[i]:>4} | " + "  ".join(cells))
+    return "\n".join(lines)
 
-        # Lưu ý: Với danh sách cạnh, thường người ta liệt kê đúng số cạnh thực tế.
-        # Nếu vô hướng, 1 cạnh vẽ ra chỉ tính là 1 dòng (dù logic là 2 chiều).
 
-    return "\n".join(lines)
+def adjacency_matrix_dense(csr, dtype=np.float64):
+    """Ma trận kề dày n x n (NumPy); chỉ dùng khi thực sự cần (bộ nhớ O(n^2))."""
+    n = csr.num_vertices
+    matrix = np.zeros((n, n), dtype=dtype)
+    rows = np.repeat(np.arange(n), np.diff(csr.offsets))
+    matrix[rows, csr.targets] = csr.slot_weights
+    return matrix
+
+
+def dense_matrix(csr):
+    """Ma trận dày dạng JSON: {"node_ids", "matrix": [[...], ...]}."""
+    matrix = adjacency_matrix_dense(csr)
+    values = matrix.astype(np.int64).tolist() if csr.integer_weights else matrix.tolist()
+    return {"node_ids": csr.node_ids.tolist(), "matrix": values}
+
+
+def sparse_matrix(csr, layout='csr', row_start=0, row_count=None):
+    """
+    Ma trận kề thưa (vô hướng: đối xứng, mỗi cạnh có 2 phần tử) cho các hàng trong cửa sổ.
+    - layout "csr": {"indptr", "indices", "data"} (indptr tính từ row_start).
+    - layout "coo": {"row", "col", "data"}.
+    Chỉ số hàng/cột là vị trí đỉnh trong "node_ids" (sắp theo ID).
+    """
+    rows = _window(csr.num_vertices, row_start, row_count)
+    a, b = int(csr.offsets[rows.start]), int(csr.offsets[rows.stop])
+    data = csr.slot_weights[a:b]
+    result = {
+        "layout": layout,
+        "shape": [csr.num_vertices, csr.num_vertices],
+        "row_start": rows.start,
+        "row_count": len(rows),
+        "node_ids": csr.node_ids.tolist(),
+        "data": data.astype(np.int64).tolist() if csr.integer_weights else data.tolist(),
+    }
+    if layout == 'coo':
+        counts = np.diff(csr.offsets[rows.start:rows.stop + 1])
+        result["row"] = np.repeat(np.arange(rows.start, rows.stop), counts).tolist()
+        result["col"] = csr.targets[a:b].tolist()
+    else:
+        result["indptr"] = (csr.offsets[rows.start:rows.stop + 1] - a).tolist()
+        result["indices"] = csr.targets[a:b].tolist()
+    return result
+
+
+# ----------------------------------------------------------------------
+# Danh sách kề / danh sách cạnh (sinh từng dòng)
+# ----------------------------------------------------------------------
+def iter_adjacency_list_lines(csr, row_start=0, row_count=None):
+    """
+    Từng dòng "nhãn -> [kề(w=trọng số), ...]" theo thứ tự ID đỉnh; các đỉnh kề
+    theo thứ tự thêm cạnh (như bản cũ).
+    """
+    labels = vertex_labels(csr)
+    for i in _window(csr.num_vertices, row_start, row_count):
+        a, b = csr.row(i)
+        order = np.argsort(csr.slot_edges[a:b], kind='stable') + a
+        if not csr.is_directed:
+            # Khuyên vô hướng được liệt kê 2 lần (một lần cho mỗi đầu mút) như bản cũ
+            order = np.repeat(order, 1 + (csr.targets[order] == i))
+        weights = weight_strings(csr, csr.slot_weights[order])
+        neighbors = ", ".join(f"{labels[j]}(w={w})" for j, w in zip(csr.targets[order].tolist(), weights))
+        yield f"{labels[i]} -> [{neighbors}]"
+
+
+def iter_edge_list_lines(csr, start=0, count=None, header=True, chunk_size=10_000):
+    """Từng dòng "đầu cuối trọng số" của các cạnh [start, start + count), theo thứ tự thêm cạnh."""
+    if header:
+        yield f"{'Start':<10} {'End':<10} {'Weight':<10}"
+        yield "-" * 35
+    labels = vertex_labels(csr)
+    edges = _window(csr.num_edges, start, count)
+    for lo in range(edges.start, edges.stop, chunk_size):
+        hi = min(lo + chunk_size, edges.stop)
+        weights = weight_strings(csr, csr.weights[lo:hi])
+        for u, v, w in zip(csr.src[lo:hi].tolist(), csr.dst[lo:hi].tolist(), weights):
+            yield f"{labels[u]:<10} {labels[v]:<10} {w:<10}"
+
+
+# ----------------------------------------------------------------------
+# Tiện ích
+# ----------------------------------------------------------------------
+def vertex_labels(csr):
+    """Nhãn hiển thị theo chỉ số đỉnh (đồ thị không có nhãn -> ID)."""
+    if csr.labels is not None:
+        return csr.labels
+    return [str(v) for v in csr.node_ids.tolist()]
+
+
+def weight_strings(csr, weights):
+    """Trọng số dạng chữ: số nguyên nếu mọi trọng số của đồ thị là số nguyên."""
+    if csr.integer_weights:
+        return [str(w) for w in weights.astype(np.int64).tolist()]
+    return [str(w) for w in weights.tolist()]
+
+
+def _window(total, start, count):
+    """range các chỉ số của cửa sổ [start, start + count) đã được cắt vào [0, total)."""
+    start = min(max(int(start or 0), 0), total)
+    stop = total if count is None else min(start + max(int(count), 0), total)
+    return range(start, stop)
@@ -1,4 +1,10 @@
 # file algorithms/dfs.py
+import numpy as np
+
+# Loại cạnh trong rừng DFS (DFSForest.edge_kinds)
+UNSEEN, TREE_EDGE, BACK_EDGE, FORWARD_EDGE, CROSS_EDGE = 0, 1, 2, 3, 4
+EDGE_KIND_NAMES = {TREE_EDGE: "tree", BACK_EDGE: "back", FORWARD_EDGE: "forward", CROSS_EDGE: "cross"}
+
 def dfs_traversal(graph_model, start_id):
     """
     Duyệt DFS (Dùng Stack). Trả về: (traversal_order, traversal_edges)
@@ -9,8 +15,9 @@ def dfs_traversal(graph_model, start_id):
     traversal_order = []
     traversal_edges = []
 
-    # Để truy vết cạnh nào dẫn đến đỉnh nào, ta dùng dictionary cha-con
-    parent_map = {start_id: None}
+    # Để truy vết cạnh nào dẫn đến đỉnh nào, ta dùng dictionary con -> (cha, cạnh)
+    # Cạnh được ghi nhận ngay lúc push nên không phải dò lại danh sách cạnh
+    parent_map = {start_id: (None, None)}
 
     while stack:
         u_id = stack.pop()
@@ -19,35 +26,171 @@ def dfs_traversal(graph_model, start_id):
             visited.add(u_id)
             traversal_order.append(u_id)
 
-            # Nếu đỉnh này có cha (không phải đỉnh đầu), tìm cạnh nối cha-con để tô màu
-            p_id = parent_map[u_id]
+            # Nếu đỉnh này có cha (không phải đỉnh đầu), lấy cạnh nối cha-con để tô màu
+            p_id, p_edge = parent_map[u_id]
             if p_id is not None:
-                # Tìm cạnh nối giữa p_id và u_id
-                for edge in graph_model.edges:
-                    is_direct = (edge.start_vertex.id == p_id and edge.end_vertex.id == u_id)
-                    is_undirect = (not graph_model.is_directed and edge.start_vertex.id == u_id and edge.end_vertex.id == p_id)
-                    if is_direct or is_undirect:
-                        traversal_edges.append(edge)
-                        break
-
-            # Lấy hàng xóm
-            neighbors = []
-            for edge in graph_model.edges:
-                neighbor_id = None
-                if edge.start_vertex.id == u_id:
-                    neighbor_id = edge.end_vertex.id
-                elif not graph_model.is_directed and edge.end_vertex.id == u_id:
-                    neighbor_id = edge.start_vertex.id
-
-                if neighbor_id is not None and neighbor_id not in visited:
-                    neighbors.append(neighbor_id)
+                traversal_edges.append(p_edge)
+
+            # Lấy hàng xóm (qua chỉ mục kề)
+            neighbors = [
+                (v_id, edge) for v_id, edge in graph_model.get_neighbors(u_id)
+                if v_id not in visited
+            ]
 
             # Sắp xếp giảm dần vì Stack lấy ra sẽ là phần tử cuối cùng (ID nhỏ nhất sẽ được lấy ra trước)
-            neighbors.sort(reverse=True)
+            neighbors.sort(key=lambda x: x[0], reverse=True)
 
-            for v_id in neighbors:
+            for v_id, edge in neighbors:
                 if v_id not in visited:
                     stack.append(v_id)
-                    parent_map[v_id] = u_id # Ghi nhận cha của v là u
+                    parent_map[v_id] = (u_id, edge) # Ghi nhận cha của v là u
+
+    return traversal_order, traversal_edges
+
+
+class DFSForest:
+    """
+    Kết quả DFS (cây, hoặc rừng nếu duyệt từ mọi đỉnh) theo chỉ số đỉnh:
+    - order:       list  thứ tự phát hiện (preorder)
+    - discovery:   int64[n] thời điểm phát hiện, finish: int64[n] thời điểm hoàn tất (-1: chưa thăm)
+    - parent_edge: int64[n] chỉ số cạnh gốc nối từ cha (-1: gốc hoặc chưa thăm)
+    - edge_kinds:  int8[m]  loại từng cạnh (TREE_EDGE, BACK_EDGE...; UNSEEN nếu không tới được),
+      None nếu không yêu cầu phân loại. Vô hướng chỉ có cạnh cây và cạnh ngược.
+    """
 
+    def __init__(self, csr, order, discovery, finish, parent_edge, edge_kinds=None):
+        self.csr = csr
+        self.order = order
+        self.discovery = discovery
+        self.finish = finish
+        self.parent_edge = parent_edge
+        self.edge_kinds = edge_kinds
+
+    def __len__(self):
+        return len(self.order)
+
+    def to_dict(self):
+        """Dạng JSON: thời điểm theo đỉnh (mảng song song với "vertices", null = chưa thăm)."""
+        csr = self.csr
+        visited = (self.discovery >= 0).tolist()
+        result = {
+            "order": csr.node_ids[self.order].tolist(),
+            "vertices": csr.node_ids.tolist(),
+            "discovery": [t if ok else None for t, ok in zip(self.discovery.tolist(), visited)],
+            "finish": [t if ok else None for t, ok in zip(self.finish.tolist(), visited)],
+            "tree_edges": _pairs(csr, self.tree_edges()),
+        }
+        if self.edge_kinds is not None:
+            for kind, name in EDGE_KIND_NAMES.items():
+                if kind != TREE_EDGE:
+                    result[f"{name}_edges"] = _pairs(csr, np.flatnonzero(self.edge_kinds == kind))
+        return result
+
+    def tree_edges(self):
+        """Chỉ số cạnh cây theo thứ tự phát hiện đỉnh con."""
+        edges = self.parent_edge[self.order]
+        return edges[edges >= 0]
+
+
+def _pairs(csr, edge_indices):
+    return [{"u": u, "v": v} for u, v in csr.edge_pairs(edge_indices)]
+
+
+def dfs_forest_csr(csr, start_id=None, classify=False):
+    """
+    DFS lặp một lượt trên chỉ mục kề CSR (không đệ quy, không đẩy trùng đỉnh):
+    mỗi đỉnh trên ngăn xếp giữ con trỏ tới cạnh kề tiếp theo, nên mỗi slot chỉ được xét
+    một lần -> O(V + E), bộ nhớ O(V). Cạnh cây được ghi lúc phát hiện đỉnh con.
+    Hàng xóm ID nhỏ được đi trước -> cùng thứ tự với dfs_traversal / DFS đệ quy.
+
+    start_id: chỉ duyệt từ đỉnh này; None -> rừng DFS từ mọi đỉnh (theo thứ tự ID).
+    classify: phân loại mọi cạnh tới được (cây / ngược / xuôi / chéo).
+    Trả về DFSForest, hoặc None nếu start_id không tồn tại.
+    """
+    n = csr.num_vertices
+    if start_id is None:
+        roots = range(n)
+    else:
+        start = csr.index_of(start_id)
+        if start is None:
+            return None
+        roots = [start]
+
+    offsets = csr.offsets.tolist()
+    targets = csr.targets.tolist()
+    slot_edges = csr.slot_edges.tolist()
+    pointer = offsets[:-1]
+    discovery = [-1] * n
+    finish = [-1] * n
+    parent_edge = [-1] * n
+    kinds = bytearray(csr.num_edges) if classify else None
+    order = []
+    clock = 0
+
+    for root in roots:
+        if discovery[root] != -1:
+            continue
+        discovery[root] = clock
+        clock += 1
+        order.append(root)
+        stack = [root]
+        while stack:
+            u = stack[-1]
+            i = pointer[u]
+            if i < offsets[u + 1]:
+                pointer[u] = i + 1
+                v = targets[i]
+                if discovery[v] == -1:
+                    parent_edge[v] = slot_edges[i]
+                    discovery[v] = clock
+                    clock += 1
+                    order.append(v)
+                    stack.append(v)
+                    if kinds is not None:
+                        kinds[slot_edges[i]] = TREE_EDGE
+                elif kinds is not None and not kinds[slot_edges[i]]:
+                    if finish[v] == -1:
+                        kinds[slot_edges[i]] = BACK_EDGE # v là tổ tiên còn mở (kể cả khuyên)
+                    elif discovery[u] < discovery[v]:
+                        kinds[slot_edges[i]] = FORWARD_EDGE
+                    else:
+                        kinds[slot_edges[i]] = CROSS_EDGE
+            else:
+                finish[u] = clock
+                clock += 1
+                stack.pop()
+
+    return DFSForest(
+        csr, order, np.array(discovery, dtype=np.int64), np.array(finish, dtype=np.int64),
+        np.array(parent_edge, dtype=np.int64),
+        None if kinds is None else np.frombuffer(kinds, dtype=np.int8),
+    )
+
+
+def dfs_steps_csr(csr, start_id):
+    """
+    DFS trên CSRGraph dạng generator, cùng thứ tự duyệt với dfs_traversal.
+    Mỗi đỉnh được thăm yield (ID đỉnh, chỉ số cạnh gốc nối từ cha; -1 với đỉnh bắt đầu).
+    """
+    forest = dfs_forest_csr(csr, start_id)
+    if forest is None:
+        yield start_id, -1
+        return
+
+    node_ids = csr.node_ids[forest.order].tolist()
+    for vertex_id, edge in zip(node_ids, forest.parent_edge[forest.order].tolist()):
+        yield vertex_id, edge
+
+
+def dfs_csr(csr, start_id):
+    """
+    DFS (Dùng Stack) trên CSRGraph, cùng thứ tự duyệt với dfs_traversal.
+    Trả về: (traversal_order, traversal_edges) - traversal_edges là chỉ số cạnh gốc.
+    """
+    traversal_order = []
+    traversal_edges = []
+    for vertex_id, edge in dfs_steps_csr(csr, start_id):
+        traversal_order.append(vertex_id)
+        if edge != -1:
+            traversal_edges.append(edge)
     return traversal_order, traversal_edges
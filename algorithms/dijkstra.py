@@ -1,9 +1,13 @@
 # file algorithms/dijkstra.py
 import heapq
+import numpy as np
 
-def dijkstra_search(graph_model, start_id, end_id):
+from .integer_dijkstra import INTEGER_SEARCHES, select_queue
+
+def dijkstra_search(graph_model, start_id, end_id, trace=None):
     """
     Tìm đường đi ngắn nhất từ start_id đến end_id.
+    trace: utils.trace.Trace (tùy chọn) - ghi sự kiện pop / relax / push của heap.
     """
     # 1. Khởi tạo
     # Dùng dictionary để lưu khoảng cách
@@ -16,6 +20,8 @@ def dijkstra_search(graph_model, start_id, end_id):
 
     while pq:
         current_dist, current_u = heapq.heappop(pq)
+        if trace is not None:
+            trace.pop(current_u, current_dist)
 
         # Nếu đã đến đích thì dừng
         if current_u == end_id:
@@ -24,10 +30,8 @@ def dijkstra_search(graph_model, start_id, end_id):
         if current_dist > distances[current_u]:
             continue
 
-        # Duyệt qua các cạnh để tìm hàng xóm
-        for edge in graph_model.edges:
-            neighbor = None
-
+        # Chỉ duyệt các cạnh kề với current_u (qua chỉ mục kề)
+        for neighbor, edge in graph_model.get_neighbors(current_u):
             # --- FIX LỖI TẠI ĐÂY: Đảm bảo trọng số luôn là số nguyên ---
             try:
                 w_str = edge.weight if edge.weight is not None else 1
@@ -36,18 +40,14 @@ def dijkstra_search(graph_model, start_id, end_id):
                 weight = 1 # Nếu lỗi thì mặc định là 1
             # -----------------------------------------------------------
 
-            # Kiểm tra xem cạnh này có nối với current_u không
-            if edge.start_vertex.id == current_u:
-                neighbor = edge.end_vertex.id
-            elif not graph_model.is_directed and edge.end_vertex.id == current_u:
-                neighbor = edge.start_vertex.id
-
-            if neighbor is not None:
-                new_dist = current_dist + weight
-                if new_dist < distances[neighbor]:
-                    distances[neighbor] = new_dist
-                    previous[neighbor] = current_u
-                    heapq.heappush(pq, (new_dist, neighbor))
+            new_dist = current_dist + weight
+            if new_dist < distances[neighbor]:
+                distances[neighbor] = new_dist
+                previous[neighbor] = current_u
+                heapq.heappush(pq, (new_dist, neighbor))
+                if trace is not None:
+                    trace.relax(current_u, neighbor, new_dist)
+                    trace.push(neighbor, new_dist, current_u)
 
     # 2. Truy vết lại đường đi
     path = []
@@ -58,7 +58,292 @@ def dijkstra_search(graph_model, start_id, end_id):
         return float('inf'), []
 
     while current is not None:
-        path.insert(0, current)
+        path.append(current)
         current = previous[current]
+    path.reverse()
 
     return distances[end_id], path
+
+
+def dijkstra_csr(csr, start_id, end_id, queue='auto', dial_max_weight=1000):
+    """
+    Dijkstra trên CSRGraph: trọng số lấy thẳng từ mảng float64, không ép kiểu lại
+    ở mỗi lần nới lỏng cạnh. Trả về: (distance, path_of_vertex_ids)
+    queue: hàng đợi ưu tiên ("auto": trọng số nguyên không âm, không quá dial_max_weight -> Dial,
+    xem integer_dijkstra.py; còn lại heapq).
+    """
+    source, target = csr.index_of(start_id), csr.index_of(end_id)
+    if source is None or target is None:
+        return float('inf'), []
+
+    kind = select_queue(csr.slot_weights, dial_max_weight) if queue == 'auto' else queue
+    if kind != 'heap':
+        dist, previous = _integer_search(csr, kind, source, target=target)
+        if target not in dist:
+            return float('inf'), []
+        previous[source] = -1
+        return csr.distance_value(dist[target]), _join_path(csr, previous, {target: -1}, target)
+
+    offsets, targets, weights = csr.offsets, csr.targets, csr.slot_weights
+    previous = np.full(csr.num_vertices, -1, dtype=np.int64)
+    dist = {source: 0.0} # Khoảng cách tới các đỉnh đã chạm tới (dict nhanh hơn truy cập mảng từng phần tử)
+
+    pq = [(0.0, source)]
+    while pq:
+        current_dist, u = heapq.heappop(pq)
+        if u == target:
+            break
+        if current_dist > dist[u]:
+            continue
+
+        a, b = offsets[u], offsets[u + 1]
+        for v, w in zip(targets[a:b].tolist(), weights[a:b].tolist()):
+            new_dist = current_dist + w
+            if new_dist < dist.get(v, float('inf')):
+                dist[v] = new_dist
+                previous[v] = u
+                heapq.heappush(pq, (new_dist, v))
+
+    if target not in dist:
+        return float('inf'), []
+
+    path = []
+    current = target
+    while current != -1:
+        path.append(current)
+        current = previous[current]
+    path.reverse()
+    return csr.distance_value(dist[target]), csr.node_ids[path].tolist()
+
+
+def _join_path(csr, prev_forward, prev_backward, meet):
+    """Ghép nửa đường từ nguồn tới điểm gặp và từ điểm gặp tới đích (theo chỉ số)."""
+    path = []
+    i = meet
+    while i != -1:
+        path.append(i)
+        i = prev_forward[i]
+    path.reverse()
+    i = prev_backward[meet]
+    while i != -1:
+        path.append(i)
+        i = prev_backward[i]
+    return csr.node_ids[path].tolist()
+
+
+def bidirectional_dijkstra_csr(csr, start_id, end_id):
+    """
+    Dijkstra hai chiều: tìm xuôi từ start_id và ngược từ end_id (trên đồ thị đảo chiều),
+    mỗi bước mở rộng phía có khóa nhỏ hơn; dừng khi tổng hai khóa nhỏ nhất >= đường tốt nhất.
+    Trả về: (distance, path_of_vertex_ids, explored) - explored: số đỉnh đã chốt.
+    """
+    s, t = csr.index_of(start_id), csr.index_of(end_id)
+    if s is None or t is None:
+        return float('inf'), [], 0
+    if s == t:
+        return csr.distance_value(0), [start_id], 1
+
+    graphs = (csr, csr.reverse())
+    dist = ({s: 0.0}, {t: 0.0})
+    prev = ({s: -1}, {t: -1})
+    settled = (bytearray(csr.num_vertices), bytearray(csr.num_vertices))
+    heaps = ([(0.0, s)], [(0.0, t)])
+    best, meet, explored = float('inf'), -1, 0
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        d, u = heapq.heappop(heaps[side])
+        if settled[side][u]:
+            continue
+        settled[side][u] = 1
+        explored += 1
+
+        g, my_dist, other_dist = graphs[side], dist[side], dist[1 - side]
+        a, b = g.offsets[u], g.offsets[u + 1]
+        for v, w in zip(g.targets[a:b].tolist(), g.slot_weights[a:b].tolist()):
+            new_dist = d + w
+            if new_dist < my_dist.get(v, float('inf')):
+                my_dist[v] = new_dist
+                prev[side][v] = u
+                heapq.heappush(heaps[side], (new_dist, v))
+                if v in other_dist and new_dist + other_dist[v] < best:
+                    best, meet = new_dist + other_dist[v], v
+
+    if meet == -1:
+        return float('inf'), [], explored
+    return csr.distance_value(best), _join_path(csr, prev[0], prev[1], meet), explored
+
+
+def astar_csr(csr, start_id, end_id, heuristic_scale=None):
+    """
+    A* với heuristic h(v) = k * khoảng cách Euclid (x, y) từ v tới end_id.
+    - heuristic_scale=None: tự tính k = csr.geometric_scale() (luôn chấp nhận được).
+    - Truyền k khi biết trọng số tỉ lệ với độ dài hình học (người gọi chịu trách nhiệm k hợp lệ).
+    k = 0 (không có tọa độ) tương đương Dijkstra thường.
+    Trả về: (distance, path_of_vertex_ids, explored)
+    """
+    s, t = csr.index_of(start_id), csr.index_of(end_id)
+    if s is None or t is None:
+        return float('inf'), [], 0
+
+    scale = csr.geometric_scale() if heuristic_scale is None else float(heuristic_scale)
+    if scale > 0 and csr.xs is not None and csr.ys is not None:
+        h = (scale * np.hypot(csr.xs - csr.xs[t], csr.ys - csr.ys[t])).tolist()
+    else:
+        h = None
+
+    offsets, targets, weights = csr.offsets, csr.targets, csr.slot_weights
+    dist = {s: 0.0}
+    previous = {s: -1}
+    closed = bytearray(csr.num_vertices)
+    explored = 0
+
+    # Hàng đợi: (f = g + h, g, đỉnh)
+    pq = [(h[s] if h else 0.0, 0.0, s)]
+    while pq:
+        _, g_u, u = heapq.heappop(pq)
+        if closed[u]:
+            continue
+        closed[u] = 1
+        explored += 1
+        if u == t:
+            break
+
+        a, b = offsets[u], offsets[u + 1]
+        for v, w in zip(targets[a:b].tolist(), weights[a:b].tolist()):
+            new_dist = g_u + w
+            if new_dist < dist.get(v, float('inf')):
+                dist[v] = new_dist
+                previous[v] = u
+                heapq.heappush(pq, (new_dist + (h[v] if h else 0.0), new_dist, v))
+
+    if not closed[t]:
+        return float('inf'), [], explored
+    return csr.distance_value(dist[t]), _join_path(csr, previous, {t: -1}, t), explored
+
+
+class ShortestPathTree:
+    """
+    Cây đường đi ngắn nhất từ một đỉnh nguồn (kết quả Dijkstra cho mọi đỉnh).
+    - distances:    float64[n] khoảng cách theo chỉ số đỉnh (inf nếu không tới được)
+    - predecessors: int32[n]   chỉ số đỉnh cha trên cây (-1: nguồn hoặc không tới được)
+    Truy vấn đường đi tới một đỉnh chỉ cần lần ngược cha: O(độ dài đường đi).
+    """
+
+    def __init__(self, csr, source_id, distances, predecessors):
+        self.csr = csr
+        self.source_id = source_id
+        self.distances = distances
+        self.predecessors = predecessors
+
+    def __len__(self):
+        return len(self.distances)
+
+    def distance_to(self, vertex_id):
+        i = self.csr.index_of(vertex_id)
+        if i is None:
+            return float('inf')
+        return self.csr.distance_value(self.distances[i])
+
+    def path_to(self, vertex_id):
+        """Trả về (distance, path_of_vertex_ids) giống dijkstra_csr."""
+        i = self.csr.index_of(vertex_id)
+        if i is None or self.distances[i] == np.inf:
+            return float('inf'), []
+        path = []
+        while i != -1:
+            path.append(i)
+            i = self.predecessors[i]
+        path.reverse()
+        return self.distance_value(path[-1]), self.csr.node_ids[path].tolist()
+
+    def distance_value(self, i):
+        return self.csr.distance_value(self.distances[i])
+
+    def to_dict(self):
+        """Dạng JSON: các mảng song song theo đỉnh (null = không tới được / không có cha)."""
+        reachable = np.isfinite(self.distances)
+        distances = np.where(reachable, self.distances, 0)
+        if self.csr.integer_weights:
+            distances = distances.astype(np.int64)
+        pred_ids = self.csr.node_ids[self.predecessors].tolist()
+        return {
+            "source": self.source_id,
+            "vertices": self.csr.node_ids.tolist(),
+            "distances": [d if ok else None for d, ok in zip(distances.tolist(), reachable.tolist())],
+            "predecessors": [p if i != -1 else None for p, i in zip(pred_ids, self.predecessors.tolist())],
+        }
+
+
+def _integer_search(csr, kind, source, slot_weights=None, target=None, progress=None):
+    """Chạy hàng đợi số nguyên kind ("dial" / "radix" / "zero_one") trên danh sách slot của CSR."""
+    weights = csr.slot_weights if slot_weights is None else slot_weights
+    return INTEGER_SEARCHES[kind](csr.offsets.tolist(), csr.targets.tolist(),
+                                  weights.astype(np.int64).tolist(), source, target, progress)
+
+
+def _dijkstra_full(csr, source, slot_weights=None, queue='auto', dial_max_weight=1000, progress=None):
+    """
+    Dijkstra không dừng sớm từ chỉ số source. Trả về (dist, previous) dạng dict theo chỉ số.
+    slot_weights: trọng số thay thế theo slot (vd. trọng số đã hiệu chỉnh của Johnson).
+    queue: "auto" chọn theo trọng số (select_queue), hoặc một trong QUEUE_KINDS.
+    progress: hook tiến độ (tùy chọn) - progress('vertices_settled', số đỉnh đã chốt) mỗi 4096 đỉnh.
+    """
+    offsets, targets = csr.offsets, csr.targets
+    weights = csr.slot_weights if slot_weights is None else slot_weights
+    kind = select_queue(weights, dial_max_weight) if queue == 'auto' else queue
+    if kind != 'heap':
+        return _integer_search(csr, kind, source, weights, progress=progress)
+    dist = {source: 0.0}
+    previous = {}
+    settled = bytearray(csr.num_vertices)
+    settled_count = 0
+
+    pq = [(0.0, source)]
+    while pq:
+        current_dist, u = heapq.heappop(pq)
+        if settled[u]:
+            continue
+        settled[u] = 1
+        settled_count += 1
+        if progress is not None and settled_count % 4096 == 0:
+            progress('vertices_settled', settled_count)
+
+        a, b = offsets[u], offsets[u + 1]
+        for v, w in zip(targets[a:b].tolist(), weights[a:b].tolist()):
+            new_dist = current_dist + w
+            if new_dist < dist.get(v, float('inf')):
+                dist[v] = new_dist
+                previous[v] = u
+                heapq.heappush(pq, (new_dist, v))
+
+    return dist, previous
+
+
+def dijkstra_distances_csr(csr, source, slot_weights=None, queue='auto'):
+    """Khoảng cách từ chỉ số source tới mọi đỉnh: float64[n] (inf nếu không tới được)."""
+    dist, _ = _dijkstra_full(csr, source, slot_weights, queue)
+    distances = np.full(csr.num_vertices, np.inf)
+    distances[list(dist)] = list(dist.values())
+    return distances
+
+
+def dijkstra_tree_csr(csr, start_id, queue='auto', dial_max_weight=1000, progress=None):
+    """
+    Dijkstra không dừng sớm: tính khoảng cách và đỉnh cha cho MỌI đỉnh từ start_id.
+    Trả về ShortestPathTree (None nếu start_id không tồn tại).
+    queue / dial_max_weight: chọn hàng đợi ưu tiên; progress: hook tiến độ (xem _dijkstra_full).
+    """
+    source = csr.index_of(start_id)
+    if source is None:
+        return None
+
+    dist, previous = _dijkstra_full(csr, source, queue=queue, dial_max_weight=dial_max_weight, progress=progress)
+    distances = np.full(csr.num_vertices, np.inf)
+    distances[list(dist)] = list(dist.values())
+    predecessors = np.full(csr.num_vertices, -1, dtype=np.int32)
+    if previous:
+        predecessors[list(previous)] = list(previous.values())
+    return ShortestPathTree(csr, start_id, distances, predecessors)
@@ -1,121 +1,138 @@
 # file algorithms/hierholzer.py
-import copy
+import numpy as np
+
+from .bfs import bfs_levels_csr
+
 
 def hierholzer_algorithm(model, start_id):
     """
     Tìm chu trình/đường đi Euler (Hierholzer).
     Xử lý chính xác cả 2 trường hợp: Có hướng (Directed) và Vô hướng (Undirected).
+    Trả về: (Success, Path_of_Vertex_IDs) - dùng lại bản CSR (xem hierholzer_csr).
     """
-    # ==========================================
-    # TRƯỜNG HỢP 1: ĐỒ THỊ VÔ HƯỚNG (UNDIRECTED)
-    # ==========================================
-    if not model.is_directed:
-        adj = {v.id: [] for v in model.vertices.values()}
-        degrees = {v.id: 0 for v in model.vertices.values()}
-
-        for edge in model.edges:
-            u, v = edge.start_vertex.id, edge.end_vertex.id
-            adj[u].append(v); adj[v].append(u)
-            degrees[u] += 1; degrees[v] += 1
-
-        odd_nodes = [v for v, d in degrees.items() if d % 2 != 0]
-
-        if len(odd_nodes) not in [0, 2]: return False, []
-
-        # Xử lý đường đi Euler (2 đỉnh lẻ) -> Thêm cạnh ảo
-        is_path = (len(odd_nodes) == 2)
-        u_odd, v_odd = None, None
-
-        # Lưu lại đỉnh người dùng muốn bắt đầu
-        user_requested_start = start_id
-
-        if is_path:
-            u_odd, v_odd = odd_nodes[0], odd_nodes[1]
-            adj[u_odd].append(v_odd); adj[v_odd].append(u_odd)
-            # Nếu user click vào đỉnh chẵn, thuật toán tự chọn đỉnh lẻ
-            if start_id not in odd_nodes: start_id = u_odd
-
-        # Chạy thuật toán
-        curr_path = [start_id]; circuit = []
-        while curr_path:
-            curr_v = curr_path[-1]
-            if adj[curr_v]:
-                next_v = adj[curr_v].pop()
-                if curr_v in adj[next_v]: adj[next_v].remove(curr_v)
-                curr_path.append(next_v)
-            else:
-                circuit.append(curr_path.pop())
-
-        circuit = circuit[::-1]
-
-        # Cắt cạnh ảo nếu là đường đi
-        if is_path and len(circuit) > 1:
-            for i in range(len(circuit) - 1):
-                u, v = circuit[i], circuit[i+1]
-                if (u == u_odd and v == v_odd) or (u == v_odd and v == u_odd):
-                    circuit = circuit[i+1:] + circuit[1:i+1]
-                    break
-
-        # [FIX QUAN TRỌNG] Nếu là đường đi Vô Hướng, và kết quả đang bị ngược so với ý user
-        # Ví dụ: User chọn 2, kết quả ra 3->1->2. Ta đảo lại thành 2->1->3
-        if is_path and circuit:
-            if circuit[0] != user_requested_start and circuit[-1] == user_requested_start:
-                circuit = circuit[::-1]
-
-        return True, circuit
-
-    # ==========================================
-    # TRƯỜNG HỢP 2: ĐỒ THỊ CÓ HƯỚNG (DIRECTED)
-    # ==========================================
-    else:
-        adj = {v.id: [] for v in model.vertices.values()}
-        in_degree = {v.id: 0 for v in model.vertices.values()}
-        out_degree = {v.id: 0 for v in model.vertices.values()}
+    from graph.csr_graph import CSRGraph
 
-        for edge in model.edges:
-            u, v = edge.start_vertex.id, edge.end_vertex.id
-            adj[u].append(v)
-            out_degree[u] += 1; in_degree[v] += 1
+    success, path, _ = hierholzer_csr(CSRGraph.from_graph_model(model), start_id)
+    return success, path
 
-        start_nodes = [v for v in adj if out_degree[v] - in_degree[v] == 1]
-        end_nodes = [v for v in adj if in_degree[v] - out_degree[v] == 1]
 
-        is_cycle = (len(start_nodes) == 0 and len(end_nodes) == 0)
-        is_path = (len(start_nodes) == 1 and len(end_nodes) == 1)
+def hierholzer_csr(csr, start_id, components=None, progress=None):
+    """
+    Hierholzer trên chỉ số cạnh của CSRGraph, O(V + E).
+    Trả về: (Success, Path_of_Vertex_IDs, Edge_indices)
+    - Edge_indices[k] là cạnh gốc nối Path[k] -> Path[k + 1], nên cạnh song song
+      và khuyên không bị nhầm lẫn khi tô màu.
+
+    Khác bản cũ:
+    - Không còn adj[v].remove(u) (O(bậc)): mỗi cạnh có cờ "đã dùng", mỗi đỉnh có con trỏ
+      tới cạnh kề tiếp theo -> "xóa" cạnh là O(1) cho cả hai chiều của cạnh vô hướng.
+    - Không thêm cạnh ảo rồi xoay chu trình: đường đi Euler được đi thẳng từ đỉnh lẻ
+      (có hướng: đỉnh ra - vào = 1).
+    - Kiểm tra mọi cạnh nằm trong cùng một thành phần liên thông trước khi đi.
+    Quy tắc chọn đỉnh bắt đầu giống bản cũ (xem euler_start_csr).
+    components: nhãn thành phần liên thông yếu đã tính (components.weak_components_csr),
+    dùng lại cho bước kiểm tra liên thông thay vì BFS.
+    progress: hook tiến độ (tùy chọn, xem euler_walk_csr).
+    """
+    start = euler_start_csr(csr, start_id, components)
+    if start is None:
+        return False, [], []
+    if csr.num_edges == 0:
+        return True, [start_id], []
 
-        if not (is_cycle or is_path): return False, []
+    view = csr if csr.is_directed else csr.undirected()
+    vertices, edges = euler_walk_csr(view, start, progress)
+    return True, csr.node_ids[vertices].tolist(), edges
 
-        unbalanced = [v for v in adj if in_degree[v] != out_degree[v]]
-        if is_cycle and len(unbalanced) > 0: return False, []
-        if is_path and len(unbalanced) > 2: return False, []
 
-        u_start, v_end = None, None
-        if is_path:
-            u_start = start_nodes[0]
-            v_end = end_nodes[0]
-            adj[v_end].append(u_start)
-            start_id = u_start
+def euler_start_csr(csr, start_id, components=None):
+    """
+    Kiểm tra điều kiện Euler trong O(V + E) và chọn đỉnh bắt đầu (chỉ số).
+    - Vô hướng: 0 hoặc 2 đỉnh bậc lẻ; có 2 đỉnh lẻ thì phải bắt đầu từ một trong hai
+      (start_id không lẻ -> đỉnh lẻ có ID nhỏ nhất).
+    - Có hướng: mọi đỉnh cân bằng, hoặc đúng một đỉnh ra - vào = 1 (bắt đầu tại đó)
+      và một đỉnh vào - ra = 1.
+    - Mọi đỉnh có cạnh phải nằm trong cùng một thành phần liên thông (bỏ qua chiều cạnh).
+    start_id không có cạnh (hoặc không tồn tại) -> bắt đầu từ đỉnh có cạnh đầu tiên.
+    components: ComponentLabels liên thông yếu (tùy chọn) -> kiểm tra liên thông bằng nhãn.
+    Trả về None nếu đồ thị không có đường đi Euler.
+    """
+    n = csr.num_vertices
+    start = csr.index_of(start_id)
+    if csr.num_edges == 0:
+        return start if start is not None else 0
+
+    out_degree = np.bincount(csr.src, minlength=n)
+    in_degree = np.bincount(csr.dst, minlength=n)
+
+    if csr.is_directed:
+        balance = out_degree - in_degree
+        unbalanced = np.flatnonzero(balance)
+        if len(unbalanced) == 2 and sorted(balance[unbalanced].tolist()) == [-1, 1]:
+            start = int(unbalanced[balance[unbalanced] == 1][0])
+        elif len(unbalanced):
+            return None
+        has_exit = out_degree
+    else:
+        degree = out_degree + in_degree # Khuyên được tính 2 lần
+        odd = np.flatnonzero(degree % 2)
+        if len(odd) == 2:
+            if start not in odd.tolist():
+                start = int(odd[0])
+        elif len(odd):
+            return None
+        has_exit = degree
+
+    if start is None or has_exit[start] == 0:
+        start = int(np.flatnonzero(has_exit)[0])
+
+    touched = (out_degree + in_degree) > 0
+    if components is not None:
+        return start if components.same_component(np.flatnonzero(touched)) else None
+
+    # Liên thông: BFS (vô hướng) từ đỉnh bắt đầu phải chạm mọi đỉnh có cạnh
+    visited = np.zeros(n, dtype=bool)
+    for _ in bfs_levels_csr(csr.undirected(), start, visited):
+        pass
+    if np.any(touched & ~visited):
+        return None
+    return start
+
+
+def euler_walk_csr(view, start, progress=None):
+    """
+    Hierholzer không đệ quy trên chỉ số cạnh (view: CSR có hướng hoặc bản vô hướng).
+    Giả định điều kiện Euler đã được kiểm tra. Trả về (chỉ số đỉnh, chỉ số cạnh gốc) theo thứ tự đi.
+    progress: progress('edges_walked', số cạnh đã đi) mỗi 4096 cạnh (tùy chọn).
+    """
+    offsets = view.offsets.tolist()
+    targets = view.targets.tolist()
+    slot_edges = view.slot_edges.tolist()
+    pointer = offsets[:-1] # Cạnh kề tiếp theo cần xét của mỗi đỉnh
+    used = bytearray(view.num_edges)
+
+    stack_vertices, stack_edges = [start], [-1]
+    trail_vertices, trail_edges = [], []
+    walked = 0
+    while stack_vertices:
+        u = stack_vertices[-1]
+        i, end = pointer[u], offsets[u + 1]
+        while i < end and used[slot_edges[i]]:
+            i += 1
+        if i < end:
+            pointer[u] = i + 1
+            edge = slot_edges[i]
+            used[edge] = 1
+            stack_vertices.append(targets[i])
+            stack_edges.append(edge)
+            walked += 1
+            if progress is not None and walked % 4096 == 0:
+                progress('edges_walked', walked)
         else:
-            if out_degree[start_id] == 0:
-                candidates = [v for v in adj if out_degree[v] > 0]
-                if candidates: start_id = candidates[0]
-
-        curr_path = [start_id]; circuit = []
-        while curr_path:
-            curr_v = curr_path[-1]
-            if adj[curr_v]:
-                next_v = adj[curr_v].pop()
-                curr_path.append(next_v)
-            else:
-                circuit.append(curr_path.pop())
-
-        circuit = circuit[::-1]
-
-        if is_path and len(circuit) > 1:
-            for i in range(len(circuit) - 1):
-                u, v = circuit[i], circuit[i+1]
-                if u == v_end and v == u_start:
-                    circuit = circuit[i+1:] + circuit[1:i+1]
-                    break
-
-        return True, circuit
+            pointer[u] = i
+            trail_vertices.append(stack_vertices.pop())
+            trail_edges.append(stack_edges.pop())
+
+    trail_vertices.reverse()
+    trail_edges.reverse()
+    return trail_vertices, trail_edges[1:]
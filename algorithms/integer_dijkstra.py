@@ -0,0 +1,173 @@
+# file algorithms/integer_dijkstra.py
+from collections import deque
+
+import numpy as np
+
+# Hàng đợi ưu tiên cho Dijkstra khi trọng số là số nguyên không âm (trường hợp thường gặp:
+# trọng số nhập từ giao diện luôn là số nguyên). Khóa là số nguyên và tăng dần theo thứ tự lấy
+# ra (monotone), nên không cần heap tổng quát:
+# - "zero_one": 0-1 BFS (deque), chỉ đúng khi trọng số chỉ gồm 0 và 1.
+# - "dial":     mảng xô vòng (Dial) kích thước C + 1, C = trọng số lớn nhất - O(E + V * C) xấu nhất.
+# - "radix":    radix heap 1 mức (xô theo bit cao nhất khác với khóa vừa lấy) - O(E log C).
+# - "heap":     heapq (trọng số thực, âm, hoặc C > dial_max_weight).
+# "auto" không chọn radix: trên CPython, heapq (viết bằng C) nhanh hơn radix heap viết bằng
+# Python ở mọi kích thước đã đo (xem benchmarks/dijkstra_queues.py); radix chỉ dùng khi yêu cầu rõ.
+# "auto" cũng không chọn zero_one: với trọng số 0/1, Dial (2 xô) và 0-1 BFS nhanh ngang nhau
+# (~1.7-2.2x heapq, chênh lệch giữa hai bên nằm trong nhiễu đo), nhưng Dial chốt các đỉnh cùng
+# khoảng cách theo thứ tự chỉ số nên đường đi khớp bản heapq thường xuyên hơn (0-1 BFS theo FIFO).
+# Mọi hàm *_search nhận (offsets, targets, weights) dạng list theo slot CSR và trả về
+# (dist, previous) dạng dict theo chỉ số như dijkstra._dijkstra_full; target: dừng khi chốt đỉnh này;
+# progress (tùy chọn): progress('vertices_settled', số đỉnh đã chốt) mỗi 4096 đỉnh.
+# Trọng số dương: các đỉnh cùng khoảng cách được chốt theo thứ tự chỉ số (như heap (d, đỉnh)),
+# nên đường đi tìm được trùng với bản heapq.
+QUEUE_KINDS = ('heap', 'dial', 'radix', 'zero_one')
+
+
+def select_queue(weights, dial_max_weight=1000):
+    """Chọn hàng đợi phù hợp với mảng trọng số (xem đầu file)."""
+    if len(weights) == 0:
+        return 'dial'
+    low, high = float(weights.min()), float(weights.max())
+    if low < 0 or not np.all(weights == np.floor(weights)):
+        return 'heap'
+    if high <= dial_max_weight:
+        return 'dial'
+    return 'heap'
+
+
+def queue_supports(kind, weights):
+    """Hàng đợi kind có cho kết quả đúng với mảng trọng số này không."""
+    if kind not in QUEUE_KINDS:
+        return False
+    if kind == 'heap' or len(weights) == 0:
+        return True
+    if weights.min() < 0 or not np.all(weights == np.floor(weights)):
+        return False
+    return kind != 'zero_one' or weights.max() <= 1
+
+
+def dial_search(offsets, targets, weights, source, target=None, progress=None):
+    """Dial: xô thứ d % (C + 1) chứa các đỉnh có khoảng cách tạm d (xóa lười)."""
+    size = max(weights, default=0) + 1
+    buckets = [[] for _ in range(size)]
+    buckets[0].append(source)
+    dist = {source: 0}
+    previous = {}
+    settled = bytearray(len(offsets) - 1)
+    settled_count = 0
+    pending = 1 # Số phần tử đang nằm trong các xô
+    current = 0
+
+    while pending:
+        bucket = buckets[current % size]
+        while bucket:
+            buckets[current % size] = []
+            pending -= len(bucket)
+            bucket.sort()
+            for u in bucket:
+                if settled[u] or dist[u] != current:
+                    continue
+                settled[u] = 1
+                settled_count += 1
+                if progress is not None and settled_count % 4096 == 0:
+                    progress('vertices_settled', settled_count)
+                if u == target:
+                    return dist, previous
+                for i in range(offsets[u], offsets[u + 1]):
+                    v = targets[i]
+                    new_dist = current + weights[i]
+                    if new_dist < dist.get(v, new_dist + 1):
+                        dist[v] = new_dist
+                        previous[v] = u
+                        buckets[new_dist % size].append(v)
+                        pending += 1
+            bucket = buckets[current % size] # Cạnh trọng số 0 thêm vào chính xô này
+        current += 1
+
+    return dist, previous
+
+
+def radix_search(offsets, targets, weights, source, target=None, progress=None):
+    """
+    Radix heap: đỉnh khóa k nằm ở xô (k ^ last).bit_length(), last = khóa lấy ra gần nhất.
+    Khi xô 0 rỗng, xô khác rỗng đầu tiên được chia lại theo khóa nhỏ nhất của nó: mỗi phần tử
+    chỉ chuyển xuống xô thấp hơn -> tổng O(E log C). Xô chỉ giữ đỉnh, khóa đọc từ dist
+    (bản cũ của một đỉnh đã được nới lỏng đi theo khóa mới; bản của đỉnh đã chốt bị bỏ khi chia lại).
+    """
+    # Khóa lớn nhất có thể: (V - 1) * C -> số xô = số bit của nó + 1
+    buckets = [[] for _ in range((max(weights, default=0) * len(offsets)).bit_length() + 1)]
+    buckets[0].append(source)
+    dist = {source: 0}
+    previous = {}
+    settled = bytearray(len(offsets) - 1)
+    settled_count = 0
+    last = 0
+
+    while True:
+        if not buckets[0]:
+            k = next((k for k in range(1, len(buckets)) if buckets[k]), None)
+            if k is None:
+                break
+            items, buckets[k] = [v for v in buckets[k] if not settled[v]], []
+            if not items:
+                continue
+            last = min([dist[v] for v in items])
+            for v in items:
+                buckets[(dist[v] ^ last).bit_length()].append(v)
+
+        bucket, buckets[0] = buckets[0], []
+        bucket.sort()
+        for u in bucket:
+            if settled[u]:
+                continue
+            settled[u] = 1
+            settled_count += 1
+            if progress is not None and settled_count % 4096 == 0:
+                progress('vertices_settled', settled_count)
+            if u == target:
+                return dist, previous
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                new_dist = last + weights[i]
+                if new_dist < dist.get(v, new_dist + 1):
+                    dist[v] = new_dist
+                    previous[v] = u
+                    buckets[(new_dist ^ last).bit_length()].append(v)
+
+    return dist, previous
+
+
+def zero_one_search(offsets, targets, weights, source, target=None, progress=None):
+    """0-1 BFS: cạnh 0 đẩy vào đầu deque, cạnh 1 đẩy vào cuối - deque luôn có khóa d hoặc d + 1."""
+    queue = deque([(0, source)])
+    dist = {source: 0}
+    previous = {}
+    settled = bytearray(len(offsets) - 1)
+    settled_count = 0
+
+    while queue:
+        d, u = queue.popleft()
+        if settled[u]:
+            continue
+        settled[u] = 1
+        settled_count += 1
+        if progress is not None and settled_count % 4096 == 0:
+            progress('vertices_settled', settled_count)
+        if u == target:
+            break
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            w = weights[i]
+            new_dist = d + w
+            if new_dist < dist.get(v, new_dist + 1):
+                dist[v] = new_dist
+                previous[v] = u
+                if w:
+                    queue.append((new_dist, v))
+                else:
+                    queue.appendleft((new_dist, v))
+
+    return dist, previous
+
+
+INTEGER_SEARCHES = {'dial': dial_search, 'radix': radix_search, 'zero_one': zero_one_search}
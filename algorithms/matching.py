@@ -0,0 +1,118 @@
+# file algorithms/matching.py
+from collections import deque
+
+import numpy as np
+
+from .bipartite import bipartite_csr
+
+
+class MatchingResult:
+    """
+    Cặp ghép cực đại trên đồ thị 2 phía:
+    - edges: int64[] chỉ số cạnh gốc thuộc cặp ghép (tăng dần)
+    - left:  int64[] chỉ số các đỉnh phía trái (màu 0), right: phía phải (màu 1)
+    - phases: số pha BFS/DFS của Hopcroft–Karp (<= O(sqrt(V)))
+    """
+
+    def __init__(self, csr, edges, left, right, phases):
+        self.csr = csr
+        self.edges = edges
+        self.left = left
+        self.right = right
+        self.phases = phases
+
+    @property
+    def size(self):
+        return len(self.edges)
+
+    def to_dict(self):
+        csr = self.csr
+        return {
+            "size": self.size,
+            "matching": [{"u": u, "v": v} for u, v in csr.edge_pairs(self.edges)],
+            "edge_indices": self.edges.tolist(),
+            "left": csr.node_ids[self.left].tolist(),
+            "right": csr.node_ids[self.right].tolist(),
+            "phases": self.phases,
+        }
+
+
+def hopcroft_karp_csr(csr, coloring=None):
+    """
+    Cặp ghép cực đại Hopcroft–Karp trên CSRGraph (xét như vô hướng), O(E sqrt(V)).
+    Hai phía lấy từ phép tô 2 màu (bipartite_csr; truyền coloring nếu đã tính).
+    Mỗi pha: BFS từ mọi đỉnh trái tự do dựng đồ thị tầng tới tầng gần nhất có đỉnh phải
+    tự do, rồi DFS lặp (con trỏ cạnh cho mỗi đỉnh) tìm tập đường tăng ngắn nhất rời nhau.
+    Trả về MatchingResult, hoặc None nếu đồ thị không phải 2 phía.
+    """
+    coloring = coloring or bipartite_csr(csr)
+    if not coloring.is_bipartite:
+        return None
+
+    graph = csr.undirected()
+    n = graph.num_vertices
+    offsets = graph.offsets.tolist()
+    targets = graph.targets.tolist()
+    slot_edges = graph.slot_edges.tolist()
+    left = np.flatnonzero(coloring.colors == 0)
+    left_list = left.tolist()
+
+    match = [-1] * n # Đỉnh đối diện trong cặp ghép (cả hai phía)
+    match_edge = [-1] * n # Cạnh gốc ghép đỉnh trái
+    infinity = n + 1
+    phases = 0
+
+    while True:
+        # BFS: tầng của các đỉnh trái, bắt đầu từ các đỉnh trái tự do
+        dist = [infinity] * n
+        queue = deque()
+        for u in left_list:
+            if match[u] == -1:
+                dist[u] = 0
+                queue.append(u)
+        limit = infinity # Tầng có đỉnh phải tự do gần nhất
+        while queue:
+            u = queue.popleft()
+            if dist[u] >= limit:
+                break
+            for v in targets[offsets[u]:offsets[u + 1]]:
+                w = match[v]
+                if w == -1:
+                    limit = dist[u]
+                elif dist[w] == infinity:
+                    dist[w] = dist[u] + 1
+                    queue.append(w)
+        if limit == infinity:
+            break
+        phases += 1
+
+        # DFS: đường tăng đi đúng theo tầng, đỉnh bế tắc bị loại khỏi pha (dist = infinity)
+        pointer = offsets[:-1]
+        for root in left_list:
+            if match[root] != -1 or dist[root] != 0:
+                continue
+            stack = [root]
+            while stack:
+                u = stack[-1]
+                i = pointer[u]
+                if i == offsets[u + 1]:
+                    dist[u] = infinity
+                    stack.pop()
+                    continue
+                pointer[u] = i + 1
+                v = targets[i]
+                w = match[v]
+                if w == -1:
+                    if dist[u] == limit:
+                        # Tăng dọc ngăn xếp: mỗi đỉnh trái ghép với đỉnh qua slot vừa đi
+                        for x in reversed(stack):
+                            slot = pointer[x] - 1
+                            y = targets[slot]
+                            match[x], match[y] = y, x
+                            match_edge[x] = slot_edges[slot]
+                        break
+                elif dist[w] == dist[u] + 1:
+                    stack.append(w)
+
+    edges = np.sort(np.array([match_edge[u] for u in left_list if match[u] != -1], dtype=np.int64))
+    return MatchingResult(csr, edges, left, np.flatnonzero(coloring.colors == 1), phases)
@@ -1,6 +1,8 @@
 # file algorithms/max_flow.py
 from collections import deque
 
+import numpy as np
+
 def bfs_find_path(graph_adj, source, sink, parent):
     """Hàm tìm đường tăng luồng bằng BFS"""
     visited = set()
@@ -20,10 +22,11 @@ def bfs_find_path(graph_adj, source, sink, parent):
                     return True
     return False
 
-def ford_fulkerson(model, source_id, sink_id):
+def ford_fulkerson(model, source_id, sink_id, trace=None):
     """
     Thuật toán Edmonds-Karp (cài đặt của Ford-Fulkerson).
     Trả về: (max_flow_value, flow_dict)
+    trace: utils.trace.Trace (tùy chọn) - ghi mỗi đường tăng luồng (augment + flow từng cạnh).
     """
     # 1. Xây dựng đồ thị thặng dư (Residual Graph)
     # graph_adj[u][v] lưu dung lượng còn lại
@@ -59,6 +62,11 @@ def ford_fulkerson(model, source_id, sink_id):
 
         # Cập nhật dung lượng thặng dư
         max_flow += path_flow
+        if trace is not None:
+            path = [sink_id]
+            while path[-1] != source_id:
+                path.append(parent[path[-1]])
+            trace.augment(path[::-1], path_flow)
         v = sink_id
         while v != source_id:
             u = parent[v]
@@ -73,3 +81,331 @@ def ford_fulkerson(model, source_id, sink_id):
             v = parent[v]
 
     return max_flow, flow_on_edges
+
+
+# ==========================================================
+# LUỒNG CỰC ĐẠI TRÊN MẢNG (CSRGraph): DINIC & PUSH-RELABEL
+# ==========================================================
+class FlowNetwork:
+    """
+    Đồ thị thặng dư lưu bằng mảng phẳng (list Python cho vòng lặp nhanh):
+    - Cạnh song song (u, v) được gộp, dung lượng cộng dồn -> mỗi cặp là một "cung" i.
+    - Cung xuôi 2i (u -> v, dung lượng c), cung ngược 2i + 1 (v -> u, dung lượng 0);
+      cung ngược của a luôn là a ^ 1.
+    - head[a]: đỉnh cuối của cung a; cap[a]: dung lượng còn lại; arcs_of[u]: các cung ra khỏi u.
+    """
+
+    def __init__(self, csr):
+        self.csr = csr
+        n = self.n = csr.num_vertices
+
+        # Gộp cạnh song song theo cặp (u, v); thứ tự cặp: theo đỉnh đầu, rồi lần xuất hiện đầu tiên
+        keys, first, inverse = np.unique(csr.src.astype(np.int64) * max(n, 1) + csr.dst,
+                                         return_index=True, return_inverse=True)
+        capacities = np.zeros(len(keys))
+        np.add.at(capacities, inverse, np.maximum(csr.weights, 0))
+        order = np.lexsort((first, csr.src[first]))
+        self.pair_src = csr.src[first[order]].astype(np.int64)
+        self.pair_dst = csr.dst[first[order]].astype(np.int64)
+        capacities = capacities[order]
+        if csr.integer_weights:
+            capacities = capacities.astype(np.int64)
+        self.capacities = capacities
+
+        pairs = len(capacities)
+        tails = np.empty(2 * pairs, dtype=np.int64)
+        heads = np.empty(2 * pairs, dtype=np.int64)
+        tails[0::2], tails[1::2] = self.pair_src, self.pair_dst
+        heads[0::2], heads[1::2] = self.pair_dst, self.pair_src
+        cap = np.zeros(2 * pairs, dtype=capacities.dtype)
+        cap[0::2] = capacities
+
+        # Danh sách cung ra của từng đỉnh (sắp theo đỉnh đầu, ổn định)
+        by_tail = np.argsort(tails, kind='stable')
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(tails, minlength=n), out=offsets[1:])
+        arc_list = by_tail.tolist()
+        bounds = offsets.tolist()
+        self.arcs_of = [arc_list[bounds[u]:bounds[u + 1]] for u in range(n)]
+        self.head = heads.tolist()
+        self.cap = cap.tolist()
+
+    def edge_flows(self):
+        """Luồng trên từng cặp (u, v) = dung lượng ban đầu - dung lượng còn lại của cung xuôi."""
+        remaining = np.array(self.cap[0::2], dtype=self.capacities.dtype)
+        return self.capacities - remaining
+
+    def residual_reachable(self, source):
+        """Các đỉnh tới được từ source trên đồ thị thặng dư (phía source của lát cắt hẹp nhất)."""
+        seen = [False] * self.n
+        seen[source] = True
+        queue = deque([source])
+        head, cap, arcs_of = self.head, self.cap, self.arcs_of
+        while queue:
+            u = queue.popleft()
+            for a in arcs_of[u]:
+                v = head[a]
+                if cap[a] > 0 and not seen[v]:
+                    seen[v] = True
+                    queue.append(v)
+        return np.array(seen, dtype=bool)
+
+
+class MaxFlowResult:
+    """Kết quả luồng cực đại: giá trị, luồng trên từng cạnh và lát cắt hẹp nhất (min cut)."""
+
+    def __init__(self, network, value, algorithm, source):
+        self.network = network
+        self.value = value
+        self.algorithm = algorithm
+        self.flows = network.edge_flows()
+        self.source_side = network.residual_reachable(source)
+
+    def __len__(self):
+        return len(self.flows)
+
+    def cut_pairs(self):
+        """Chỉ số các cặp (u, v) thuộc lát cắt: u phía source, v phía sink."""
+        net = self.network
+        return np.flatnonzero(self.source_side[net.pair_src] & ~self.source_side[net.pair_dst])
+
+    def flow_edge_chunks(self, chunk_size):
+        """Luồng trên từng cạnh [{u, v, flow, capacity}, ...], chia thành từng khối chunk_size cạnh."""
+        net = self.network
+        ids = net.csr.node_ids
+        for start in range(0, len(self.flows), chunk_size):
+            end = start + chunk_size
+            yield [
+                {"u": u, "v": v, "flow": f, "capacity": c}
+                for u, v, f, c in zip(ids[net.pair_src[start:end]].tolist(), ids[net.pair_dst[start:end]].tolist(),
+                                      self.flows[start:end].tolist(), net.capacities[start:end].tolist())
+            ]
+
+    def summary(self):
+        """Giá trị luồng, thuật toán và lát cắt hẹp nhất (không kèm luồng từng cạnh)."""
+        net = self.network
+        ids = net.csr.node_ids
+        cut = self.cut_pairs()
+        value = self.value
+        return {
+            "max_flow": int(value) if net.csr.integer_weights else value,
+            "algorithm": self.algorithm,
+            "min_cut": {
+                "source_side": ids[self.source_side].tolist(),
+                "sink_side": ids[~self.source_side].tolist(),
+                "edges": [{"u": u, "v": v} for u, v in zip(ids[net.pair_src[cut]].tolist(),
+                                                            ids[net.pair_dst[cut]].tolist())],
+            },
+        }
+
+    def to_dict(self):
+        flow_edges = []
+        for chunk in self.flow_edge_chunks(max(len(self.flows), 1)):
+            flow_edges.extend(chunk)
+        return {**self.summary(), "flow_edges": flow_edges}
+
+
+def max_flow_csr(csr, source_id, sink_id, algorithm='dinic', progress=None):
+    """
+    Luồng cực đại trên CSRGraph (cạnh luôn xét có hướng, dung lượng = trọng số, cạnh song song cộng dồn).
+    algorithm: "dinic" (mặc định) hoặc "push_relabel".
+    progress: hook tiến độ progress(tên, giá trị) (tùy chọn, vd. utils.jobs.Checkpoint) - được gọi
+    sau mỗi đường tăng luồng (Dinic) / mỗi lần relabel (push-relabel), có thể ném lỗi để dừng giữa chừng.
+    Trả về MaxFlowResult. Đỉnh không tồn tại / source trùng sink -> ValueError.
+    """
+    source, sink = csr.index_of(source_id), csr.index_of(sink_id)
+    if source is None or sink is None:
+        missing = source_id if source is None else sink_id
+        raise ValueError(f"The node {missing} is not in the graph.")
+    if source == sink:
+        raise ValueError("source and sink are the same node")
+
+    network = FlowNetwork(csr)
+    if algorithm == 'dinic':
+        value = dinic(network, source, sink, progress)
+    elif algorithm == 'push_relabel':
+        value = push_relabel(network, source, sink, progress)
+    else:
+        raise ValueError(f"Unknown max flow algorithm: {algorithm}")
+    return MaxFlowResult(network, value, algorithm, source)
+
+
+def dinic(net, source, sink, progress=None):
+    """
+    Dinic: BFS dựng đồ thị phân tầng, rồi tìm luồng chặn bằng DFS không đệ quy
+    với con trỏ cung hiện tại (it[u]). Sau mỗi lần tăng luồng chỉ lùi về
+    cung bão hòa đầu tiên thay vì bắt đầu lại từ source. O(V^2 * E).
+    """
+    n, head, cap, arcs_of = net.n, net.head, net.cap, net.arcs_of
+    flow = 0
+    phases = paths = 0
+
+    while True:
+        # 1. Đồ thị phân tầng
+        level = [-1] * n
+        level[source] = 0
+        queue = deque([source])
+        while queue and level[sink] < 0:
+            u = queue.popleft()
+            next_level = level[u] + 1
+            for a in arcs_of[u]:
+                v = head[a]
+                if cap[a] > 0 and level[v] < 0:
+                    level[v] = next_level
+                    queue.append(v)
+        if level[sink] < 0:
+            return flow
+        phases += 1
+        if progress is not None:
+            progress('phases', phases)
+
+        # 2. Luồng chặn
+        it = [0] * n
+        path = [] # Các cung trên đường đang xét
+        u = source
+        while True:
+            if u == sink:
+                pushed = min(cap[a] for a in path)
+                flow += pushed
+                paths += 1
+                if progress is not None:
+                    progress('augmenting_paths', paths)
+                cut = None
+                for i, a in enumerate(path):
+                    cap[a] -= pushed
+                    cap[a ^ 1] += pushed
+                    if cut is None and cap[a] == 0:
+                        cut = i
+                del path[cut:]
+                u = head[path[-1]] if path else source
+                continue
+
+            arcs = arcs_of[u]
+            i, end, want = it[u], len(arcs), level[u] + 1
+            while i < end:
+                a = arcs[i]
+                if cap[a] > 0 and level[head[a]] == want:
+                    break
+                i += 1
+            it[u] = i
+
+            if i < end:
+                path.append(arcs[i])
+                u = head[arcs[i]]
+            elif u == source:
+                break
+            else:
+                # Ngõ cụt: loại u khỏi đồ thị phân tầng, lùi lại một cung
+                level[u] = -1
+                a = path.pop()
+                u = head[a ^ 1]
+                it[u] += 1
+
+
+def push_relabel(net, source, sink, progress=None):
+    """
+    Push-relabel (FIFO) với hai heuristic:
+    - Global relabel: định kỳ đặt lại độ cao = khoảng cách BFS ngược tới sink
+      (đỉnh không tới được sink: n + khoảng cách tới source).
+    - Gap: khi không còn đỉnh nào ở độ cao k < n, mọi đỉnh cao hơn k (và < n)
+      không thể tới sink nữa -> nâng thẳng lên n + 1.
+    Chạy tới khi không còn đỉnh dư, nên luồng trả về là luồng hợp lệ (không chỉ tiền luồng).
+    """
+    n, head, cap, arcs_of = net.n, net.head, net.cap, net.arcs_of
+    height = [0] * n
+    excess = [0] * n
+    count = [0] * (2 * n + 2) # Số đỉnh ở mỗi độ cao
+    it = [0] * n
+    active = deque()
+    in_queue = [False] * n
+    in_queue[source] = in_queue[sink] = True # Không bao giờ xếp hàng source/sink
+
+    def global_relabel():
+        for h in range(len(count)):
+            count[h] = 0
+        for u in range(n):
+            height[u] = -1
+            it[u] = 0
+        for root, base in ((sink, 0), (source, n)):
+            height[root] = base
+            queue = deque([root])
+            while queue:
+                v = queue.popleft()
+                hv = height[v] + 1
+                for a in arcs_of[v]:
+                    u = head[a]
+                    # Cung u -> v là a ^ 1
+                    if height[u] < 0 and cap[a ^ 1] > 0:
+                        height[u] = hv
+                        queue.append(u)
+        for u in range(n):
+            if height[u] < 0:
+                height[u] = 2 * n
+            count[height[u]] += 1
+
+    # Tiền luồng: bão hòa mọi cung ra khỏi source
+    for a in arcs_of[source]:
+        pushed = cap[a]
+        if pushed > 0:
+            v = head[a]
+            cap[a] = 0
+            cap[a ^ 1] += pushed
+            excess[v] += pushed
+            excess[source] -= pushed
+            if not in_queue[v]:
+                in_queue[v] = True
+                active.append(v)
+
+    global_relabel()
+    relabels_since_global = relabels = 0
+
+    while active:
+        u = active.popleft()
+        in_queue[u] = False
+        arcs = arcs_of[u]
+
+        while excess[u] > 0:
+            if it[u] == len(arcs):
+                # Relabel: độ cao mới = 1 + độ cao thấp nhất của đỉnh kề còn cung thặng dư
+                old = height[u]
+                new = 2 * n
+                for a in arcs:
+                    if cap[a] > 0 and height[head[a]] + 1 < new:
+                        new = height[head[a]] + 1
+                count[old] -= 1
+                if old < n and count[old] == 0:
+                    # Gap heuristic
+                    for w in range(n):
+                        if old < height[w] < n:
+                            count[height[w]] -= 1
+                            height[w] = n + 1
+                            count[n + 1] += 1
+                    new = max(new, n + 1)
+                height[u] = new
+                count[new] += 1
+                it[u] = 0
+
+                relabels_since_global += 1
+                if progress is not None:
+                    relabels += 1
+                    progress('relabels', relabels)
+                if relabels_since_global >= n:
+                    relabels_since_global = 0
+                    global_relabel()
+                continue
+
+            a = arcs[it[u]]
+            v = head[a]
+            if cap[a] > 0 and height[u] == height[v] + 1:
+                pushed = min(excess[u], cap[a])
+                cap[a] -= pushed
+                cap[a ^ 1] += pushed
+                excess[u] -= pushed
+                excess[v] += pushed
+                if not in_queue[v]:
+                    in_queue[v] = True
+                    active.append(v)
+            else:
+                it[u] += 1
+
+    return excess[sink]
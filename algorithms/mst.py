@@ -1,10 +1,18 @@
 #  file algorithms/mst.py
 import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .union_find import UnionFind, compress_labels
 
 # --- 1. PRIM ALGORITHM ---
-def prim_algorithm(model, start_id):
+def prim_algorithm(model, start_id, trace=None):
     """
     Trả về danh sách các cạnh (Edge Objects) thuộc cây khung nhỏ nhất (MST)
+    trace: utils.trace.Trace (tùy chọn) - ghi push / pop heap và cạnh được chọn / bỏ.
     """
     if start_id not in model.vertices:
         return []
@@ -15,64 +23,237 @@ def prim_algorithm(model, start_id):
     # Hàng đợi ưu tiên lưu (trọng số, id_đỉnh_nguồn, id_đỉnh_đích)
     # Lấy tất cả cạnh từ đỉnh bắt đầu
     edges_heap = []
-    for edge in model.edges:
-        u, v = edge.start_vertex.id, edge.end_vertex.id
+    for v, edge in model.get_neighbors(start_id):
         w = edge.weight if edge.weight is not None else 1
-
-        if u == start_id:
-            heapq.heappush(edges_heap, (w, u, v, edge))
-        elif not model.is_directed and v == start_id:
-            heapq.heappush(edges_heap, (w, v, u, edge))
+        heapq.heappush(edges_heap, (w, start_id, v, edge))
+        if trace is not None:
+            trace.push(v, w, start_id)
 
     while edges_heap:
         w, u, v, edge_obj = heapq.heappop(edges_heap)
+        if trace is not None:
+            trace.pop(v, w)
 
-        if v not in visited:
+        if v in visited:
+            if trace is not None:
+                trace.reject(u, v, w)
+        else:
             visited.add(v)
             mst_edges.append(edge_obj)
+            if trace is not None:
+                trace.select(u, v, w)
 
-            # Thêm các cạnh nối từ đỉnh v mới thăm vào heap
-            for next_edge in model.edges:
-                nu, nv = next_edge.start_vertex.id, next_edge.end_vertex.id
-                nw = next_edge.weight if next_edge.weight is not None else 1
-
-                if nu == v and nv not in visited:
-                    heapq.heappush(edges_heap, (nw, nu, nv, next_edge))
-                elif not model.is_directed and nv == v and nu not in visited:
-                    heapq.heappush(edges_heap, (nw, nv, nu, next_edge))
+            # Thêm các cạnh nối từ đỉnh v mới thăm vào heap (qua chỉ mục kề)
+            for nv, next_edge in model.get_neighbors(v):
+                if nv not in visited:
+                    nw = next_edge.weight if next_edge.weight is not None else 1
+                    heapq.heappush(edges_heap, (nw, v, nv, next_edge))
+                    if trace is not None:
+                        trace.push(nv, nw, v)
 
     return mst_edges
 
 # --- 2. KRUSKAL ALGORITHM ---
-def kruskal_algorithm(model):
+def kruskal_algorithm(model, trace=None):
     """
-    Trả về danh sách các cạnh thuộc MST.
+    Trả về danh sách các cạnh thuộc MST (đồ thị không liên thông: rừng khung nhỏ nhất).
+    trace: utils.trace.Trace (tùy chọn) - ghi các lần hợp tập và cạnh được chọn / bỏ.
     """
-    # Sắp xếp tất cả cạnh theo trọng số tăng dần
-    sorted_edges = sorted(model.edges, key=lambda e: e.weight if e.weight is not None else 1)
+    # Sắp xếp tất cả cạnh theo trọng số tăng dần (ổn định: cạnh thêm trước đứng trước)
+    edges = model.edges
+    weights = [edge.weight if edge.weight is not None else 1 for edge in edges]
+    order = np.argsort(np.array(weights, dtype=np.float64), kind='stable').tolist()
 
     mst_edges = []
 
-    # Cấu trúc Union-Find để kiểm tra chu trình
-    parent = {v_id: v_id for v_id in model.vertices}
-
-    def find_root(node):
-        if parent[node] != node:
-            parent[node] = find_root(parent[node])
-        return parent[node]
+    # Union-Find lặp, hợp theo hạng (xem union_find.py) trên chỉ số đỉnh
+    vertex_ids = list(model.vertices)
+    index = {v_id: i for i, v_id in enumerate(vertex_ids)}
+    sets = UnionFind(len(vertex_ids))
 
-    def union(node_a, node_b):
-        root_a = find_root(node_a)
-        root_b = find_root(node_b)
-        if root_a != root_b:
-            parent[root_b] = root_a
-            return True # Nối thành công (không tạo chu trình)
-        return False # Đã nối rồi (tạo chu trình)
-
-    for edge in sorted_edges:
+    for e in order:
+        edge, w = edges[e], weights[e]
         u, v = edge.start_vertex.id, edge.end_vertex.id
         # Nếu nối u và v không tạo chu trình -> Thêm vào MST
-        if union(u, v):
+        merged = sets.union(index[u], index[v])
+        if merged is not None:
             mst_edges.append(edge)
+            if trace is not None:
+                trace.union(vertex_ids[merged[0]], vertex_ids[merged[1]])
+                trace.select(u, v, w)
+        elif trace is not None:
+            trace.reject(u, v, w)
+
+    return mst_edges
+
+# --- 3. PRIM TRÊN CSR ---
+def prim_csr(csr, start_id, forest=False):
+    """
+    Prim (heap lười) trên CSRGraph, cùng thứ tự chọn cạnh với prim_algorithm.
+    Trả về chỉ số các cạnh gốc thuộc MST (xem csr.edge_pairs).
+    forest: đồ thị không liên thông -> sau thành phần của start_id, tiếp tục từ đỉnh
+    chưa thăm có chỉ số nhỏ nhất (rừng khung nhỏ nhất); mặc định chỉ cây chứa start_id.
+    """
+    start = csr.index_of(start_id)
+    if start is None:
+        return []
+
+    offsets, targets = csr.offsets.tolist(), csr.targets.tolist()
+    weights, slot_edges = csr.slot_weights.tolist(), csr.slot_edges.tolist()
+    visited = bytearray(csr.num_vertices)
+    # Trọng số nhỏ nhất đã đẩy vào heap cho mỗi đỉnh: cạnh nặng hơn không bao giờ được
+    # chọn nên không cần đẩy (heap nhỏ hơn nhiều, kết quả không đổi)
+    best = [float('inf')] * csr.num_vertices
+    mst_edges = []
+
+    def push_row(u):
+        for i in range(offsets[u], offsets[u + 1]):
+            v, w = targets[i], weights[i]
+            if not visited[v] and w <= best[v]:
+                best[v] = w
+                heapq.heappush(edges_heap, (w, u, v, slot_edges[i]))
+
+    # Hàng đợi ưu tiên lưu (trọng số, đỉnh_nguồn, đỉnh_đích, cạnh) theo chỉ số
+    edges_heap = []
+    roots = [start] + (list(range(csr.num_vertices)) if forest else [])
+    for root in roots:
+        if visited[root]:
+            continue
+        visited[root] = 1
+        push_row(root)
+
+        while edges_heap:
+            w, u, v, e = heapq.heappop(edges_heap)
+            if not visited[v]:
+                visited[v] = 1
+                mst_edges.append(e)
+                push_row(v)
 
     return mst_edges
+
+# --- 4. KRUSKAL TRÊN CSR ---
+def kruskal_csr(csr):
+    """
+    Kruskal trên CSRGraph: sắp xếp trọng số bằng NumPy argsort (ổn định), bỏ khuyên
+    hàng loạt, rồi Union-Find lặp hợp theo hạng (UnionFind) trên chỉ số đỉnh.
+    Đồ thị không liên thông -> rừng khung nhỏ nhất.
+    Trả về chỉ số các cạnh gốc thuộc MST (xem csr.edge_pairs).
+    """
+    order = np.argsort(csr.weights, kind='stable')
+    order = order[csr.src[order] != csr.dst[order]]
+    sets = UnionFind(csr.num_vertices)
+    union = sets.union
+
+    mst_edges = []
+    for e, a, b in zip(order.tolist(), csr.src[order].tolist(), csr.dst[order].tolist()):
+        if union(a, b) is not None:
+            mst_edges.append(e)
+            if sets.count == 1:
+                break
+
+    return mst_edges
+
+# --- 5. BORŮVKA TRÊN CSR (song song) ---
+def boruvka_csr(csr, workers=None, min_parallel_edges=500_000):
+    """
+    Borůvka trên CSRGraph: mỗi vòng, mọi thành phần chọn cạnh rẻ nhất đi ra ngoài nó,
+    rồi các thành phần được gộp theo các cạnh đó -> tối đa log2(V) vòng, mỗi vòng là
+    các phép NumPy trên toàn bộ cạnh.
+
+    - Thứ tự cạnh: (trọng số, chỉ số cạnh) như kruskal_csr -> cùng một cây/rừng khung.
+    - Đồ thị lớn (>= min_parallel_edges cạnh) và nhiều CPU: cạnh được chia khối cho
+      ProcessPoolExecutor; nhãn thành phần của mỗi vòng nằm trong shared memory, mỗi tiến
+      trình trả về cạnh rẻ nhất của từng thành phần trong khối của nó.
+    Trả về chỉ số các cạnh gốc thuộc rừng khung nhỏ nhất.
+    """
+    n = csr.num_vertices
+    order = np.argsort(csr.weights, kind='stable')
+    order = order[csr.src[order] != csr.dst[order]]
+    src, dst = csr.src[order], csr.dst[order] # Vị trí trong mảng = hạng của cạnh
+    m = len(order)
+    if n == 0 or m == 0:
+        return []
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or m < min_parallel_edges:
+        comp = np.arange(n, dtype=np.int64)
+        _init_boruvka_worker(src, dst, comp)
+        try:
+            return _boruvka_rounds(comp, src, dst, order, lambda: [_boruvka_cheapest((0, m))])
+        finally:
+            _init_boruvka_worker(None, None, None)
+
+    bounds = np.linspace(0, m, workers + 1).astype(np.int64)
+    chunks = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+    shm = shared_memory.SharedMemory(create=True, size=n * 8)
+    comp = np.ndarray(n, dtype=np.int64, buffer=shm.buf)
+    comp[:] = np.arange(n)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_boruvka_worker,
+                                 initargs=(src, dst, shm.name, n)) as pool:
+            return _boruvka_rounds(comp, src, dst, order, lambda: list(pool.map(_boruvka_cheapest, chunks)))
+    finally:
+        del comp # Bỏ view trước khi đóng khối shared memory
+        shm.close()
+        shm.unlink()
+
+
+def _boruvka_rounds(comp, src, dst, order, cheapest):
+    """
+    Vòng lặp Borůvka. comp: nhãn thành phần (cập nhật tại chỗ, tiến trình con đọc chung);
+    src, dst: đầu mút các cạnh theo hạng; cheapest(): danh sách mảng "hạng cạnh rẻ nhất"
+    theo từng khối cạnh.
+    """
+    n, m = len(comp), len(order)
+    selected = []
+    while True:
+        best = np.minimum.reduce(cheapest())
+        components = np.flatnonzero(best < m)
+        if len(components) == 0:
+            break
+        ranks = best[components]
+        ends_u, ends_v = comp[src[ranks]], comp[dst[ranks]]
+        other = np.where(ends_u == components, ends_v, ends_u)
+        selected.append(np.unique(ranks))
+
+        # Mỗi thành phần trỏ tới thành phần bên kia cạnh rẻ nhất của nó. Hai thành phần
+        # chọn cùng một cạnh tạo vòng 2 phần tử -> thành phần nhỏ hơn làm gốc.
+        pointer = np.arange(n, dtype=np.int64)
+        pointer[components] = other
+        mutual = (pointer[other] == components) & (components < other)
+        pointer[components[mutual]] = components[mutual]
+        comp[:] = compress_labels(pointer)[comp]
+    if not selected:
+        return []
+    return np.sort(order[np.concatenate(selected)]).tolist()
+
+
+# Tiến trình con của Borůvka: cạnh đã sắp (kế thừa khi fork) + nhãn thành phần dùng chung
+_worker_src = None
+_worker_dst = None
+_worker_comp = None
+_worker_shm = None
+
+
+def _init_boruvka_worker(src, dst, comp):
+    global _worker_src, _worker_dst, _worker_comp
+    _worker_src, _worker_dst, _worker_comp = src, dst, comp
+
+
+def _attach_boruvka_worker(src, dst, shm_name, n):
+    global _worker_shm
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    _init_boruvka_worker(src, dst, np.ndarray(n, dtype=np.int64, buffer=_worker_shm.buf))
+
+
+def _boruvka_cheapest(bounds):
+    """Hạng nhỏ nhất của cạnh đi ra khỏi mỗi thành phần, chỉ xét các cạnh trong khối [lo, hi)."""
+    lo, hi = bounds
+    comp = _worker_comp
+    cu, cv = comp[_worker_src[lo:hi]], comp[_worker_dst[lo:hi]]
+    crossing = np.flatnonzero(cu != cv)
+    ranks = crossing + lo
+    best = np.full(len(comp), len(_worker_src), dtype=np.int64)
+    np.minimum.at(best, cu[crossing], ranks)
+    np.minimum.at(best, cv[crossing], ranks)
+    return best
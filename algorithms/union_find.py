@@ -0,0 +1,59 @@
+# file algorithms/union_find.py
+import numpy as np
+
+
+class UnionFind:
+    """
+    Disjoint-set (Union-Find) trên các phần tử 0..n-1.
+    - find lặp với path halving (không đệ quy -> không chạm giới hạn đệ quy của Python
+      trên chuỗi dài).
+    - union theo hạng (rank): cây thấp được gắn vào cây cao.
+    parent/rank là list số nguyên (truy cập từng phần tử nhanh hơn mảng NumPy).
+    """
+
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.rank = [0] * n
+        self.count = n # Số tập hiện có
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        """
+        Hợp tập chứa a và tập chứa b.
+        Trả về (gốc mới, gốc bị gộp), hoặc None nếu a, b đã cùng tập.
+        """
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return None
+        if self.rank[root_a] < self.rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        if self.rank[root_a] == self.rank[root_b]:
+            self.rank[root_a] += 1
+        self.count -= 1
+        return root_a, root_b
+
+    def connected(self, a, b):
+        return self.find(a) == self.find(b)
+
+    def labels(self):
+        """Mảng NumPy: gốc của tập chứa từng phần tử (nén đường đi bằng nhảy con trỏ hàng loạt)."""
+        return compress_labels(np.array(self.parent, dtype=np.int64))
+
+
+def compress_labels(pointer):
+    """
+    Nhảy con trỏ (pointer jumping) hàng loạt trên rừng cha pointer[i] cho tới khi
+    mọi phần tử trỏ thẳng vào gốc. O(n log(độ sâu)) phép NumPy.
+    """
+    while True:
+        jumped = pointer[pointer]
+        if np.array_equal(jumped, pointer):
+            return pointer
+        pointer = jumped
@@ -1,61 +1,140 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context
+import json
 import sys
 import os
-import networkx as nx  # Thư viện xử lý đồ thị mạnh mẽ cho Max Flow
 
 # 1. Setup đường dẫn để import được code cũ (nằm cùng thư mục cha)
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # 2. Import logic cũ (Algorithms & Graph Model)
-from graph.graph_model import GraphModel
-from algorithms.bfs import bfs_traversal
-from algorithms.dfs import dfs_traversal
-from algorithms.dijkstra import dijkstra_search
-from algorithms.mst import prim_algorithm, kruskal_algorithm
-from algorithms.euler import fleury_algorithm
-from algorithms.hierholzer import hierholzer_algorithm
-from algorithms.bipartite import check_bipartite
-from algorithms.conversion import get_adjacency_matrix, get_adjacency_list, get_edge_list
+from graph.ingest import parse_graph_payload, parse_weight, GraphPayloadError
+from graph.graph_store import GraphStore, GraphNotFoundError
+from graph.binary_format import iter_graph_bytes, load_graph_file, read_graph, GraphFormatError
+from graph.importers import import_graph, guess_format, GraphImportError
+from utils.result_cache import ResultCache
+from utils.trace import Trace, EVENT_NAMES
+from utils.jobs import JobManager, JobNotFoundError, JobQueueFullError, SUCCEEDED
+from algorithms.bfs import bfs_csr, bfs_steps_csr, bfs_traversal
+from algorithms.dfs import dfs_csr, dfs_steps_csr, dfs_forest_csr
+from algorithms.biconnected import biconnected_csr
+from algorithms.components import weak_components_csr, strong_components_csr, topological_order_csr
+from algorithms.dijkstra import dijkstra_tree_csr, bidirectional_dijkstra_csr, astar_csr, dijkstra_search
+from algorithms.integer_dijkstra import queue_supports
+from algorithms.all_pairs import all_pairs_shortest_paths, NegativeCycleError
+from algorithms.mst import prim_csr, kruskal_csr, boruvka_csr, prim_algorithm, kruskal_algorithm
+from algorithms.max_flow import max_flow_csr, ford_fulkerson
+from algorithms.batch import parse_queries, run_batch, BatchQueryError
+from algorithms.euler import fleury_csr
+from algorithms.hierholzer import hierholzer_csr
+from algorithms.bipartite import bipartite_csr
+from algorithms.matching import hopcroft_karp_csr
+from algorithms.conversion import adjacency_matrix_text, dense_matrix, sparse_matrix
+from algorithms.conversion import iter_adjacency_list_lines, iter_edge_list_lines
+from utils.constants import GRAPH_STORE_MAX_GRAPHS, GRAPH_STORE_TTL_SECONDS, GRAPH_STORE_MAX_BYTES
+from utils.constants import RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_MAX_COST
+from utils.constants import ALL_PAIRS_MAX_VERTICES, ALL_PAIRS_FLOYD_MAX_VERTICES, ALL_PAIRS_DENSE_RATIO
+from utils.constants import ALL_PAIRS_ROW_CHUNK, BATCH_MAX_QUERIES, BATCH_MIN_PARALLEL_QUERIES
+from utils.constants import ALL_PAIRS_CACHE_MAX_MATRICES, ALL_PAIRS_CACHE_MAX_BYTES
+from utils.constants import STREAM_CHUNK_SIZE, TRACE_DEFAULT_STEPS, TRACE_MAX_STEPS
+from utils.constants import IMPORT_SPILL_EDGES, CONVERT_MATRIX_PAGE_SIZE, CONVERT_DENSE_MAX_VERTICES
+from utils.constants import MST_PARALLEL_MIN_EDGES, DIJKSTRA_DIAL_MAX_WEIGHT
+from utils.constants import JOB_MAX_WORKERS, JOB_MAX_PENDING, JOB_KEEP_FINISHED, JOB_CANCEL_GRACE_SECONDS
+from utils.constants import JOB_DEFAULT_TIMEOUT_SECONDS, JOB_MAX_TIMEOUT_SECONDS, JOB_MEMORY_LIMIT_BYTES
 
 app = Flask(__name__)
 
-# --- HÀM BỔ TRỢ: Tái tạo GraphModel từ JSON gửi lên ---
-def rebuild_graph(data):
+# Kho đồ thị đã upload (dùng chung cho mọi request của tiến trình)
+graph_store = GraphStore(
+    max_graphs=GRAPH_STORE_MAX_GRAPHS,
+    ttl_seconds=GRAPH_STORE_TTL_SECONDS,
+    max_bytes=GRAPH_STORE_MAX_BYTES,
+)
+
+# Cache kết quả thuật toán theo (băm nội dung đồ thị, thuật toán, tham số)
+result_cache = ResultCache(max_entries=RESULT_CACHE_MAX_ENTRIES, max_cost=RESULT_CACHE_MAX_COST)
+# Ma trận khoảng cách mọi cặp đỉnh: cache riêng tính theo byte (ma trận n x n vượt xa giới hạn
+# số phần tử của result_cache), để mỗi trang hàng của /api/all_pairs chỉ cắt từ một lần tính
+matrix_cache = ResultCache(max_entries=ALL_PAIRS_CACHE_MAX_MATRICES, max_cost=ALL_PAIRS_CACHE_MAX_BYTES,
+                           cost=lambda result: result.matrix.nbytes)
+# Đồ thị trong kho bị sửa/xóa -> bỏ các kết quả đã tính trên nội dung cũ
+graph_store.on_change(lambda graph_id, old_graph: result_cache.invalidate(old_graph.content_hash()))
+graph_store.on_change(lambda graph_id, old_graph: matrix_cache.invalidate(old_graph.content_hash()))
+
+# Job nền cho thuật toán chạy lâu (/api/jobs): mỗi job một tiến trình con, hủy được, có hạn thời gian/bộ nhớ
+job_manager = JobManager(
+    max_workers=JOB_MAX_WORKERS,
+    max_pending=JOB_MAX_PENDING,
+    keep_finished=JOB_KEEP_FINISHED,
+    grace_seconds=JOB_CANCEL_GRACE_SECONDS,
+)
+
+# --- HÀM BỔ TRỢ: Đọc đồ thị từ JSON gửi lên ---
+def load_graph(data, directed=None, keep_parallel=False):
     """
-    Tái tạo lại đồ thị Python từ dữ liệu JSON của Frontend.
+    Lấy đồ thị của request dưới dạng CSRGraph (mảng NumPy), không dựng GraphModel:
+    - {"graphId": ...}: đồ thị đã upload trong graph_store (không phải đọc lại JSON).
+    - {"graph": {...}}: đọc thẳng JSON gửi kèm.
     """
-    is_directed_global = data.get('directed', False)
-    graph = GraphModel(is_directed=is_directed_global)
-    graph.clear()
-
-    max_id = -1
-    # 1. Tái tạo Đỉnh
-    for node in data.get('nodes', []):
-        v_id = int(node['id'])
-        v = graph.add_vertex(node['x'], node['y'])
-        v.id = v_id
-        v.label = node['label']
-        graph.vertices[v_id] = v
-        if v_id > max_id: max_id = v_id
-
-    graph.next_id = max_id + 1
-
-    # 2. Tái tạo Cạnh
-    for edge in data.get('edges', []):
-        u_id = int(edge['source'])
-        v_id = int(edge['target'])
-        weight = 1
-        if edge.get('weight') is not None:
-            try:
-                weight = int(edge['weight'])
-            except:
-                weight = 1
-
-        new_edge = graph.add_edge(u_id, v_id, weight)
-        if new_edge and 'isDirected' in edge:
-            new_edge.is_directed = edge['isDirected']
-
-    return graph
+    if data.get('graphId'):
+        graph = graph_store.get(data['graphId'])
+        if directed and not graph.is_directed:
+            graph = graph.as_directed()
+        return graph
+    return parse_graph_payload(data.get('graph'), directed=directed, keep_parallel=keep_parallel)
+
+def cached_result(graph, algo, params, compute):
+    """Kết quả (dict JSON) của thuật toán trên đồ thị, lấy từ result_cache nếu đã tính."""
+    return result_cache.get_or_compute(graph.content_hash(), algo, params, compute)
+
+def graph_summary(graph_id, graph):
+    return {
+        "status": "success",
+        "graph_id": graph_id,
+        "num_vertices": graph.num_vertices,
+        "num_edges": graph.num_edges,
+        "directed": graph.is_directed,
+    }
+
+def edge_result(graph, edge_indices):
+    """Định dạng danh sách cạnh kết quả cho Frontend: [{u, v}, ...]"""
+    return [{"u": u, "v": v} for u, v in graph.edge_pairs(edge_indices)]
+
+def ndjson_response(records):
+    """Trả NDJSON: mỗi bản ghi (dict) một dòng, gửi ngay khi generator sinh ra."""
+    lines = (json.dumps(record) + "\n" for record in records)
+    return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+
+def text_response(lines):
+    """Trả text/plain sinh dần: gom STREAM_CHUNK_SIZE dòng mỗi lần gửi."""
+    def chunks():
+        batch = []
+        for line in lines:
+            batch.append(line)
+            if len(batch) >= STREAM_CHUNK_SIZE:
+                yield "\n".join(batch) + "\n"
+                batch = []
+        if batch:
+            yield "\n".join(batch) + "\n"
+    return Response(stream_with_context(chunks()), mimetype='text/plain')
+
+def traversal_records(graph, steps):
+    """
+    Gom các bước duyệt (ID đỉnh, chỉ số cạnh) thành từng khối ~STREAM_CHUNK_SIZE đỉnh:
+    {"type": "visit", "path": [...], "visited_edges": [...]}, cuối cùng {"type": "done"}.
+    Nối các khối lại được đúng "path"/"visited_edges" của phản hồi thường.
+    """
+    path, edges, visited = [], [], 0
+    for vertices, edge_indices in steps:
+        path.extend(vertices)
+        edges.extend(edge_indices)
+        if len(path) >= STREAM_CHUNK_SIZE:
+            visited += len(path)
+            yield {"type": "visit", "path": path, "visited_edges": edge_result(graph, edges)}
+            path, edges = [], []
+    if path:
+        visited += len(path)
+        yield {"type": "visit", "path": path, "visited_edges": edge_result(graph, edges)}
+    yield {"type": "done", "status": "success", "visited": visited}
 
 # --- ROUTES & API ---
 
@@ -63,52 +142,450 @@ def rebuild_graph(data):
 def index():
     return render_template('index.html')
 
+@app.errorhandler(GraphPayloadError)
+@app.errorhandler(GraphNotFoundError)
+@app.errorhandler(GraphFormatError)
+@app.errorhandler(GraphImportError)
+def handle_bad_graph(e):
+    return jsonify({"status": "error", "message": str(e)})
+
+@app.errorhandler(JobNotFoundError)
+@app.errorhandler(JobQueueFullError)
+def handle_job_error(e):
+    return jsonify({"status": "error", "message": str(e)})
+
+# ==========================================================
+# API: Kho đồ thị (upload 1 lần, chạy thuật toán bằng "graphId")
+# ==========================================================
+@app.route('/api/graphs', methods=['POST'])
+def upload_graph():
+    graph = parse_graph_payload(request.json.get('graph'))
+    graph_id = graph_store.put(graph)
+    return jsonify(graph_summary(graph_id, graph))
+
+@app.route('/api/graphs/import', methods=['POST'])
+def import_binary_graph():
+    """
+    Nạp đồ thị từ file nhị phân (graph/binary_format.py): multipart "file" hoặc thân request thô.
+    File upload đã được lưu tạm ra đĩa -> mmap thẳng, không parse JSON.
+    """
+    upload = request.files.get('file')
+    graph = load_graph_file(upload.stream) if upload else read_graph(request.get_data())
+    graph_id = graph_store.put(graph)
+    return jsonify(graph_summary(graph_id, graph))
+
+@app.route('/api/graphs/upload', methods=['POST'])
+def upload_graph_file():
+    """
+    Nạp file đồ thị chuẩn (multipart "file"): edge list/CSV, Matrix Market, DIMACS, GraphML.
+    Form: "format" (mặc định đoán theo đuôi file), "directed", "keepParallel".
+    File được parse tuần tự theo khối, không đọc cả file vào bộ nhớ.
+    """
+    upload = request.files.get('file')
+    if upload is None:
+        return jsonify({"status": "error", "message": "Missing 'file' upload."})
+    fmt = request.form.get('format') or guess_format(upload.filename)
+    directed = request.form.get('directed')
+    graph, info = import_graph(
+        upload.stream, fmt,
+        directed=None if directed is None else directed.lower() in ('1', 'true', 'yes'),
+        keep_parallel=request.form.get('keepParallel', '').lower() in ('1', 'true', 'yes'),
+        spill_edges=IMPORT_SPILL_EDGES,
+    )
+    graph_id = graph_store.put(graph)
+    return jsonify({**graph_summary(graph_id, graph), "import": info})
+
+@app.route('/api/graphs/<graph_id>/export', methods=['GET'])
+def export_graph(graph_id):
+    """Tải đồ thị trong kho về dạng file nhị phân (gửi dần từng mảng)."""
+    graph = graph_store.get(graph_id)
+    return Response(iter_graph_bytes(graph), mimetype='application/octet-stream',
+                    headers={"Content-Disposition": f'attachment; filename="{graph_id}.graph"'})
+
+@app.route('/api/graphs', methods=['GET'])
+def graph_store_stats():
+    return jsonify({"status": "success", "store": graph_store.stats()})
+
+@app.route('/api/cache', methods=['GET'])
+def result_cache_stats():
+    return jsonify({"status": "success", "cache": result_cache.stats(), "matrix_cache": matrix_cache.stats()})
+
+@app.route('/api/cache', methods=['DELETE'])
+def clear_result_cache():
+    result_cache.clear()
+    matrix_cache.clear()
+    return jsonify({"status": "success"})
+
+@app.route('/api/graphs/<graph_id>', methods=['GET'])
+def get_graph(graph_id):
+    return jsonify(graph_summary(graph_id, graph_store.get(graph_id)))
+
+@app.route('/api/graphs/<graph_id>', methods=['DELETE'])
+def delete_graph(graph_id):
+    graph_store.delete(graph_id)
+    return jsonify({"status": "success", "graph_id": graph_id})
+
+@app.route('/api/graphs/<graph_id>/vertices', methods=['POST'])
+def add_stored_vertex(graph_id):
+    data = request.json or {}
+    vertex_id = int(data['id']) if data.get('id') is not None else None
+    graph = graph_store.get(graph_id).with_vertex(
+        data.get('x', 0), data.get('y', 0), vertex_id=vertex_id, label=data.get('label'))
+    if graph is None:
+        return jsonify({"status": "error", "message": "Vertex already exists."})
+    graph_store.replace(graph_id, graph)
+    return jsonify(graph_summary(graph_id, graph))
+
+@app.route('/api/graphs/<graph_id>/vertices/<int:vertex_id>', methods=['DELETE'])
+def remove_stored_vertex(graph_id, vertex_id):
+    graph = graph_store.get(graph_id).without_vertex(vertex_id)
+    if graph is None:
+        return jsonify({"status": "error", "message": "Vertex not found."})
+    graph_store.replace(graph_id, graph)
+    return jsonify(graph_summary(graph_id, graph))
+
+@app.route('/api/graphs/<graph_id>/edges', methods=['POST'])
+def add_stored_edge(graph_id):
+    data = request.json or {}
+    graph = graph_store.get(graph_id).with_edge(
+        int(data['source']), int(data['target']), parse_weight(data.get('weight')))
+    if graph is None:
+        return jsonify({"status": "error", "message": "Edge already exists or vertex not found."})
+    graph_store.replace(graph_id, graph)
+    return jsonify(graph_summary(graph_id, graph))
+
+@app.route('/api/graphs/<graph_id>/edges/<int:source>/<int:target>', methods=['DELETE'])
+def remove_stored_edge(graph_id, source, target):
+    graph = graph_store.get(graph_id).without_edge(source, target)
+    if graph is None:
+        return jsonify({"status": "error", "message": "Edge not found."})
+    graph_store.replace(graph_id, graph)
+    return jsonify(graph_summary(graph_id, graph))
+
 # API: BFS Traversal
 @app.route('/api/bfs', methods=['POST'])
 def run_bfs():
     data = request.json
-    graph = rebuild_graph(data['graph'])
+    graph = load_graph(data)
     start_id = int(data.get('startId', 0))
-    order, edges = bfs_traversal(graph, start_id)
-    edge_result = [{"u": e.start_vertex.id, "v": e.end_vertex.id} for e in edges]
-    return jsonify({"status": "success", "path": order, "visited_edges": edge_result})
+
+    if data.get('stream'):
+        # NDJSON theo từng tầng BFS: Frontend vẽ được ngay các bước đầu
+        return ndjson_response(traversal_records(graph, bfs_steps_csr(graph, start_id)))
+
+    def compute():
+        order, edges = bfs_csr(graph, start_id)
+        return {"status": "success", "path": order, "visited_edges": edge_result(graph, edges)}
+
+    return jsonify(cached_result(graph, 'bfs', (start_id,), compute))
 
 # API: DFS Traversal
 @app.route('/api/dfs', methods=['POST'])
 def run_dfs():
     data = request.json
-    graph = rebuild_graph(data['graph'])
+    graph = load_graph(data)
     start_id = int(data.get('startId', 0))
-    order, edges = dfs_traversal(graph, start_id)
-    edge_result = [{"u": e.start_vertex.id, "v": e.end_vertex.id} for e in edges]
-    return jsonify({"status": "success", "path": order, "visited_edges": edge_result})
+
+    if data.get('stream'):
+        steps = (([v], [e] if e != -1 else []) for v, e in dfs_steps_csr(graph, start_id))
+        return ndjson_response(traversal_records(graph, steps))
+
+    def compute():
+        order, edges = dfs_csr(graph, start_id)
+        return {"status": "success", "path": order, "visited_edges": edge_result(graph, edges)}
+
+    return jsonify(cached_result(graph, 'dfs', (start_id,), compute))
+
+# API: Rừng DFS đầy đủ - thời điểm phát hiện / hoàn tất, cạnh cây và (classify) phân loại cạnh
+# ngược / xuôi / chéo. Không có startId -> duyệt từ mọi đỉnh (rừng DFS).
+@app.route('/api/dfs_tree', methods=['POST'])
+def run_dfs_tree():
+    data = request.json
+    graph = load_graph(data)
+    start_id = int(data['startId']) if data.get('startId') is not None else None
+    classify = bool(data.get('classify', False))
+
+    def compute():
+        forest = dfs_forest_csr(graph, start_id, classify=classify)
+        if forest is None:
+            return {"status": "error", "message": "Start vertex not found."}
+        return {"status": "success", **forest.to_dict()}
+
+    return jsonify(cached_result(graph, 'dfs_tree', (start_id, classify), compute))
+
+# API: Cầu, khớp, thành phần song liên thông - một lượt Tarjan (cache chung cho cả 3 API)
+def biconnected_analysis(graph):
+    return result_cache.get_or_compute(graph.content_hash(), 'biconnected', (), lambda: biconnected_csr(graph))
+
+@app.route('/api/bridges', methods=['POST'])
+def run_bridges():
+    graph = load_graph(request.json)
+    return jsonify({"status": "success", **biconnected_analysis(graph).bridges_dict()})
+
+@app.route('/api/articulation_points', methods=['POST'])
+def run_articulation_points():
+    graph = load_graph(request.json)
+    return jsonify({"status": "success", **biconnected_analysis(graph).articulation_points_dict()})
+
+# Nhãn thành phần liên thông được cache theo đồ thị: các API khác (Euler...) dùng lại
+# thay vì tự duyệt lại để kiểm tra liên thông
+def weak_components(graph):
+    return result_cache.get_or_compute(graph.content_hash(), 'weak_components', (), lambda: weak_components_csr(graph))
+
+def strong_components(graph, method='tarjan'):
+    return result_cache.get_or_compute(graph.content_hash(), 'strong_components', (method,),
+                                       lambda: strong_components_csr(graph, method))
+
+# API: Thành phần liên thông - "type": "weak" (mặc định; vô hướng: liên thông thường)
+# hoặc "strong" (liên thông mạnh, "method": "tarjan" | "kosaraju")
+@app.route('/api/components', methods=['POST'])
+def run_components():
+    data = request.json
+    graph = load_graph(data)
+    kind = data.get('type', 'weak')
+    method = data.get('method', 'tarjan')
+    if kind not in ('weak', 'strong') or method not in ('tarjan', 'kosaraju'):
+        return jsonify({"status": "error", "message": "Unknown component type or method."})
+
+    def compute():
+        labels = strong_components(graph, method) if kind == 'strong' else weak_components(graph)
+        return {"status": "success", "type": kind, **labels.to_dict()}
+
+    return jsonify(cached_result(graph, 'components', (kind, method if kind == 'strong' else None), compute))
+
+# API: Sắp xếp tô-pô (Kahn). Có chu trình -> "is_dag": false kèm một chu trình làm bằng chứng.
+@app.route('/api/topological_sort', methods=['POST'])
+def run_topological_sort():
+    graph = load_graph(request.json)
+    if not graph.is_directed:
+        return jsonify({"status": "error", "message": "Topological sort requires a directed graph."})
+
+    def compute():
+        order, cycle = topological_order_csr(graph)
+        if cycle is None:
+            return {"status": "success", "is_dag": True, "order": graph.node_ids[order].tolist()}
+        vertices, edges = cycle
+        return {
+            "status": "success",
+            "is_dag": False,
+            "cycle": graph.node_ids[vertices].tolist(),
+            "cycle_edges": edge_result(graph, edges),
+        }
+
+    return jsonify(cached_result(graph, 'topological_sort', (), compute))
+
+@app.route('/api/biconnected', methods=['POST'])
+def run_biconnected():
+    graph = load_graph(request.json)
+
+    def compute():
+        return {"status": "success", **biconnected_analysis(graph).components_dict()}
+
+    return jsonify(cached_result(graph, 'biconnected_components', (), compute))
 
 # API: Shortest Path (Dijkstra)
+# - mode "path" (mặc định): đường đi ngắn nhất startId -> endId.
+# - mode "tree": cây đường đi ngắn nhất từ startId (khoảng cách + cha của mọi đỉnh).
+# Cây của mỗi (đồ thị, startId) được cache, nên các truy vấn sau từ cùng nguồn
+# chỉ lần ngược cha trong O(độ dài đường đi) thay vì chạy lại Dijkstra.
+# Truy vấn 1 cặp đỉnh có thể chọn "method": "bidirectional" hoặc "astar"
+# (A* dùng tọa độ x, y; "heuristicScale" tùy chọn), trả thêm "explored".
+# "queue": hàng đợi ưu tiên của Dijkstra - "auto" (mặc định: trọng số nguyên nhỏ -> Dial,
+# còn lại heapq), hoặc "heap" / "dial" / "radix" / "zero_one" (chỉ trọng số 0/1).
 @app.route('/api/dijkstra', methods=['POST'])
 def run_dijkstra():
     data = request.json
-    graph = rebuild_graph(data['graph'])
+    graph = load_graph(data)
+    mode = data.get('mode', 'path')
     start_id = int(data.get('startId', 0))
+    queue = data.get('queue', 'auto')
+    if queue != 'auto' and not queue_supports(queue, graph.slot_weights):
+        return jsonify({"status": "error", "message": f"Priority queue '{queue}' does not support these edge weights."})
+
+    def shortest_path_tree():
+        return result_cache.get_or_compute(
+            graph.content_hash(), 'dijkstra_tree', (start_id, queue),
+            lambda: dijkstra_tree_csr(graph, start_id, queue, DIJKSTRA_DIAL_MAX_WEIGHT))
+
+    if mode == 'tree':
+        def compute_tree():
+            tree = shortest_path_tree()
+            if tree is None:
+                return {"status": "error", "message": "Start vertex not found."}
+            return {"status": "success", **tree.to_dict()}
+
+        return jsonify(cached_result(graph, 'dijkstra', ('tree', start_id, queue), compute_tree))
+
     end_id = int(data.get('endId', 0))
-    distance, path = dijkstra_search(graph, start_id, end_id)
-    if distance == float('inf'):
-        return jsonify({"status": "error", "message": "No path found between these nodes."})
-    return jsonify({"status": "success", "distance": distance, "path": path})
+    method = data.get('method', 'dijkstra')
+
+    if method in ('bidirectional', 'astar'):
+        scale = data.get('heuristicScale')
+        scale = float(scale) if scale is not None else None
+
+        def compute_pair():
+            if method == 'astar':
+                distance, path, explored = astar_csr(graph, start_id, end_id, scale)
+            else:
+                distance, path, explored = bidirectional_dijkstra_csr(graph, start_id, end_id)
+            if distance == float('inf'):
+                return {"status": "error", "message": "No path found between these nodes."}
+            return {"status": "success", "distance": distance, "path": path, "explored": explored}
+
+        return jsonify(cached_result(graph, 'dijkstra', (method, start_id, end_id, scale), compute_pair))
+
+    def compute():
+        tree = shortest_path_tree()
+        distance, path = tree.path_to(end_id) if tree is not None else (float('inf'), [])
+        if distance == float('inf'):
+            return {"status": "error", "message": "No path found between these nodes."}
+        return {"status": "success", "distance": distance, "path": path}
+
+    return jsonify(cached_result(graph, 'dijkstra', (start_id, end_id, queue), compute))
+
+# API: Đường đi ngắn nhất mọi cặp đỉnh (ma trận khoảng cách)
+@app.route('/api/all_pairs', methods=['POST'])
+def run_all_pairs():
+    """
+    method: "auto" (mặc định) / "floyd_warshall" / "dijkstra" / "johnson".
+    format: "json" (mặc định) -> trả từng khối hàng [rowStart, rowStart + rowCount);
+            "binary" -> cả ma trận dạng application/octet-stream (xem DistanceMatrix.to_bytes).
+    """
+    data = request.json
+    graph = load_graph(data)
+    method = data.get('method', 'auto')
+
+    if graph.num_vertices > ALL_PAIRS_MAX_VERTICES:
+        return jsonify({"status": "error",
+                        "message": f"Graph too large for all-pairs ({ALL_PAIRS_MAX_VERTICES} vertices max)."})
+
+    def compute():
+        return all_pairs_shortest_paths(graph, method,
+                                        dense_ratio=ALL_PAIRS_DENSE_RATIO,
+                                        floyd_max_vertices=ALL_PAIRS_FLOYD_MAX_VERTICES)
+
+    try:
+        result = matrix_cache.get_or_compute(graph.content_hash(), 'all_pairs', (method,), compute)
+    except (NegativeCycleError, ValueError) as e:
+        return jsonify({"status": "error", "message": str(e)})
+
+    if data.get('format') == 'binary':
+        return Response(result.to_bytes(), mimetype='application/octet-stream',
+                        headers={"X-All-Pairs-Method": result.method})
 
-# API: Minimum Spanning Tree (Prim / Kruskal)
+    row_start = max(int(data.get('rowStart', 0)), 0)
+    row_count = max(int(data.get('rowCount', ALL_PAIRS_ROW_CHUNK)), 0)
+    return jsonify({
+        "status": "success",
+        "method": result.method,
+        "vertices": result.node_ids.tolist(),
+        "total_rows": len(result.node_ids),
+        "row_start": row_start,
+        "rows": result.rows_to_json(row_start, row_count, integer=graph.integer_weights),
+    })
+
+# API: Batch nhiều truy vấn BFS/DFS/Dijkstra trên cùng một đồ thị
+# Body: {"graph" | "graphId", "queries": [{"algorithm": "bfs", "startId": 1}, ...]}
+# Trả về NDJSON: mỗi dòng là kết quả của một truy vấn ({"index": vị trí trong queries, ...}),
+# gửi ngay khi truy vấn đó xong (thứ tự hoàn thành, không phải thứ tự gửi lên).
+@app.route('/api/batch', methods=['POST'])
+def run_batch_queries():
+    data = request.json
+    graph = load_graph(data)
+    try:
+        queries = parse_queries(data.get('queries'), BATCH_MAX_QUERIES)
+    except BatchQueryError as e:
+        return jsonify({"status": "error", "message": str(e)})
+
+    results = run_batch(graph, queries, min_parallel=BATCH_MIN_PARALLEL_QUERIES)
+    return ndjson_response({"index": index, **result} for index, result in results)
+
+# API: Trace từng bước cho hoạt cảnh
+# Body: {"graph" | "graphId", "algorithm": "bfs" | "dijkstra" | "prim" | "kruskal" | "max_flow",
+#        "startId", "endId", "sourceId", "sinkId", "maxSteps", "format": "json" | "binary"}
+# Chạy bản GraphModel của thuật toán với utils.trace.Trace và trả về chuỗi sự kiện delta
+# (JSON dạng cột, hoặc nhị phân application/octet-stream - xem Trace.to_bytes).
+@app.route('/api/trace', methods=['POST'])
+def run_trace():
+    data = request.json
+    algorithm = data.get('algorithm')
+    if algorithm not in ('bfs', 'dijkstra', 'prim', 'kruskal', 'max_flow'):
+        return jsonify({"status": "error", "message": f"Unsupported trace algorithm: {algorithm}"})
+
+    graph = load_graph(data, directed=True if algorithm == 'max_flow' else None)
+    model = graph.to_graph_model()
+    max_steps = min(max(int(data.get('maxSteps', TRACE_DEFAULT_STEPS)), 0), TRACE_MAX_STEPS)
+    trace = Trace(max_steps=max_steps)
+
+    if algorithm == 'max_flow':
+        source_id, sink_id = int(data.get('sourceId', 0)), int(data.get('sinkId', 0))
+        if source_id not in model.vertices or sink_id not in model.vertices or source_id == sink_id:
+            return jsonify({"status": "error", "message": "Please select distinct Source and Sink nodes."})
+        flow_value, _ = ford_fulkerson(model, source_id, sink_id, trace=trace)
+        result = {"max_flow": flow_value}
+    elif algorithm == 'kruskal':
+        mst_edges = kruskal_algorithm(model, trace=trace)
+        result = {"mst_edges": [{"u": e.start_vertex.id, "v": e.end_vertex.id} for e in mst_edges]}
+    else:
+        start_id = int(data.get('startId', graph.node_ids[0] if graph.num_vertices else 0))
+        if start_id not in model.vertices:
+            return jsonify({"status": "error", "message": "Start vertex not found."})
+        if algorithm == 'bfs':
+            order, _ = bfs_traversal(model, start_id, trace=trace)
+            result = {"path": order}
+        elif algorithm == 'prim':
+            mst_edges = prim_algorithm(model, start_id, trace=trace)
+            result = {"mst_edges": [{"u": e.start_vertex.id, "v": e.end_vertex.id} for e in mst_edges]}
+        else:
+            end_id = int(data.get('endId', 0))
+            if end_id not in model.vertices:
+                return jsonify({"status": "error", "message": "End vertex not found."})
+            distance, path = dijkstra_search(model, start_id, end_id, trace=trace)
+            result = {"distance": distance if path else None, "path": path}
+
+    if data.get('format') == 'binary':
+        return Response(trace.to_bytes(), mimetype='application/octet-stream',
+                        headers={"X-Trace-Total-Steps": str(trace.total_steps)})
+    return jsonify({
+        "status": "success",
+        "algorithm": algorithm,
+        "result": result,
+        "event_names": EVENT_NAMES,
+        "events": trace.to_columns(),
+        "total_steps": trace.total_steps,
+        "truncated": trace.truncated,
+    })
+
+# API: Minimum Spanning Tree (Prim / Kruskal / Borůvka)
 @app.route('/api/mst', methods=['POST'])
 def run_mst():
+    """
+    type: "prim" | "kruskal" (mặc định) | "boruvka" (song song trên đồ thị lớn).
+    Kruskal và Borůvka luôn trả rừng khung nhỏ nhất nếu đồ thị không liên thông;
+    Prim chỉ trả cây chứa startId, trừ khi "forest": true.
+    """
     data = request.json
     algo_type = data.get('type')
-    graph = rebuild_graph(data['graph'])
-    mst_edges = []
+    graph = load_graph(data)
+    start_id = None
+    forest = bool(data.get('forest', False))
     if algo_type == 'prim':
-        start_id = int(data.get('startId', list(graph.vertices.keys())[0]))
-        mst_edges = prim_algorithm(graph, start_id)
-    else:
-        mst_edges = kruskal_algorithm(graph)
-    result_edges = [{"u": e.start_vertex.id, "v": e.end_vertex.id} for e in mst_edges]
-    return jsonify({"status": "success", "mst_edges": result_edges})
+        start_id = int(data.get('startId', graph.node_ids[0] if graph.num_vertices else 0))
+
+    def compute():
+        if algo_type == 'prim':
+            mst_edges = prim_csr(graph, start_id, forest=forest)
+        elif algo_type == 'boruvka':
+            mst_edges = boruvka_csr(graph, min_parallel_edges=MST_PARALLEL_MIN_EDGES)
+        else:
+            mst_edges = kruskal_csr(graph)
+        return {
+            "status": "success",
+            "mst_edges": edge_result(graph, mst_edges),
+            "total_weight": graph.distance_value(graph.weights[mst_edges].sum()),
+        }
+
+    return jsonify(cached_result(graph, 'mst', (algo_type, start_id, forest), compute))
 
 # ==========================================================
 # [UPDATED] API: Euler Path/Circuit (Logic phân loại)
@@ -117,21 +594,25 @@ def run_mst():
 def run_euler():
     data = request.json
     algo_type = data.get('type')
-    graph = rebuild_graph(data['graph'])
+    graph = load_graph(data)
+    if graph.num_vertices == 0:
+        return jsonify({"status": "error", "message": "Graph is empty."})
 
     # Lấy đỉnh bắt đầu (quan trọng cho Fleury)
-    start_id = int(data.get('startId', list(graph.vertices.keys())[0]))
+    start_id = int(data.get('startId', graph.node_ids[0]))
 
-    success = False
-    path = []
+    return jsonify(cached_result(graph, 'euler', (algo_type, start_id),
+                                 lambda: euler_result(graph, algo_type, start_id, weak_components(graph))))
 
+def euler_result(graph, algo_type, start_id, components, progress=None):
+    """Phản hồi của /api/euler (dùng chung cho job nền, khi đó có hook tiến độ progress)."""
     if algo_type == 'fleury':
-        success, path = fleury_algorithm(graph, start_id)
+        success, path, edge_indices = fleury_csr(graph, start_id, components, progress)
     else:
-        success, path = hierholzer_algorithm(graph, start_id)
+        success, path, edge_indices = hierholzer_csr(graph, start_id, components, progress)
 
     if not success:
-        return jsonify({"status": "error", "message": "Graph does not contain an Euler Path or Circuit."})
+        return {"status": "error", "message": "Graph does not contain an Euler Path or Circuit."}
 
     # [LOGIC MỚI] Phân biệt Chu trình (Circuit) hay Đường đi (Path)
     # Nếu đỉnh đầu == đỉnh cuối => Chu trình
@@ -139,11 +620,14 @@ def run_euler():
     if len(path) > 1 and path[0] == path[-1]:
         euler_type = "Circuit"
 
-    return jsonify({
+    return {
         "status": "success",
         "path": path,
+        # Cạnh đã đi theo thứ tự (chỉ số cạnh trong đồ thị + đầu/cuối theo chiều vẽ)
+        "path_edges": edge_result(graph, edge_indices),
+        "edge_indices": edge_indices,
         "euler_type": euler_type # Gửi về Frontend để hiển thị đúng thông báo
-    })
+    }
 
 # ==========================================================
 # [UPDATED] API: Max Flow (Sử dụng NetworkX chuẩn xác)
@@ -152,8 +636,6 @@ def run_euler():
 def run_max_flow():
     try:
         data = request.json
-        nodes_data = data['graph']['nodes']
-        edges_data = data['graph']['edges']
 
         if 'sourceId' not in data or 'sinkId' not in data:
             return jsonify({"status": "error", "message": "Please select Source and Sink nodes."})
@@ -161,50 +643,32 @@ def run_max_flow():
         source_id = int(data.get('sourceId'))
         sink_id = int(data.get('sinkId'))
 
-        # 1. Tạo đồ thị NetworkX
-        G = nx.DiGraph()
-
-        for node in nodes_data:
-            G.add_node(int(node['id']))
+        algorithm = data.get('algorithm', 'dinic')
+        graph = load_graph(data, directed=True, keep_parallel=True)
 
-        for edge in edges_data:
-            u = int(edge['source'])
-            v = int(edge['target'])
-            capacity = int(edge.get('weight', 1))
+        if data.get('stream'):
+            # Luồng từng cạnh gửi theo khối, dòng cuối là tổng luồng + lát cắt hẹp nhất
+            result = max_flow_csr(graph, source_id, sink_id, algorithm)
 
-            # Cộng dồn capacity nếu có nhiều cạnh song song
-            if G.has_edge(u, v):
-                G[u][v]['capacity'] += capacity
-            else:
-                G.add_edge(u, v, capacity=capacity)
+            def records():
+                for chunk in result.flow_edge_chunks(STREAM_CHUNK_SIZE):
+                    yield {"type": "flow_edges", "flow_edges": chunk}
+                yield {"type": "done", "status": "success", **result.summary()}
 
-        # 2. Chạy thuật toán Max Flow
-        flow_value, flow_dict = nx.maximum_flow(G, source_id, sink_id)
+            return ndjson_response(records())
 
-        # 3. Chuẩn bị dữ liệu chi tiết cho Frontend vẽ màu
-        flow_edges_list = []
-        for u, v, attrs in G.edges(data=True):
-            capacity = attrs['capacity']
-            current_flow = flow_dict[u].get(v, 0)
+        def compute():
+            # Mạng luồng luôn xét có hướng; cạnh song song được cộng dồn dung lượng
+            result = max_flow_csr(graph, source_id, sink_id, algorithm)
+            return {"status": "success", **result.to_dict()}
 
-            flow_edges_list.append({
-                "u": u,
-                "v": v,
-                "flow": current_flow,
-                "capacity": capacity
-            })
+        return jsonify(cached_result(graph, 'max_flow', (source_id, sink_id, algorithm), compute))
 
-        return jsonify({
-            "status": "success",
-            "max_flow": flow_value,
-            "flow_edges": flow_edges_list
-        })
-
-    except nx.NetworkXError as e:
+    except (GraphPayloadError, GraphNotFoundError):
+        raise # Để errorhandler chung trả lỗi dữ liệu đồ thị
+    except ValueError as e:
+        # Đỉnh không tồn tại, source trùng sink, thuật toán không hỗ trợ (max_flow_csr)
         return jsonify({"status": "error", "message": str(e)})
-    except Exception as e:
-        print(e)
-        return jsonify({"status": "error", "message": "Server Error processing Max Flow"})
 
 # ==========================================================
 
@@ -212,28 +676,181 @@ def run_max_flow():
 @app.route('/api/bipartite', methods=['POST'])
 def run_bipartite():
     data = request.json
-    graph = rebuild_graph(data['graph'])
-    is_bipartite, color_map = check_bipartite(graph)
-    return jsonify({
-        "status": "success",
-        "is_bipartite": is_bipartite,
-        "colors": color_map
-    })
+    graph = load_graph(data)
+
+    def compute():
+        # Không phải 2 phía -> kèm một chu trình lẻ ("odd_cycle", "odd_cycle_edges")
+        return {"status": "success", **bipartite_coloring(graph).to_dict()}
+
+    return jsonify(cached_result(graph, 'bipartite', (), compute))
+
+# Phép tô 2 màu được cache theo đồ thị, dùng chung cho /api/bipartite và /api/matching
+def bipartite_coloring(graph):
+    return result_cache.get_or_compute(graph.content_hash(), 'bipartite_coloring', (), lambda: bipartite_csr(graph))
+
+# API: Cặp ghép cực đại trên đồ thị 2 phía (Hopcroft–Karp), hai phía lấy từ phép tô 2 màu
+@app.route('/api/matching', methods=['POST'])
+def run_matching():
+    graph = load_graph(request.json)
+
+    def compute():
+        coloring = bipartite_coloring(graph)
+        if not coloring.is_bipartite:
+            return {"status": "error", "message": "Graph is not bipartite.", **coloring.to_dict()}
+        return {"status": "success", **hopcroft_karp_csr(graph, coloring).to_dict()}
+
+    return jsonify(cached_result(graph, 'matching', (), compute))
 
 # API: Convert Representation
 @app.route('/api/convert', methods=['POST'])
 def run_convert():
+    """
+    Chuyển đổi biểu diễn. mode: "matrix" | "adj_list" | còn lại là danh sách cạnh.
+    - format "text" (mặc định): chuỗi như cũ. "rowStart"/"rowCount" (và "colStart"/"colCount"
+      với ma trận) chỉ lấy một trang; ma trận của đồ thị lớn mặc định chỉ trả trang đầu
+      CONVERT_MATRIX_PAGE_SIZE x CONVERT_MATRIX_PAGE_SIZE.
+    - "stream": true (danh sách kề / cạnh): trả text/plain sinh dần từng dòng.
+    - format "csr" | "coo": mảng ma trận thưa; "dense": ma trận dày (đồ thị nhỏ).
+    """
     data = request.json
     mode = data.get('mode')
-    graph = rebuild_graph(data['graph'])
-    result = ""
+    fmt = data.get('format', 'text')
+    graph = load_graph(data)
+    row_start, row_count = data.get('rowStart', 0), data.get('rowCount')
+    col_start, col_count = data.get('colStart', 0), data.get('colCount')
+
+    if fmt in ('csr', 'coo'):
+        return jsonify(cached_result(graph, 'convert_sparse', (fmt, row_start, row_count),
+                                     lambda: {"status": "success", **sparse_matrix(graph, fmt, row_start, row_count)}))
+    if fmt == 'dense':
+        if graph.num_vertices > CONVERT_DENSE_MAX_VERTICES:
+            return jsonify({"status": "error",
+                            "message": f"Dense matrix is limited to {CONVERT_DENSE_MAX_VERTICES} vertices; use 'csr' or 'coo'."})
+        return jsonify({"status": "success", **dense_matrix(graph)})
+
+    if mode != 'matrix' and data.get('stream'):
+        if mode == 'adj_list':
+            lines = iter_adjacency_list_lines(graph, row_start, row_count)
+        else:
+            lines = iter_edge_list_lines(graph, row_start, row_count)
+        return text_response(lines)
+
+    n = graph.num_vertices
     if mode == 'matrix':
-        result = get_adjacency_matrix(graph)
-    elif mode == 'adj_list':
-        result = get_adjacency_list(graph)
+        if n > CONVERT_MATRIX_PAGE_SIZE:
+            row_count = CONVERT_MATRIX_PAGE_SIZE if row_count is None else row_count
+            col_count = CONVERT_MATRIX_PAGE_SIZE if col_count is None else col_count
+        page = (row_start, row_count, col_start, col_count)
+        total = n
+    else:
+        page = (row_start, row_count)
+        total = n if mode == 'adj_list' else graph.num_edges
+
+    def compute():
+        if mode == 'matrix':
+            result = adjacency_matrix_text(graph, *page)
+        elif mode == 'adj_list':
+            result = "\n".join(iter_adjacency_list_lines(graph, row_start, row_count))
+        else:
+            result = "\n".join(iter_edge_list_lines(graph, row_start, row_count))
+        response = {"status": "success", "text": result}
+        if any(page):
+            # Trả về theo trang -> cho UI biết tổng số hàng để phân trang
+            response["page"] = {"row_start": row_start, "row_count": row_count, "total_rows": total}
+            if mode == 'matrix':
+                response["page"].update(col_start=col_start, col_count=col_count)
+        return response
+
+    return jsonify(cached_result(graph, 'convert', (mode,) + page, compute))
+
+# ==========================================================
+# API: Job nền cho thuật toán chạy lâu (Max Flow, Euler, cây Dijkstra trên đồ thị lớn)
+# POST /api/jobs/<algorithm>: cùng body với API đồng bộ tương ứng, thêm "timeout" (giây).
+# Client hỏi trạng thái (GET /api/jobs/<job_id>) hoặc nhận tiến độ dạng NDJSON (/stream),
+# lấy kết quả ở /result (giống phản hồi của API đồng bộ), hủy bằng DELETE.
+# Hàm *_job chạy trong tiến trình con (fork từ luồng điều phối): không dùng result_cache / graph_store
+# vì khóa của chúng có thể đang bị một luồng request khác giữ đúng lúc fork. Nền tảng không có fork
+# dùng spawn: hàm *_job ở cấp module và CSRGraph pickle được nên vẫn chạy như nhau.
+# ==========================================================
+def max_flow_job(progress, graph, source_id, sink_id, algorithm):
+    return {"status": "success", **max_flow_csr(graph, source_id, sink_id, algorithm, progress).to_dict()}
+
+def euler_job(progress, graph, algo_type, start_id):
+    return euler_result(graph, algo_type, start_id, weak_components_csr(graph), progress)
+
+def dijkstra_tree_job(progress, graph, start_id, queue):
+    tree = dijkstra_tree_csr(graph, start_id, queue, DIJKSTRA_DIAL_MAX_WEIGHT, progress)
+    if tree is None:
+        return {"status": "error", "message": "Start vertex not found."}
+    return {"status": "success", **tree.to_dict()}
+
+@app.route('/api/jobs/<algorithm>', methods=['POST'])
+def submit_job(algorithm):
+    data = request.json
+    # Kiểm tra tham số ngay trong request; job chỉ còn phần tính toán
+    if algorithm == 'max_flow':
+        if 'sourceId' not in data or 'sinkId' not in data:
+            return jsonify({"status": "error", "message": "Please select Source and Sink nodes."})
+        flow_algorithm = data.get('algorithm', 'dinic')
+        if flow_algorithm not in ('dinic', 'push_relabel'):
+            return jsonify({"status": "error", "message": f"Unknown max flow algorithm: {flow_algorithm}"})
+        graph = load_graph(data, directed=True, keep_parallel=True)
+        target, args = max_flow_job, (graph, int(data['sourceId']), int(data['sinkId']), flow_algorithm)
+    elif algorithm == 'euler':
+        graph = load_graph(data)
+        if graph.num_vertices == 0:
+            return jsonify({"status": "error", "message": "Graph is empty."})
+        target, args = euler_job, (graph, data.get('type'), int(data.get('startId', graph.node_ids[0])))
+    elif algorithm == 'dijkstra':
+        graph = load_graph(data)
+        queue = data.get('queue', 'auto')
+        if queue != 'auto' and not queue_supports(queue, graph.slot_weights):
+            return jsonify({"status": "error", "message": f"Priority queue '{queue}' does not support these edge weights."})
+        target, args = dijkstra_tree_job, (graph, int(data.get('startId', 0)), queue)
     else:
-        result = get_edge_list(graph)
-    return jsonify({"status": "success", "text": result})
+        return jsonify({"status": "error", "message": f"Unknown job algorithm: {algorithm}"})
+
+    timeout = float(data.get('timeout', JOB_DEFAULT_TIMEOUT_SECONDS))
+    if timeout <= 0:
+        return jsonify({"status": "error", "message": "Job timeout must be positive."})
+    job = job_manager.submit(algorithm, target, args, timeout=min(timeout, JOB_MAX_TIMEOUT_SECONDS),
+                             memory_limit=JOB_MEMORY_LIMIT_BYTES)
+    return jsonify({"status": "success", **job.to_dict()})
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    return jsonify({"status": "success", **job_manager.stats(), "job_list": job_manager.list()})
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    return jsonify({"status": "success", **job_manager.get(job_id).to_dict()})
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    job = job_manager.get(job_id)
+    if job.status == SUCCEEDED:
+        return jsonify(job.result)
+    if not job.done:
+        return jsonify({"status": "error", "message": "Job has not finished yet.", **job.to_dict()})
+    return jsonify({"status": "error", "message": job.error, **job.to_dict()})
+
+@app.route('/api/jobs/<job_id>/stream', methods=['GET'])
+def stream_job(job_id):
+    """NDJSON: {"type": "progress", ...} mỗi khi trạng thái/tiến độ đổi (ít nhất 15 giây một lần), cuối cùng {"type": "done", ...}."""
+    job = job_manager.get(job_id)
+
+    def records():
+        state, version = job_manager.wait_for_change(job, None, timeout=0)
+        while not job.done:
+            yield {"type": "progress", **state}
+            state, version = job_manager.wait_for_change(job, version, timeout=15)
+        yield {"type": "done", **job.to_dict()}
+
+    return ndjson_response(records())
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    return jsonify({"status": "success", **job_manager.cancel(job_id).to_dict()})
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
@@ -0,0 +1,76 @@
+# file benchmarks/dijkstra_queues.py
+"""
+So sánh tốc độ các hàng đợi ưu tiên của Dijkstra (heapq / Dial / radix heap / 0-1 BFS)
+trên lưới giống mạng đường phố: mỗi ô nối 4 ô bên cạnh (vô hướng), trọng số nguyên ngẫu nhiên.
+
+    python benchmarks/dijkstra_queues.py --size 400 --repeat 3
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graph.csr_graph import CSRGraph
+from algorithms.dijkstra import dijkstra_tree_csr
+from algorithms.integer_dijkstra import QUEUE_KINDS, select_queue
+
+
+def grid_graph(size, low, high, seed=0):
+    """Lưới size x size, trọng số nguyên đều trong [low, high]."""
+    ids = np.arange(size * size).reshape(size, size)
+    src = np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()])
+    dst = np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()])
+    weights = np.random.default_rng(seed).integers(low, high + 1, len(src)).astype(np.float64)
+    xs, ys = (ids % size).ravel().astype(np.float64), (ids // size).ravel().astype(np.float64)
+    return CSRGraph(ids.ravel(), src, dst, weights, False, xs=xs, ys=ys)
+
+
+def best_time(function, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - started)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=300, help="cạnh của lưới (số đỉnh = size^2)")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    cases = [
+        ("0/1", 0, 1),
+        ("1..10", 1, 10),
+        ("1..1000", 1, 1000),
+        ("1..10^6", 1, 1_000_000),
+    ]
+    print(f"Lưới {args.size} x {args.size}: {args.size ** 2} đỉnh, {2 * args.size * (args.size - 1)} cạnh")
+    print("Thời gian (s) cây đường đi ngắn nhất từ góc lưới; (x) = nhanh hơn heapq; * = hàng đợi \"auto\" chọn")
+    print(f"{'Trọng số':<10}" + "".join(f"{kind:>18}" for kind in QUEUE_KINDS))
+    for name, low, high in cases:
+        graph = grid_graph(args.size, low, high)
+        chosen = select_queue(graph.slot_weights)
+        heap_time, expected = best_time(lambda: dijkstra_tree_csr(graph, 0, queue='heap'), args.repeat)
+        cells = []
+        for kind in QUEUE_KINDS:
+            # Dial duyệt từng xô tới khoảng cách lớn nhất; 0-1 BFS chỉ đúng với trọng số 0/1
+            if (kind == 'dial' and high > 10_000) or (kind == 'zero_one' and high > 1):
+                cells.append("-")
+                continue
+            elapsed, tree = heap_time, expected
+            if kind != 'heap':
+                elapsed, tree = best_time(lambda: dijkstra_tree_csr(graph, 0, queue=kind), args.repeat)
+                assert np.array_equal(tree.distances, expected.distances)
+            mark = "*" if kind == chosen else " "
+            cells.append(f"{elapsed:.3f} ({heap_time / elapsed:.2f}x){mark}")
+        print(f"{name:<10}" + "".join(f"{cell:>18}" for cell in cells))
+
+
+if __name__ == '__main__':
+    main()
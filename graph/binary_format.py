@@ -0,0 +1,177 @@
+# file graph/binary_format.py
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from .csr_graph import CSRGraph
+
+# Định dạng file nhị phân của đồ thị (đuôi .graph)
+#
+#   Header (32 byte): b"GRPH" | uint16 phiên bản | uint16 cờ | uint64 n (số đỉnh)
+#                     | uint64 m (số cạnh) | uint32 số mục trong bảng mục lục | 4 byte trống
+#   Mục lục (40 byte/mục): tên mảng (16 byte ASCII, đệm \0) | kiểu NumPy (8 byte, vd. "<i8")
+#                     | uint64 vị trí (tính từ đầu file) | uint64 số phần tử
+#   Dữ liệu: các mảng liền nhau, căn lề 8 byte, little-endian.
+#
+# Lưu cả chỉ mục CSR (offsets, targets, slot_*) nên khi đọc chỉ cần trỏ mảng NumPy vào
+# vùng nhớ của file (mmap) - không parse, không sắp xếp, không dựng lại chỉ mục.
+# Nhãn: một mảng byte UTF-8, các nhãn ngăn cách bởi \0.
+MAGIC = b"GRPH"
+FORMAT_VERSION = 1
+
+FLAG_DIRECTED = 0x1
+FLAG_INTEGER_WEIGHTS = 0x2
+
+_HEADER = struct.Struct('<4sHHQQI4x')
+_ENTRY = struct.Struct('<16s8sQQ') # tên, kiểu, vị trí, số phần tử
+
+# (tên thuộc tính CSRGraph, kiểu lưu trong file)
+ARRAY_SECTIONS = (
+    ('node_ids', '<i8'), ('xs', '<f8'), ('ys', '<f8'),
+    ('src', '<i4'), ('dst', '<i4'), ('weights', '<f8'),
+    ('offsets', '<i4'), ('targets', '<i4'), ('slot_weights', '<f8'), ('slot_edges', '<i4'),
+)
+LABELS_SECTION = 'labels'
+_SECTION_DTYPES = dict(ARRAY_SECTIONS, **{LABELS_SECTION: '|u1'})
+
+
+class GraphFormatError(ValueError):
+    """Dữ liệu không phải file đồ thị nhị phân hợp lệ (sai magic, phiên bản, kích thước...)."""
+
+
+def iter_graph_bytes(csr):
+    """
+    Sinh nội dung file nhị phân của CSRGraph theo từng khối (header, rồi từng mảng)
+    mà không ghép thành một bytes lớn - dùng để ghi file hoặc trả HTTP dạng stream.
+    """
+    sections = []
+    for name, dtype in ARRAY_SECTIONS:
+        array = getattr(csr, name)
+        if array is not None:
+            sections.append((name, dtype, np.ascontiguousarray(array, dtype=dtype)))
+    if csr.labels is not None:
+        if any('\0' in label for label in csr.labels):
+            raise GraphFormatError("Vertex labels must not contain NUL characters.")
+        blob = '\0'.join(csr.labels).encode('utf-8')
+        sections.append((LABELS_SECTION, '|u1', np.frombuffer(blob, dtype=np.uint8)))
+
+    flags = (FLAG_DIRECTED if csr.is_directed else 0) | (FLAG_INTEGER_WEIGHTS if csr.integer_weights else 0)
+    header = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, flags, csr.num_vertices, csr.num_edges, len(sections)))
+    position = _align(len(header) + _ENTRY.size * len(sections))
+    layout = []
+    for name, dtype, array in sections:
+        header += _ENTRY.pack(name.encode('ascii'), dtype.encode('ascii'), position, array.size)
+        layout.append((position, array))
+        position = _align(position + array.nbytes)
+
+    written = len(header)
+    yield bytes(header)
+    for position, array in layout:
+        if position > written:
+            yield bytes(position - written)
+        yield memoryview(array).cast('B')
+        written = position + array.nbytes
+
+
+def graph_to_bytes(csr):
+    return b"".join(iter_graph_bytes(csr))
+
+
+def save_graph(csr, path):
+    """Ghi CSRGraph ra file nhị phân (ghi vào file tạm rồi đổi tên -> không để lại file dở)."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        for chunk in iter_graph_bytes(csr):
+            f.write(chunk)
+    os.replace(temp_path, path)
+
+
+def load_graph_file(source):
+    """
+    Mở file nhị phân bằng mmap và dựng CSRGraph trỏ thẳng vào vùng nhớ của file (không sao chép):
+    các mảng chỉ đọc, trang dữ liệu chỉ được đọc từ đĩa khi thuật toán thực sự chạm tới.
+    source: đường dẫn hoặc file nhị phân đang mở (vd. file upload đã được Flask lưu tạm);
+    file không mmap được (BytesIO...) thì đọc toàn bộ vào bộ nhớ.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return load_graph_file(f)
+    try:
+        source.seek(0)
+        buffer = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError):
+        # Không có file descriptor (io.UnsupportedOperation là OSError) hoặc file rỗng
+        source.seek(0)
+        buffer = source.read()
+    return read_graph(buffer)
+
+
+def read_graph(buffer):
+    """
+    Dựng CSRGraph từ nội dung file nhị phân (bytes, mmap hoặc bất kỳ buffer nào).
+    Mảng NumPy là view trên buffer (zero-copy, chỉ đọc); chỉ nhãn phải giải mã thành str.
+    Kiểm tra cấu trúc (kích thước, chỉ số đỉnh trong phạm vi) bằng các phép NumPy hàng loạt.
+    """
+    data = memoryview(buffer).cast('B')
+    if len(data) < _HEADER.size or bytes(data[:4]) != MAGIC:
+        raise GraphFormatError("Not a binary graph file.")
+    _, version, flags, n, m, count = _HEADER.unpack_from(data)
+    if version != FORMAT_VERSION:
+        raise GraphFormatError(f"Unsupported binary graph format version: {version}")
+    if _HEADER.size + count * _ENTRY.size > len(data):
+        raise GraphFormatError("Truncated binary graph file.")
+
+    arrays = {}
+    for k in range(count):
+        raw_name, raw_dtype, position, size = _ENTRY.unpack_from(data, _HEADER.size + k * _ENTRY.size)
+        name = raw_name.rstrip(b'\0').decode('ascii', 'replace')
+        dtype = raw_dtype.rstrip(b'\0').decode('ascii', 'replace')
+        if dtype != _SECTION_DTYPES.get(name):
+            raise GraphFormatError(f"Unknown section or data type: '{name}' ({dtype}).")
+        dtype = np.dtype(dtype)
+        if position + size * dtype.itemsize > len(data):
+            raise GraphFormatError(f"Section '{name}' runs past the end of the file.")
+        arrays[name] = np.frombuffer(data, dtype=dtype, count=size, offset=position)
+
+    labels = None
+    if LABELS_SECTION in arrays:
+        blob = arrays.pop(LABELS_SECTION).tobytes().decode('utf-8')
+        labels = blob.split('\0') if n else []
+    _validate(arrays, labels, n, m, bool(flags & FLAG_DIRECTED))
+    return CSRGraph.from_arrays(arrays, bool(flags & FLAG_DIRECTED), bool(flags & FLAG_INTEGER_WEIGHTS),
+                                labels=labels)
+
+
+def _validate(arrays, labels, n, m, is_directed):
+    for name, _ in ARRAY_SECTIONS:
+        if name not in arrays and name not in ('xs', 'ys'):
+            raise GraphFormatError(f"Missing section '{name}'.")
+    expected = {
+        'node_ids': n, 'xs': n, 'ys': n, 'src': m, 'dst': m, 'weights': m, 'offsets': n + 1,
+    }
+    for name, size in expected.items():
+        if name in arrays and len(arrays[name]) != size:
+            raise GraphFormatError(f"Section '{name}' has the wrong length.")
+    if labels is not None and len(labels) != n:
+        raise GraphFormatError("Label count does not match the vertex count.")
+
+    slots = len(arrays['targets'])
+    # Vô hướng: mỗi cạnh 2 slot, trừ khuyên (1 slot)
+    expected_slots = m if is_directed else 2 * m - int(np.count_nonzero(arrays['src'] == arrays['dst']))
+    if slots != expected_slots or len(arrays['slot_weights']) != slots or len(arrays['slot_edges']) != slots:
+        raise GraphFormatError("Adjacency sections have mismatched lengths.")
+    offsets = arrays['offsets']
+    if offsets[0] != 0 or offsets[-1] != slots or np.any(np.diff(offsets) < 0):
+        raise GraphFormatError("Adjacency offsets are not a valid CSR index.")
+    if n > 1 and np.any(np.diff(arrays['node_ids']) <= 0):
+        raise GraphFormatError("Vertex ids must be unique and sorted.")
+    for name, bound in (('src', n), ('dst', n), ('targets', n), ('slot_edges', m)):
+        array = arrays[name]
+        if array.size and (array.min() < 0 or array.max() >= bound):
+            raise GraphFormatError(f"Section '{name}' has out-of-range indices.")
+
+
+def _align(position):
+    return (position + 7) // 8 * 8
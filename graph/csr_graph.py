@@ -0,0 +1,330 @@
+# file graph/csr_graph.py
+import hashlib
+
+import numpy as np
+
+
+class CSRGraph:
+    """
+    Đồ thị dạng mảng nén CSR (Compressed Sparse Row) dùng NumPy.
+
+    Đỉnh được đánh chỉ số 0..n-1 theo thứ tự ID tăng dần:
+    - node_ids:  int64[n]   chỉ số -> ID đỉnh
+    - xs, ys:    float64[n] tọa độ (có thể None)
+    - labels:    list[str]  nhãn hiển thị (có thể None)
+
+    Danh sách cạnh gốc (dạng cột, theo chỉ số đỉnh):
+    - src, dst:  int32[m]
+    - weights:   float64[m]
+
+    Chỉ mục kề CSR: các cạnh kề của đỉnh i nằm ở slot offsets[i]..offsets[i+1],
+    sắp theo chỉ số đỉnh kề (tức theo ID). Vô hướng: mỗi cạnh có 2 slot.
+    - offsets:      int32[n+1]
+    - targets:      int32[slot]   đỉnh kề
+    - slot_weights: float64[slot] trọng số
+    - slot_edges:   int32[slot]   chỉ số cạnh gốc (để trả kết quả theo chiều vẽ)
+    """
+
+    def __init__(self, node_ids, src, dst, weights, is_directed=False, xs=None, ys=None, labels=None):
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        src = np.asarray(src, dtype=np.int32)
+        dst = np.asarray(dst, dtype=np.int32)
+
+        # Chuẩn hóa: chỉ số đỉnh theo thứ tự ID tăng dần
+        order = np.argsort(node_ids, kind='stable')
+        if np.any(order != np.arange(len(node_ids))):
+            rank = np.empty_like(order)
+            rank[order] = np.arange(len(order))
+            node_ids = node_ids[order]
+            src, dst = rank[src].astype(np.int32), rank[dst].astype(np.int32)
+            xs = None if xs is None else np.asarray(xs)[order]
+            ys = None if ys is None else np.asarray(ys)[order]
+            labels = None if labels is None else [labels[i] for i in order]
+
+        self.node_ids = node_ids
+        self.src = src
+        self.dst = dst
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.is_directed = is_directed
+        self.xs = None if xs is None else np.asarray(xs, dtype=np.float64)
+        self.ys = None if ys is None else np.asarray(ys, dtype=np.float64)
+        self.labels = labels
+        # Trọng số toàn số nguyên -> thuật toán trả khoảng cách kiểu int như bản cũ
+        self.integer_weights = bool(np.all(self.weights == np.floor(self.weights)))
+        self._reset_caches()
+        self._build_index()
+
+    def _reset_caches(self):
+        self._id_to_index = None
+        self._undirected = None
+        self._reverse = None
+        self._geometric_scale = None
+        self._content_hash = None
+
+    # ------------------------------------------------------------------
+    # Dựng đồ thị
+    # ------------------------------------------------------------------
+    def _build_index(self):
+        n, m = len(self.node_ids), len(self.src)
+        edge_ids = np.arange(m, dtype=np.int32)
+        if self.is_directed:
+            tails, heads, eids = self.src, self.dst, edge_ids
+        else:
+            # Chiều ngược của khuyên (self-loop) trùng chiều xuôi -> bỏ
+            back = self.src != self.dst
+            tails = np.concatenate([self.src, self.dst[back]])
+            heads = np.concatenate([self.dst, self.src[back]])
+            eids = np.concatenate([edge_ids, edge_ids[back]])
+
+        # Khóa ghép (đỉnh đầu, đỉnh kề) -> một lần argsort ổn định thay cho lexsort
+        order = np.argsort(tails.astype(np.int64) * max(n, 1) + heads, kind='stable')
+        self.targets = heads[order].astype(np.int32)
+        self.slot_edges = eids[order].astype(np.int32)
+        self.slot_weights = self.weights[self.slot_edges]
+        self.offsets = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(tails, minlength=n), out=self.offsets[1:])
+
+    @classmethod
+    def from_arrays(cls, arrays, is_directed, integer_weights, labels=None):
+        """
+        Dựng lại CSRGraph từ các mảng đã chuẩn hóa và đã có chỉ mục (vd. mảng nằm trong
+        shared memory của tiến trình khác): không sắp xếp, không sao chép, không dựng lại CSR.
+        arrays: dict tên thuộc tính -> mảng (node_ids, src, dst, weights, offsets, targets,
+        slot_weights, slot_edges; xs, ys tùy chọn).
+        """
+        graph = cls.__new__(cls)
+        for name in ('node_ids', 'src', 'dst', 'weights', 'offsets', 'targets', 'slot_weights', 'slot_edges'):
+            setattr(graph, name, arrays[name])
+        graph.xs = arrays.get('xs')
+        graph.ys = arrays.get('ys')
+        graph.labels = labels
+        graph.is_directed = is_directed
+        graph.integer_weights = integer_weights
+        graph._reset_caches()
+        return graph
+
+    @classmethod
+    def from_graph_model(cls, model):
+        """Dựng CSR từ GraphModel (bỏ qua các thuộc tính hiển thị)."""
+        vertex_ids = list(model.vertices)
+        id_to_index = {v_id: i for i, v_id in enumerate(vertex_ids)}
+        edges = model.edges
+        src = [id_to_index[e.start_vertex.id] for e in edges]
+        dst = [id_to_index[e.end_vertex.id] for e in edges]
+        weights = [e.weight if e.weight is not None else 1 for e in edges]
+        vertices = [model.vertices[v_id] for v_id in vertex_ids]
+        return cls(
+            vertex_ids, src, dst, weights, model.is_directed,
+            xs=[v.x for v in vertices], ys=[v.y for v in vertices],
+            labels=[v.label for v in vertices],
+        )
+
+    @classmethod
+    def from_payload(cls, data):
+        """Dựng CSR trực tiếp từ JSON của Frontend (xem graph.ingest.parse_graph_payload)."""
+        from .ingest import parse_graph_payload
+
+        return parse_graph_payload(data)
+
+    def undirected(self):
+        """Bản vô hướng của đồ thị (dùng lại cho các kiểm tra cấu trúc như 2 phía)."""
+        if not self.is_directed:
+            return self
+        if self._undirected is None:
+            self._undirected = CSRGraph(
+                self.node_ids, self.src, self.dst, self.weights, False,
+                xs=self.xs, ys=self.ys, labels=self.labels,
+            )
+        return self._undirected
+
+    def reverse(self):
+        """Đồ thị đảo chiều (tìm kiếm ngược từ đích). Vô hướng: chính nó."""
+        if not self.is_directed:
+            return self
+        if self._reverse is None:
+            self._reverse = CSRGraph(self.node_ids, self.dst, self.src, self.weights, True,
+                                     xs=self.xs, ys=self.ys, labels=self.labels)
+        return self._reverse
+
+    def geometric_scale(self):
+        """
+        Hệ số k lớn nhất sao cho k * (độ dài Euclid của cạnh) <= trọng số với MỌI cạnh.
+        Khi đó k * khoảng cách Euclid tới đích là heuristic chấp nhận được (và nhất quán)
+        cho A*. Trả về 0 nếu không có tọa độ hoặc có trọng số âm.
+        """
+        if self._geometric_scale is None:
+            scale = 0.0
+            if self.xs is not None and self.ys is not None and self.num_edges and self.weights.min() >= 0:
+                lengths = np.hypot(self.xs[self.src] - self.xs[self.dst], self.ys[self.src] - self.ys[self.dst])
+                positive = lengths > 0
+                if positive.any():
+                    scale = float((self.weights[positive] / lengths[positive]).min())
+            self._geometric_scale = scale
+        return self._geometric_scale
+
+    def as_directed(self):
+        """Bản có hướng theo đúng chiều vẽ của các cạnh (vd. cho mạng luồng)."""
+        if self.is_directed:
+            return self
+        return CSRGraph(self.node_ids, self.src, self.dst, self.weights, True,
+                        xs=self.xs, ys=self.ys, labels=self.labels)
+
+    # ------------------------------------------------------------------
+    # Biến đổi: CSRGraph bất biến, mỗi thao tác trả về đồ thị mới
+    # (None nếu thao tác không hợp lệ, giống GraphModel.add_edge)
+    # ------------------------------------------------------------------
+    def _derive(self, node_ids, src, dst, weights, xs, ys, labels):
+        return CSRGraph(node_ids, src, dst, weights, self.is_directed, xs=xs, ys=ys, labels=labels)
+
+    def with_vertex(self, x=0, y=0, vertex_id=None, label=None):
+        """Thêm đỉnh (mặc định ID = ID lớn nhất + 1)."""
+        if vertex_id is None:
+            vertex_id = int(self.node_ids[-1]) + 1 if self.num_vertices else 0
+        if self.index_of(vertex_id) is not None:
+            return None
+        n = self.num_vertices
+        xs = self.xs if self.xs is not None else np.zeros(n)
+        ys = self.ys if self.ys is not None else np.zeros(n)
+        labels = self.labels if self.labels is not None else [str(v) for v in self.node_ids.tolist()]
+        return self._derive(
+            np.append(self.node_ids, vertex_id), self.src, self.dst, self.weights,
+            np.append(xs, x), np.append(ys, y),
+            labels + [str(label) if label is not None else str(vertex_id)],
+        )
+
+    def without_vertex(self, vertex_id):
+        """Xóa đỉnh cùng các cạnh kề với nó."""
+        i = self.index_of(vertex_id)
+        if i is None:
+            return None
+        keep = (self.src != i) & (self.dst != i)
+        src, dst = self.src[keep], self.dst[keep]
+        src = src - (src > i)
+        dst = dst - (dst > i)
+        labels = None if self.labels is None else self.labels[:i] + self.labels[i + 1:]
+        return self._derive(
+            np.delete(self.node_ids, i), src, dst, self.weights[keep],
+            None if self.xs is None else np.delete(self.xs, i),
+            None if self.ys is None else np.delete(self.ys, i),
+            labels,
+        )
+
+    def find_edge(self, start_id, end_id):
+        """Chỉ số cạnh gốc nối start_id -> end_id (vô hướng: cả chiều ngược), hoặc None."""
+        u, v = self.index_of(start_id), self.index_of(end_id)
+        if u is None or v is None:
+            return None
+        a, b = self.row(u)
+        hit = np.flatnonzero(self.targets[a:b] == v)
+        return int(self.slot_edges[a + hit[0]]) if hit.size else None
+
+    def with_edge(self, start_id, end_id, weight=1):
+        """Thêm cạnh; None nếu thiếu đỉnh hoặc cạnh đã tồn tại."""
+        u, v = self.index_of(start_id), self.index_of(end_id)
+        if u is None or v is None or self.find_edge(start_id, end_id) is not None:
+            return None
+        return self._derive(
+            self.node_ids, np.append(self.src, u), np.append(self.dst, v),
+            np.append(self.weights, weight), self.xs, self.ys, self.labels,
+        )
+
+    def without_edge(self, start_id, end_id):
+        """Xóa cạnh start_id -> end_id (vô hướng: cả chiều ngược)."""
+        e = self.find_edge(start_id, end_id)
+        if e is None:
+            return None
+        return self._derive(
+            self.node_ids, np.delete(self.src, e), np.delete(self.dst, e),
+            np.delete(self.weights, e), self.xs, self.ys, self.labels,
+        )
+
+    # ------------------------------------------------------------------
+    # Truy vấn
+    # ------------------------------------------------------------------
+    def content_hash(self):
+        """Băm nội dung đồ thị (ID, tọa độ, nhãn, cạnh, trọng số, hướng) - dùng làm khóa."""
+        if self._content_hash is None:
+            h = hashlib.sha1(b'D' if self.is_directed else b'U')
+            for array in (self.node_ids, self.src, self.dst, self.weights, self.xs, self.ys):
+                if array is None:
+                    h.update(b'|-')
+                else:
+                    h.update(b'|%d|' % array.size)
+                    h.update(np.ascontiguousarray(array).tobytes())
+            if self.labels is not None:
+                h.update('\0'.join(self.labels).encode('utf-8'))
+            self._content_hash = h.hexdigest()
+        return self._content_hash
+
+    @property
+    def num_vertices(self):
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self):
+        return len(self.src)
+
+    @property
+    def id_to_index(self):
+        """Map ID đỉnh -> chỉ số (tạo lười khi cần tra từng ID)."""
+        if self._id_to_index is None:
+            self._id_to_index = {v_id: i for i, v_id in enumerate(self.node_ids.tolist())}
+        return self._id_to_index
+
+    def index_of(self, vertex_id):
+        """Chỉ số của một ID đỉnh, hoặc None nếu không tồn tại."""
+        return self.id_to_index.get(vertex_id)
+
+    def indices_of(self, vertex_ids):
+        """Ánh xạ hàng loạt mảng ID -> chỉ số (giả định mọi ID đều tồn tại)."""
+        return np.searchsorted(self.node_ids, np.asarray(vertex_ids, dtype=np.int64)).astype(np.int32)
+
+    def row(self, i):
+        """Slot đầu/cuối của hàng kề đỉnh i."""
+        return int(self.offsets[i]), int(self.offsets[i + 1])
+
+    def row_slots(self, rows):
+        """Ghép slot của nhiều hàng (giữ thứ tự các hàng) - dùng cho duyệt theo tầng."""
+        starts = self.offsets[rows]
+        counts = self.offsets[rows + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+        shifts = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        return shifts + np.arange(total)
+
+    def edge_pairs(self, edge_indices):
+        """Danh sách (ID đầu, ID cuối) theo chiều vẽ của các cạnh gốc."""
+        edge_indices = np.asarray(edge_indices, dtype=np.int64)
+        us = self.node_ids[self.src[edge_indices]].tolist()
+        vs = self.node_ids[self.dst[edge_indices]].tolist()
+        return list(zip(us, vs))
+
+    def distance_value(self, value):
+        """Đổi khoảng cách về int nếu trọng số đều là số nguyên."""
+        if self.integer_weights and value != float('inf'):
+            return int(value)
+        return float(value)
+
+    @property
+    def nbytes(self):
+        arrays = [self.node_ids, self.src, self.dst, self.weights, self.offsets,
+                  self.targets, self.slot_weights, self.slot_edges, self.xs, self.ys]
+        return sum(a.nbytes for a in arrays if a is not None)
+
+    def to_graph_model(self):
+        """Chuyển ngược về GraphModel (cho các thuật toán chưa có bản CSR)."""
+        from .graph_model import GraphModel
+
+        model = GraphModel(is_directed=self.is_directed)
+        ids = self.node_ids.tolist()
+        xs = self.xs.tolist() if self.xs is not None else [0] * len(ids)
+        ys = self.ys.tolist() if self.ys is not None else [0] * len(ids)
+        labels = self.labels if self.labels is not None else [None] * len(ids)
+        for v_id, x, y, label in zip(ids, xs, ys, labels):
+            model.add_vertex(x, y, vertex_id=v_id, label=label)
+        weights = [int(w) if self.integer_weights else w for w in self.weights.tolist()]
+        model.add_edges(zip(self.node_ids[self.src].tolist(), self.node_ids[self.dst].tolist(), weights))
+        model.history.clear() # Đồ thị dựng từ mảng không có lịch sử Undo
+        return model
+
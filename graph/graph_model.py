@@ -1,17 +1,53 @@
 # file graph/graph_model.py
 from .vertex import Vertex
 from .edge import Edge
-import copy # <--- THÊM IMPORT NÀY
+from .history import GraphHistory
 
 class GraphModel:
-    def __init__(self, is_directed=False):
+    def __init__(self, is_directed=False, history_limit=200):
         self.vertices = {}
-        self.edges = []
+        # Chỉ mục khóa cạnh: {khóa_cạnh: Edge} (xem _edge_key), giữ thứ tự thêm cạnh
+        self.edge_index = {}
+        # Chỉ mục kề: {id_đỉnh: {Edge: id_đỉnh_kề}} (dict giữ thứ tự thêm cạnh)
+        self.out_edges = {} # Cạnh đi ra từ đỉnh
+        self.in_edges = {}  # Cạnh đi vào đỉnh
         self.is_directed = is_directed
         self.next_id = 0
         self.naming_mode = "1, 2, 3..."
+        # Nhật ký thao tác cho Undo/Redo (xem graph/history.py)
+        self.history = GraphHistory(history_limit)
+        # Số thứ tự thêm (thuộc tính seq của Vertex/Edge): Undo một phép xóa đưa phần tử về
+        # đúng vị trí cũ trong các dict, thay vì nối vào cuối
+        self._next_seq = 0
+
+    @classmethod
+    def from_edge_list(cls, edge_list, is_directed=False, nodes=None):
+        """
+        Dựng đồ thị hàng loạt trong O(V + E).
+        - edge_list: các bộ (start_id, end_id) hoặc (start_id, end_id, weight).
+        - nodes: danh sách {id, x, y, label} (định dạng của get_graph_data).
+          Nếu bỏ trống, các đỉnh được tạo tự động từ ID xuất hiện trong cạnh.
+        """
+        graph = cls(is_directed=is_directed)
+        if nodes is not None:
+            for node in nodes:
+                graph.add_vertex(node.get('x', 0), node.get('y', 0),
+                                 vertex_id=int(node['id']), label=node.get('label'))
+        else:
+            edge_list = list(edge_list)
+            for item in edge_list:
+                for v_id in (item[0], item[1]):
+                    if v_id not in graph.vertices:
+                        graph.add_vertex(0, 0, vertex_id=v_id)
+        graph.add_edges(edge_list)
+        graph.history.clear() # Dựng đồ thị ban đầu không phải thao tác cần undo
+        return graph
+
+    @property
+    def edges(self):
+        """Danh sách cạnh theo thứ tự thêm vào."""
+        return list(self.edge_index.values())
 
-    # ... (Giữ nguyên các phương thức set_naming_mode, _generate_label, add_vertex, add_edge, remove_vertex, remove_edge, clear) ...
     def set_naming_mode(self, mode):
         self.naming_mode = mode
 
@@ -25,65 +61,250 @@ class GraphModel:
         else:
             return str(current_id + 1)
 
-    def add_vertex(self, x, y):
-        label = self._generate_label(self.next_id)
-        v = Vertex(self.next_id, x, y, label)
-        self.vertices[self.next_id] = v
-        self.next_id += 1
+    def add_vertex(self, x, y, vertex_id=None, label=None):
+        """
+        Thêm đỉnh mới. Mặc định dùng next_id; truyền vertex_id/label
+        khi tái tạo đồ thị từ dữ liệu đã có sẵn ID (JSON, file lưu).
+        """
+        if vertex_id is None:
+            vertex_id = self.next_id
+        if label is None:
+            label = self._generate_label(vertex_id)
+        v = Vertex(vertex_id, x, y, label)
+        replaced = self.vertices.get(vertex_id)
+        # Thay đỉnh cùng ID -> giữ vị trí của đỉnh cũ
+        v.seq = replaced.seq if replaced is not None else self._new_seq()
+        self.history.record(('add_vertex', v, replaced, self.next_id))
+        self._insert_vertex(v)
+        self.next_id = max(self.next_id, vertex_id + 1)
+        return v
+
+    def move_vertex(self, vertex_id, x, y):
+        """Đổi tọa độ đỉnh (kéo thả) - được ghi vào lịch sử Undo."""
+        v = self.vertices.get(vertex_id)
+        if v is None:
+            return None
+        self.history.record(('move_vertex', v, (v.x, v.y), (x, y)))
+        v.x, v.y = x, y
         return v
 
+    def _new_seq(self):
+        self._next_seq += 1
+        return self._next_seq
+
+    def _insert_vertex(self, v):
+        self.vertices[v.id] = v
+        self.out_edges.setdefault(v.id, {})
+        self.in_edges.setdefault(v.id, {})
+
+    def _edge_key(self, start_id, end_id):
+        """
+        Khóa băm của cạnh. Vô hướng: (u, v) và (v, u) cho cùng một khóa
+        nên kiểm tra trùng cạnh chỉ tốn O(1).
+        """
+        if self.is_directed or start_id <= end_id:
+            return (start_id, end_id)
+        return (end_id, start_id)
+
+    def has_edge(self, start_id, end_id):
+        return self._edge_key(start_id, end_id) in self.edge_index
+
+    def get_edge(self, start_id, end_id):
+        """Trả về Edge nối start_id -> end_id (vô hướng: cả chiều ngược lại) hoặc None."""
+        return self.edge_index.get(self._edge_key(start_id, end_id))
+
     def add_edge(self, start_id, end_id, weight=1):
         if start_id not in self.vertices or end_id not in self.vertices:
             return None
-        start_v = self.vertices[start_id]
-        end_v = self.vertices[end_id]
 
-        for edge in self.edges:
-            if edge.start_vertex == start_v and edge.end_vertex == end_v:
-                return None
-            if not self.is_directed:
-                if edge.start_vertex == end_v and edge.end_vertex == start_v:
-                    return None
-
-        new_edge = Edge(start_v, end_v, weight, self.is_directed)
-        self.edges.append(new_edge)
+        key = self._edge_key(start_id, end_id)
+        if key in self.edge_index:
+            return None
+
+        new_edge = Edge(self.vertices[start_id], self.vertices[end_id], weight, self.is_directed)
+        new_edge.seq = self._new_seq()
+        self.history.record(('add_edge', new_edge))
+        self._insert_edge(new_edge)
         return new_edge
-# === THÊM HÀM NÀY ===
+
+    def add_edges(self, edge_list):
+        """
+        Thêm nhiều cạnh một lúc: các bộ (start_id, end_id) hoặc (start_id, end_id, weight).
+        Trả về danh sách cùng độ dài với đầu vào: Edge mới hoặc None nếu bị bỏ qua
+        (đỉnh không tồn tại / cạnh trùng).
+        """
+        added = []
+        with self.history.group(): # Cả lô là một bước Undo
+            for item in edge_list:
+                weight = item[2] if len(item) > 2 else 1
+                added.append(self.add_edge(item[0], item[1], weight))
+        return added
+
+    def _insert_edge(self, edge):
+        self.edge_index[self._edge_key(edge.start_vertex.id, edge.end_vertex.id)] = edge
+        self._index_edge(edge)
+
+    def _delete_edge(self, edge):
+        del self.edge_index[self._edge_key(edge.start_vertex.id, edge.end_vertex.id)]
+        self._unindex_edge(edge)
+
+    def _index_edge(self, edge):
+        """Ghi cạnh vào chỉ mục kề (out_edges / in_edges)."""
+        u, v = edge.start_vertex.id, edge.end_vertex.id
+        self.out_edges[u][edge] = v
+        self.in_edges[v][edge] = u
+
+    def _unindex_edge(self, edge):
+        """Gỡ cạnh khỏi chỉ mục kề."""
+        u, v = edge.start_vertex.id, edge.end_vertex.id
+        self.out_edges.get(u, {}).pop(edge, None)
+        self.in_edges.get(v, {}).pop(edge, None)
+
+    def get_neighbors(self, vertex_id):
+        """
+        Trả về danh sách (id_đỉnh_kề, Edge) của một đỉnh theo chiều duyệt:
+        - Có hướng: chỉ các cạnh đi ra.
+        - Vô hướng: cả cạnh đi ra và đi vào.
+        """
+        neighbors = [(v_id, edge) for edge, v_id in self.out_edges.get(vertex_id, {}).items()]
+        if not self.is_directed:
+            for edge, u_id in self.in_edges.get(vertex_id, {}).items():
+                if u_id != vertex_id: # Khuyên (self-loop) đã có trong out_edges
+                    neighbors.append((u_id, edge))
+        return neighbors
+
     def remove_edge(self, edge):
-        """Xóa một đối tượng cạnh cụ thể khỏi danh sách"""
-        if edge in self.edges:
-            self.edges.remove(edge)
+        """Xóa một đối tượng cạnh cụ thể khỏi danh sách (O(1) qua khóa cạnh)"""
+        key = self._edge_key(edge.start_vertex.id, edge.end_vertex.id)
+        if self.edge_index.get(key) is edge:
+            self.history.record(('remove_edge', edge))
+            self._delete_edge(edge)
+
     def remove_vertex(self, vertex_id):
         if vertex_id in self.vertices:
-            del self.vertices[vertex_id]
-            self.edges = [
-                e for e in self.edges
-                if e.start_vertex.id != vertex_id and e.end_vertex.id != vertex_id
-            ]
-            if len(self.vertices) == 0:
-                self.next_id = 0
+            # Chỉ gỡ các cạnh kề với đỉnh bị xóa: O(bậc) thay vì O(E)
+            incident = dict.fromkeys(self.out_edges.get(vertex_id, {}))
+            incident.update(dict.fromkeys(self.in_edges.get(vertex_id, {}))) # Khuyên chỉ tính 1 lần
+            incident = list(incident)
+            self.history.record(('remove_vertex', self.vertices[vertex_id], incident, self.next_id))
+            self._delete_vertex(vertex_id, incident)
 
-    def remove_edge(self, edge):
-        if edge in self.edges:
-            self.edges.remove(edge)
+    def _delete_vertex(self, vertex_id, incident):
+        for edge in incident:
+            self._delete_edge(edge)
+        del self.vertices[vertex_id]
+        del self.out_edges[vertex_id]
+        del self.in_edges[vertex_id]
+        if len(self.vertices) == 0:
+            self.next_id = 0
 
     def clear(self):
+        # Giữ lại tham chiếu các dict cũ (O(1)) để Undo trả lại nguyên trạng
+        self.history.record(('clear', self._detach()))
+
+    def _detach(self):
+        """Tách toàn bộ dữ liệu hiện tại ra (trả về để lưu) và thay bằng đồ thị rỗng."""
+        saved = [self.vertices, self.edge_index, self.out_edges, self.in_edges, self.next_id]
+        self._reset()
+        return saved
+
+    def _reset(self):
         self.vertices = {}
-        self.edges = []
+        self.edge_index = {}
+        self.out_edges = {}
+        self.in_edges = {}
         self.next_id = 0
 
-    # === MỚI: Hàm tạo bản sao dữ liệu để lưu trữ cho Undo ===
+    # === Undo / Redo bằng nhật ký thao tác (không sao chép cả đồ thị) ===
+    def undo(self):
+        """Đảo ngược bước gần nhất. Trả về False nếu không còn gì để undo."""
+        step = self.history.undo_step()
+        if step is None:
+            return False
+        for op in reversed(step):
+            self._revert(op)
+        return True
+
+    def redo(self):
+        """Làm lại bước vừa undo. Trả về False nếu không còn gì để redo."""
+        step = self.history.redo_step()
+        if step is None:
+            return False
+        for op in step:
+            self._replay(op)
+        return True
+
     def get_state(self):
-        """Trả về một bản sao sâu (deep copy) của dữ liệu đồ thị hiện tại."""
-        # Sử dụng copy.deepcopy để đảm bảo bản sao hoàn toàn độc lập
-        return copy.deepcopy(self.vertices), copy.deepcopy(self.edges), self.next_id
+        """
+        Mốc của trạng thái hiện tại (O(1), không sao chép dữ liệu).
+        Dùng với restore_state() để quay lại trạng thái này sau đó.
+        """
+        return self.history.checkpoint()
 
     def restore_state(self, state):
-        """Khôi phục đồ thị về một trạng thái đã lưu."""
-        vertices_copy, edges_copy, next_id_copy = state
-        self.vertices = vertices_copy
-        self.edges = edges_copy
-        self.next_id = next_id_copy
+        """
+        Khôi phục trạng thái đã lưu bằng get_state(): undo/redo từng bước tới mốc đó,
+        chi phí tỉ lệ với số thay đổi kể từ mốc. ValueError nếu mốc đã ra khỏi lịch sử.
+        """
+        steps = self.history.steps_to(state)
+        move = self.undo if steps < 0 else self.redo
+        for _ in range(abs(steps)):
+            move()
+
+    def _revert(self, op):
+        kind = op[0]
+        if kind == 'add_vertex':
+            _, v, replaced, next_id = op
+            if replaced is not None:
+                self.vertices[v.id] = replaced
+            else:
+                self._delete_vertex(v.id, [])
+            self.next_id = next_id
+        elif kind == 'move_vertex':
+            op[1].x, op[1].y = op[2]
+        elif kind == 'add_edge':
+            self._delete_edge(op[1])
+        elif kind == 'remove_edge':
+            self._restore_edges([op[1]])
+        elif kind == 'remove_vertex':
+            _, v, incident, next_id = op
+            seq_of_vertex = lambda vertex_id, _: self.vertices[vertex_id].seq
+            _put_back(self.vertices, [(v.id, v)], lambda vertex_id, vertex: vertex.seq)
+            _put_back(self.out_edges, [(v.id, {})], seq_of_vertex)
+            _put_back(self.in_edges, [(v.id, {})], seq_of_vertex)
+            self._restore_edges(incident)
+            self.next_id = next_id
+        elif kind == 'clear':
+            self.vertices, self.edge_index, self.out_edges, self.in_edges, self.next_id = op[1]
+
+    def _restore_edges(self, edges):
+        """Undo xóa cạnh: thêm lại vào edge_index và chỉ mục kề ở đúng vị trí cũ (theo seq)."""
+        seq_of_edge = lambda key, edge: edge.seq
+        _put_back(self.edge_index,
+                  [(self._edge_key(e.start_vertex.id, e.end_vertex.id), e) for e in edges], seq_of_edge)
+        seq_of_edge = lambda edge, _: edge.seq
+        for edge in sorted(edges, key=lambda e: e.seq):
+            u, v = edge.start_vertex.id, edge.end_vertex.id
+            _put_back(self.out_edges[u], [(edge, v)], seq_of_edge)
+            _put_back(self.in_edges[v], [(edge, u)], seq_of_edge)
+
+    def _replay(self, op):
+        kind = op[0]
+        if kind == 'add_vertex':
+            v = op[1]
+            self._insert_vertex(v)
+            self.next_id = max(self.next_id, v.id + 1)
+        elif kind == 'move_vertex':
+            op[1].x, op[1].y = op[3]
+        elif kind == 'add_edge':
+            self._insert_edge(op[1])
+        elif kind == 'remove_edge':
+            self._delete_edge(op[1])
+        elif kind == 'remove_vertex':
+            self._delete_vertex(op[1].id, op[2])
+        elif kind == 'clear':
+            # Các dict đang dùng có thể là bản dựng lại sau undo -> lưu lại đúng bản hiện tại
+            op[1][:] = self._detach()
 
     def get_graph_data(self):
         """
@@ -119,3 +340,20 @@ class GraphModel:
             "edges": edges_data,
             "directed": self.is_directed
         }
+
+
+def _put_back(mapping, items, seq):
+    """
+    Thêm lại các mục (khóa, giá trị) đã bị xóa vào dict mà vẫn giữ thứ tự thêm ban đầu
+    (seq(khóa, giá trị) = số thứ tự). Dict không chèn được vào giữa: mục cũ hơn mục cuối
+    hiện có -> sắp xếp lại tại chỗ, O(len(mapping)); thường chỉ là nối vào cuối, O(1).
+    """
+    items = sorted(items, key=lambda item: seq(*item))
+    if not items:
+        return
+    last = seq(*next(reversed(mapping.items()))) if mapping else -1
+    mapping.update(items)
+    if seq(*items[0]) < last:
+        ordered = sorted(mapping.items(), key=lambda item: seq(*item))
+        mapping.clear()
+        mapping.update(ordered)
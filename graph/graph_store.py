@@ -0,0 +1,131 @@
+# file graph/graph_store.py
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+class GraphNotFoundError(KeyError):
+    """graph_id không tồn tại hoặc đã bị xóa khỏi kho (hết hạn / bị đẩy ra)."""
+
+    def __str__(self):
+        return f"Unknown or expired graph id: {self.args[0]}"
+
+
+class GraphStore:
+    """
+    Kho đồ thị phía server: client upload đồ thị một lần, nhận graph_id rồi gọi
+    thuật toán theo ID thay vì gửi lại JSON.
+
+    - Mỗi lần upload là một mục riêng với graph_id ngẫu nhiên (kể cả khi nội dung trùng):
+      mục sửa được (replace), nên hai client upload cùng đồ thị không được dùng chung mục.
+      Cache kết quả vẫn dùng chung theo graph.content_hash().
+
+    - LRU: OrderedDict, mục vừa dùng được đưa xuống cuối.
+    - TTL: mục không được dùng quá ttl_seconds bị coi là hết hạn.
+    - Giới hạn số lượng (max_graphs) và tổng dung lượng ước lượng (max_bytes).
+    """
+
+    def __init__(self, max_graphs=64, ttl_seconds=1800, max_bytes=512 * 1024 * 1024, clock=time.monotonic):
+        self.max_graphs = max_graphs
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries = OrderedDict() # graph_id -> [CSRGraph, số byte, lần dùng cuối]
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def on_change(self, callback):
+        """Đăng ký callback(graph_id, old_graph) khi một đồ thị bị sửa hoặc xóa."""
+        self._listeners.append(callback)
+
+    def put(self, graph):
+        """Lưu đồ thị thành một mục mới, trả về graph_id của mục đó."""
+        graph_id = uuid.uuid4().hex
+        with self._lock:
+            self._insert(graph_id, graph)
+        return graph_id
+
+    def get(self, graph_id):
+        with self._lock:
+            self._expire()
+            if graph_id not in self._entries:
+                raise GraphNotFoundError(graph_id)
+            self._touch(graph_id)
+            return self._entries[graph_id][0]
+
+    def replace(self, graph_id, graph):
+        """Thay nội dung của graph_id sau khi sửa (thêm/xóa đỉnh, cạnh). graph_id giữ nguyên."""
+        with self._lock:
+            if graph_id not in self._entries:
+                raise GraphNotFoundError(graph_id)
+            old_graph = self._remove(graph_id)
+            self._insert(graph_id, graph)
+        self._notify(graph_id, old_graph)
+
+    def delete(self, graph_id):
+        with self._lock:
+            if graph_id not in self._entries:
+                raise GraphNotFoundError(graph_id)
+            old_graph = self._remove(graph_id)
+        self._notify(graph_id, old_graph)
+
+    def stats(self):
+        with self._lock:
+            self._expire()
+            return {
+                "graphs": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_graphs": self.max_graphs,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    # --- Nội bộ (gọi khi đã giữ khóa) ---
+    def _insert(self, graph_id, graph):
+        size = _estimate_bytes(graph)
+        self._entries[graph_id] = [graph, size, self._clock()]
+        self._total_bytes += size
+        self._evict(keep=graph_id)
+
+    def _remove(self, graph_id):
+        graph, size, _ = self._entries.pop(graph_id)
+        self._total_bytes -= size
+        return graph
+
+    def _touch(self, graph_id):
+        self._entries[graph_id][2] = self._clock()
+        self._entries.move_to_end(graph_id)
+
+    def _expire(self):
+        # Mục được sắp theo lần dùng cuối (LRU) -> dừng ở mục đầu tiên còn hạn
+        deadline = self._clock() - self.ttl_seconds
+        while self._entries:
+            graph_id, (_, _, used) = next(iter(self._entries.items()))
+            if used >= deadline:
+                break
+            self._remove(graph_id)
+
+    def _evict(self, keep):
+        """Đẩy mục ít dùng nhất ra cho tới khi thỏa giới hạn (không đẩy mục vừa thêm)."""
+        self._expire()
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_graphs or self._total_bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            self._remove(oldest)
+
+    def _notify(self, graph_id, old_graph):
+        for callback in self._listeners:
+            callback(graph_id, old_graph)
+
+
+def _estimate_bytes(graph):
+    """Dung lượng ước lượng: mảng NumPy + chuỗi nhãn."""
+    size = graph.nbytes
+    if graph.labels is not None:
+        size += sum(len(label) + 50 for label in graph.labels)
+    return size
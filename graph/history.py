@@ -0,0 +1,118 @@
+# file graph/history.py
+from collections import deque
+from contextlib import contextmanager
+
+
+class HistoryCheckpoint:
+    """Mốc trong lịch sử (xem GraphHistory.checkpoint): chỉ là số phiên bản + bước ngay trước nó."""
+
+    __slots__ = ('version', 'marker')
+
+    def __init__(self, version, marker):
+        self.version = version
+        self.marker = marker
+
+
+class GraphHistory:
+    """
+    Nhật ký thao tác cho Undo/Redo: mỗi "bước" là danh sách các thao tác nhỏ (delta)
+    như ('add_edge', edge) chứ không phải bản sao cả đồ thị, nên lưu một bước tốn
+    O(số phần tử thay đổi) và các bước dùng chung đối tượng Vertex/Edge với đồ thị.
+
+    - limit: số bước tối đa được giữ (None = không giới hạn, 0 = tắt lịch sử);
+      bước cũ nhất bị bỏ khi vượt quá.
+    - group(): gộp nhiều thao tác thành MỘT bước undo (vd. thêm hàng loạt cạnh).
+    - checkpoint() / steps_to(): đánh dấu một trạng thái và tính cần undo/redo bao nhiêu
+      bước để quay lại đó.
+    Lịch sử chỉ lưu thao tác; việc áp dụng/đảo ngược do GraphModel thực hiện.
+    """
+
+    def __init__(self, limit=200):
+        self.limit = limit
+        self._steps = deque()
+        self._cursor = 0        # Số bước (tính từ đầu _steps) đang được áp dụng
+        self._base = 0          # Số bước đã bị cắt khỏi đầu nhật ký
+        self._dropped = object() # Bước cuối cùng bị cắt (mốc của phiên bản _base)
+        self._group = None
+
+    @property
+    def can_undo(self):
+        return self._cursor > 0
+
+    @property
+    def can_redo(self):
+        return self._cursor < len(self._steps)
+
+    def __len__(self):
+        return len(self._steps)
+
+    def record(self, op):
+        if self.limit == 0:
+            return
+        if self._group is not None:
+            self._group.append(op)
+        else:
+            self._push([op])
+
+    @contextmanager
+    def group(self):
+        """Các thao tác trong khối with trở thành một bước (lồng nhau -> gộp vào khối ngoài cùng)."""
+        if self._group is not None:
+            yield
+            return
+        self._group = []
+        try:
+            yield
+        finally:
+            ops, self._group = self._group, None
+            if ops:
+                self._push(ops)
+
+    def _push(self, ops):
+        # Thao tác mới sau khi undo -> bỏ nhánh redo
+        while len(self._steps) > self._cursor:
+            self._steps.pop()
+        self._steps.append(ops)
+        self._cursor += 1
+        while self.limit is not None and len(self._steps) > self.limit:
+            self._dropped = self._steps.popleft()
+            self._base += 1
+            self._cursor -= 1
+
+    def undo_step(self):
+        """Lùi con trỏ một bước, trả về các thao tác cần đảo ngược (None nếu hết)."""
+        if not self.can_undo:
+            return None
+        self._cursor -= 1
+        return self._steps[self._cursor]
+
+    def redo_step(self):
+        """Tiến con trỏ một bước, trả về các thao tác cần làm lại (None nếu hết)."""
+        if not self.can_redo:
+            return None
+        step = self._steps[self._cursor]
+        self._cursor += 1
+        return step
+
+    def checkpoint(self):
+        marker = self._steps[self._cursor - 1] if self._cursor else self._dropped
+        return HistoryCheckpoint(self._base + self._cursor, marker)
+
+    def steps_to(self, checkpoint):
+        """
+        Số bước cần đi để về checkpoint: âm = undo, dương = redo.
+        ValueError nếu mốc đã bị cắt khỏi lịch sử hoặc thuộc nhánh redo đã bị bỏ.
+        """
+        i = checkpoint.version - self._base
+        if 0 <= i <= len(self._steps):
+            marker = self._steps[i - 1] if i else self._dropped
+            if marker is checkpoint.marker:
+                return i - self._cursor
+        raise ValueError("Checkpoint is no longer in the undo history.")
+
+    def clear(self):
+        self._steps.clear()
+        self._cursor = 0
+        self._base = 0
+        self._dropped = object() # Vô hiệu mọi checkpoint cũ
+        self._group = None
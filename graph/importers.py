@@ -0,0 +1,469 @@
+# file graph/importers.py
+import io
+import os
+import shutil
+import tempfile
+import warnings
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from itertools import islice
+
+import numpy as np
+
+from .binary_format import load_graph_file, save_graph
+from .csr_graph import CSRGraph
+from .ingest import map_edge_ids
+
+
+class GraphImportError(ValueError):
+    """File đồ thị (edge list, Matrix Market, DIMACS, GraphML) sai cú pháp hoặc không được hỗ trợ."""
+
+
+class EdgeBuffer:
+    """
+    Cột cạnh (ID đầu, ID cuối, trọng số) được nạp dần theo từng khối.
+    Vượt quá spill_edges cạnh thì các khối được ghi nối vào file tạm (thư mục spill_dir)
+    và columns() trả về np.memmap -> lúc parse chỉ giữ một khối trong RAM.
+    Dùng với "with" để xóa file tạm.
+    """
+
+    _DTYPES = (np.int64, np.int64, np.float64)
+
+    def __init__(self, spill_edges=None, spill_dir=None):
+        self.spill_edges = spill_edges
+        self.spill_dir = spill_dir
+        self._chunks = []
+        self._files = None
+        self._temp_dir = None
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, src_ids, dst_ids, weights=None):
+        if weights is None:
+            weights = np.ones(len(src_ids))
+        chunk = [np.asarray(column, dtype=dtype) for column, dtype in zip((src_ids, dst_ids, weights), self._DTYPES)]
+        self._count += len(chunk[0])
+        if self._files is not None:
+            self._write(chunk)
+            return
+        self._chunks.append(chunk)
+        if self.spill_edges is not None and self._count > self.spill_edges:
+            self._spill()
+
+    def _spill(self):
+        self._temp_dir = tempfile.mkdtemp(prefix='graph-import-', dir=self.spill_dir)
+        self._files = [open(os.path.join(self._temp_dir, name), 'wb') for name in ('src', 'dst', 'weight')]
+        for chunk in self._chunks:
+            self._write(chunk)
+        self._chunks = []
+
+    def _write(self, chunk):
+        for f, column in zip(self._files, chunk):
+            column.tofile(f)
+
+    def columns(self):
+        """(src_ids, dst_ids, weights): mảng trong bộ nhớ, hoặc memmap chỉ đọc nếu đã ghi ra đĩa."""
+        if self._files is None:
+            if not self._chunks:
+                return tuple(np.empty(0, dtype=dtype) for dtype in self._DTYPES)
+            return tuple(np.concatenate(parts) for parts in zip(*self._chunks))
+        for f in self._files:
+            f.flush()
+        return tuple(np.memmap(f.name, dtype=dtype, mode='r') for f, dtype in zip(self._files, self._DTYPES))
+
+    def close(self):
+        if self._files is not None:
+            for f in self._files:
+                f.close()
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._files = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def build_graph(edges, is_directed, node_ids=None, xs=None, ys=None, labels=None,
+                keep_parallel=False, output_path=None):
+    """
+    Dựng CSRGraph từ EdgeBuffer (cùng quy tắc với parse_graph_payload: bỏ cạnh tới đỉnh
+    không tồn tại và cạnh trùng, trừ khi keep_parallel).
+    node_ids None -> tập đỉnh là các đầu mút của cạnh.
+    output_path: ghi kết quả ra file nhị phân rồi mở lại bằng mmap (dữ liệu nằm trên đĩa,
+    hệ điều hành tự nạp/giải phóng trang nhớ) thay vì giữ các mảng trong bộ nhớ.
+    """
+    src_ids, dst_ids, weights = edges.columns()
+    if node_ids is None:
+        # Sắp xếp rồi bỏ phần tử lặp: nhanh hơn np.unique (băm) với hàng triệu ID
+        node_ids = np.sort(np.concatenate([src_ids, dst_ids]))
+        node_ids = node_ids[np.concatenate([[True], node_ids[1:] != node_ids[:-1]])]
+    else:
+        node_ids, first = np.unique(np.asarray(node_ids, dtype=np.int64), return_index=True)
+        xs = None if xs is None else np.asarray(xs, dtype=np.float64)[first]
+        ys = None if ys is None else np.asarray(ys, dtype=np.float64)[first]
+        labels = None if labels is None else [labels[i] for i in first.tolist()]
+
+    src, dst, keep = map_edge_ids(node_ids, src_ids, dst_ids, is_directed, dedupe=not keep_parallel)
+    graph = CSRGraph(node_ids, src, dst, np.asarray(weights[keep]), is_directed, xs=xs, ys=ys, labels=labels)
+    if output_path is not None:
+        save_graph(graph, output_path)
+        graph = load_graph_file(output_path)
+    return graph
+
+
+# ----------------------------------------------------------------------
+# Đọc file theo từng khối dòng
+# ----------------------------------------------------------------------
+@contextmanager
+def _open_text(source):
+    """source: đường dẫn, file văn bản hoặc file nhị phân (vd. file upload) -> luồng văn bản."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'r', encoding='utf-8', newline='') as f:
+            yield f
+    elif isinstance(source, io.TextIOBase):
+        yield source
+    else:
+        text = io.TextIOWrapper(source, encoding='utf-8', newline='')
+        try:
+            yield text
+        finally:
+            text.detach() # Không đóng file gốc của người gọi
+
+
+def _read_rows(lines, first_line, dtype, usecols, delimiter=None, comments='#'):
+    """
+    Parse một khối dòng bằng np.loadtxt (C); lỗi -> GraphImportError kèm khoảng dòng.
+    comments là MỘT ký tự: nhiều ký tự thì NumPy tiền xử lý từng dòng bằng Python (chậm ~10 lần).
+    """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning) # Khối chỉ toàn chú thích
+            return np.loadtxt(lines, dtype=dtype, usecols=usecols, delimiter=delimiter,
+                              comments=comments, ndmin=1)
+    except ValueError as e:
+        raise GraphImportError(f"Lines {first_line}-{first_line + len(lines) - 1}: {e}")
+
+
+def _chunks(stream, chunk_lines, pending=(), line_number=1):
+    """
+    Các khối (số thứ tự dòng đầu tiên, danh sách dòng).
+    pending: các dòng đã đọc trước nhưng chưa parse; line_number: số thứ tự của dòng đầu khối đầu tiên.
+    """
+    lines = list(pending)
+    while True:
+        lines.extend(islice(stream, chunk_lines - len(lines)))
+        if not lines:
+            return
+        yield line_number, lines
+        line_number += len(lines)
+        lines = []
+
+
+def _data_lines(stream, comments):
+    """
+    Bỏ qua dòng trống/chú thích ở đầu file, trả về (các dòng đã đọc, dòng dữ liệu đầu tiên).
+    Dòng chú thích được thay bằng dòng trống (giữ số thứ tự dòng khi parse lại).
+    """
+    consumed = []
+    for line in stream:
+        stripped = line.strip()
+        if stripped and not stripped.startswith(comments):
+            consumed.append(line)
+            return consumed, stripped
+        consumed.append('\n')
+    return consumed, None
+
+
+# ----------------------------------------------------------------------
+# Edge list / CSV
+# ----------------------------------------------------------------------
+_SOURCE_NAMES = ('source', 'src', 'from', 'u', 'start')
+_TARGET_NAMES = ('target', 'dst', 'to', 'v', 'end')
+_WEIGHT_NAMES = ('weight', 'w', 'capacity', 'cost')
+
+
+def read_edge_list(source, directed=None, delimiter=None, keep_parallel=False,
+                   chunk_lines=200_000, spill_edges=None, spill_dir=None, output_path=None):
+    """
+    Edge list / CSV: mỗi dòng "đầu cuối [trọng số]" (cách nhau bởi khoảng trắng, hoặc dấu phẩy
+    nếu dòng đầu có dấu phẩy). Chú thích bắt đầu bằng # (các dòng % ở đầu file, kiểu KONECT,
+    cũng được bỏ qua). Dòng đầu không phải số
+    là tiêu đề CSV: cột source/target/weight (hoặc from/to, u/v...) được tìm theo tên.
+    Đọc từng khối chunk_lines dòng; trả về (CSRGraph, info). directed None -> vô hướng.
+    """
+    directed = bool(directed)
+    with _open_text(source) as stream:
+        pending, first = _data_lines(stream, ('#', '%'))
+        if first is None:
+            return build_graph(EdgeBuffer(), directed, output_path=output_path), {"format": "edgelist"}
+        if delimiter is None and ',' in first:
+            delimiter = ','
+        tokens = [t.strip().lower() for t in first.split(delimiter)]
+
+        source_col, target_col, weight_col = 0, 1, 2 if len(tokens) > 2 else None
+        if not (_is_int(tokens[0]) and len(tokens) > 1 and _is_int(tokens[1])):
+            # Dòng tiêu đề
+            source_col = _find_column(tokens, _SOURCE_NAMES, 0)
+            target_col = _find_column(tokens, _TARGET_NAMES, 1)
+            weight_col = _find_column(tokens, _WEIGHT_NAMES, 2 if len(tokens) > 2 else None)
+            pending[-1] = '\n' # Giữ đúng số thứ tự dòng cho thông báo lỗi
+        if len(tokens) < 2:
+            raise GraphImportError("Each edge line needs a source and a target column.")
+
+        usecols = (source_col, target_col) + ((weight_col,) if weight_col is not None else ())
+        dtype = [('u', np.int64), ('v', np.int64), ('w', np.float64)][:len(usecols)]
+        with EdgeBuffer(spill_edges, spill_dir) as edges:
+            for line_number, lines in _chunks(stream, chunk_lines, pending):
+                rows = _read_rows(lines, line_number, dtype, usecols, delimiter)
+                edges.append(rows['u'], rows['v'], rows['w'] if weight_col is not None else None)
+            graph = build_graph(edges, directed, keep_parallel=keep_parallel, output_path=output_path)
+    return graph, {"format": "edgelist"}
+
+
+def _is_int(token):
+    try:
+        int(token)
+        return True
+    except ValueError:
+        return False
+
+
+def _find_column(names, candidates, default):
+    for name in candidates:
+        if name in names:
+            return names.index(name)
+    return default
+
+
+# ----------------------------------------------------------------------
+# Matrix Market (coordinate)
+# ----------------------------------------------------------------------
+def read_matrix_market(source, directed=None, keep_parallel=False, chunk_lines=200_000,
+                       spill_edges=None, spill_dir=None, output_path=None):
+    """
+    Matrix Market dạng tọa độ: "%%MatrixMarket matrix coordinate <real|integer|pattern> <symmetry>".
+    Đỉnh là 1..max(số hàng, số cột); mục (i, j, giá trị) là cạnh i -> j với trọng số giá trị
+    (pattern: trọng số 1). directed None -> general là có hướng, symmetric/skew-symmetric/hermitian
+    là vô hướng.
+    """
+    with _open_text(source) as stream:
+        banner = stream.readline().split()
+        if len(banner) < 5 or banner[0].lower() != '%%matrixmarket':
+            raise GraphImportError("Missing %%MatrixMarket header line.")
+        obj, layout, field, symmetry = (token.lower() for token in banner[1:5])
+        if obj != 'matrix' or layout != 'coordinate':
+            raise GraphImportError("Only 'matrix coordinate' Matrix Market files are supported.")
+        if field not in ('real', 'integer', 'pattern'):
+            raise GraphImportError(f"Unsupported Matrix Market field: {field}")
+
+        consumed, size_line = _data_lines(stream, ('%',))
+        try:
+            num_rows, num_cols, _ = (int(token) for token in size_line.split()[:3])
+        except (AttributeError, ValueError):
+            raise GraphImportError("Invalid Matrix Market size line.")
+
+        is_directed = symmetry == 'general' if directed is None else directed
+        has_value = field != 'pattern'
+        dtype = [('u', np.int64), ('v', np.int64), ('w', np.float64)][:3 if has_value else 2]
+        with EdgeBuffer(spill_edges, spill_dir) as edges:
+            for line_number, lines in _chunks(stream, chunk_lines, line_number=len(consumed) + 2):
+                rows = _read_rows(lines, line_number, dtype, tuple(range(len(dtype))), comments='%')
+                edges.append(rows['u'], rows['v'], rows['w'] if has_value else None)
+            graph = build_graph(edges, is_directed, node_ids=np.arange(1, max(num_rows, num_cols) + 1),
+                                keep_parallel=keep_parallel, output_path=output_path)
+    return graph, {"format": "matrix_market", "symmetry": symmetry}
+
+
+# ----------------------------------------------------------------------
+# DIMACS (bài toán đường đi ngắn nhất "sp" và luồng cực đại "max")
+# ----------------------------------------------------------------------
+def read_dimacs(source, directed=None, keep_parallel=False, chunk_lines=200_000,
+                spill_edges=None, spill_dir=None, output_path=None):
+    """
+    DIMACS: "c" chú thích, "p sp|max n m", "n id s|t" (nguồn/đích của bài toán luồng),
+    "a u v trọng_số|dung_lượng". Đỉnh 1..n; có hướng trừ khi directed=False.
+    info gồm "problem" và (bài toán max) "source", "sink".
+    """
+    info = {"format": "dimacs"}
+    with _open_text(source) as stream:
+        n = None
+        pending = []
+        line_number = 0
+        for line in stream:
+            line_number += 1
+            parts = line.split()
+            if not parts or parts[0] == 'c':
+                continue
+            if parts[0] == 'p':
+                if len(parts) < 4:
+                    raise GraphImportError("Invalid DIMACS problem line.")
+                info["problem"] = parts[1]
+                n = _dimacs_int(parts[2], line_number)
+            elif parts[0] == 'n' and len(parts) >= 3:
+                info["source" if parts[2] == 's' else "sink"] = _dimacs_int(parts[1], line_number)
+            elif parts[0] == 'a':
+                pending.append(line)
+                break
+            else:
+                raise GraphImportError(f"Unexpected DIMACS line: {line.strip()}")
+        if n is None:
+            raise GraphImportError("Missing DIMACS problem line ('p ...').")
+        if not pending:
+            line_number += 1 # Không có cung nào: khối đầu (rỗng) bắt đầu sau dòng cuối
+
+        dtype = [('u', np.int64), ('v', np.int64), ('w', np.float64)]
+        with EdgeBuffer(spill_edges, spill_dir) as edges:
+            for first_line, lines in _chunks(stream, chunk_lines, pending, line_number):
+                rows = _read_rows(lines, first_line, dtype, (1, 2, 3), comments='c')
+                edges.append(rows['u'], rows['v'], rows['w'])
+            # Max flow cộng dồn cung song song -> giữ nguyên chúng
+            keep_parallel = keep_parallel or info.get("problem") == 'max'
+            graph = build_graph(edges, directed is not False, node_ids=np.arange(1, n + 1),
+                                keep_parallel=keep_parallel, output_path=output_path)
+    return graph, info
+
+
+def _dimacs_int(token, line_number):
+    try:
+        return int(token)
+    except ValueError:
+        raise GraphImportError(f"Line {line_number}: expected an integer, got '{token}'.")
+
+
+# ----------------------------------------------------------------------
+# GraphML
+# ----------------------------------------------------------------------
+def read_graphml(source, directed=None, keep_parallel=False, chunk_edges=200_000,
+                 spill_edges=None, spill_dir=None, output_path=None):
+    """
+    GraphML đọc tuần tự bằng iterparse (mỗi <node>/<edge> bị xóa ngay sau khi đọc).
+    - <data> có attr.name "weight" (cạnh), "x", "y", "label" (đỉnh) được dùng nếu có.
+    - ID đỉnh là số nguyên -> giữ nguyên; ngược lại đánh số 0, 1, 2... theo thứ tự xuất hiện
+      và dùng ID gốc làm nhãn.
+    directed None -> theo edgedefault của <graph>.
+    """
+    keys = {}
+    index = {}
+    names, xs, ys, labels = [], [], [], []
+    src_chunk, dst_chunk, weight_chunk = [], [], []
+    is_directed = directed
+
+    def vertex(name):
+        i = index.get(name)
+        if i is None:
+            i = index[name] = len(names)
+            names.append(name)
+            xs.append(0.0)
+            ys.append(0.0)
+            labels.append(None)
+        return i
+
+    def data_values(elem):
+        values = {}
+        for child in elem:
+            if _local_name(child.tag) == 'data':
+                values[keys.get(child.get('key'), child.get('key'))] = (child.text or '').strip()
+        return values
+
+    with EdgeBuffer(spill_edges, spill_dir) as edges:
+        parent = None
+        try:
+            for event, elem in ET.iterparse(source, events=('start', 'end')):
+                tag = _local_name(elem.tag)
+                if event == 'start':
+                    if tag == 'graph':
+                        parent = elem
+                        if is_directed is None:
+                            is_directed = elem.get('edgedefault', 'directed') == 'directed'
+                    continue
+                if tag == 'key':
+                    keys[elem.get('id')] = (elem.get('attr.name') or elem.get('id') or '').lower()
+                elif tag == 'node':
+                    i = vertex(elem.get('id'))
+                    values = data_values(elem)
+                    xs[i] = _float_or(values.get('x'), 0.0)
+                    ys[i] = _float_or(values.get('y'), 0.0)
+                    labels[i] = values.get('label')
+                elif tag == 'edge':
+                    src_chunk.append(vertex(elem.get('source')))
+                    dst_chunk.append(vertex(elem.get('target')))
+                    weight_chunk.append(_float_or(data_values(elem).get('weight'), 1.0))
+                    if len(src_chunk) >= chunk_edges:
+                        edges.append(src_chunk, dst_chunk, weight_chunk)
+                        src_chunk, dst_chunk, weight_chunk = [], [], []
+                else:
+                    continue
+                if parent is not None:
+                    parent.clear() # Thả các phần tử đã đọc (giữ bộ nhớ ~ một khối)
+        except ET.ParseError as e:
+            raise GraphImportError(f"Invalid GraphML: {e}")
+        edges.append(src_chunk, dst_chunk, weight_chunk)
+
+        # ID toàn số nguyên -> dùng luôn; ngược lại dùng chỉ số và giữ ID gốc làm nhãn
+        if all(name is not None and _is_int(name) for name in names):
+            node_ids = np.array([int(name) for name in names], dtype=np.int64)
+        else:
+            node_ids = np.arange(len(names), dtype=np.int64)
+        labels = [label if label is not None else str(name) for label, name in zip(labels, names)]
+
+        # Cạnh đang lưu theo chỉ số xuất hiện -> đổi sang ID đỉnh
+        src_idx, dst_idx, weights = edges.columns()
+        with EdgeBuffer(spill_edges, spill_dir) as id_edges:
+            for start in range(0, len(src_idx), chunk_edges):
+                stop = start + chunk_edges
+                id_edges.append(node_ids[src_idx[start:stop]], node_ids[dst_idx[start:stop]], weights[start:stop])
+            graph = build_graph(id_edges, bool(is_directed), node_ids=node_ids, xs=xs, ys=ys, labels=labels,
+                                keep_parallel=keep_parallel, output_path=output_path)
+    return graph, {"format": "graphml"}
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _float_or(value, default):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+# ----------------------------------------------------------------------
+# Chọn importer theo tên định dạng / đuôi file
+# ----------------------------------------------------------------------
+IMPORTERS = {
+    'edgelist': read_edge_list,
+    'matrix_market': read_matrix_market,
+    'dimacs': read_dimacs,
+    'graphml': read_graphml,
+}
+
+FORMAT_EXTENSIONS = {
+    '.txt': 'edgelist', '.edges': 'edgelist', '.el': 'edgelist', '.csv': 'edgelist', '.tsv': 'edgelist',
+    '.mtx': 'matrix_market', '.mm': 'matrix_market',
+    '.gr': 'dimacs', '.dimacs': 'dimacs', '.max': 'dimacs',
+    '.graphml': 'graphml', '.xml': 'graphml',
+}
+
+
+def guess_format(filename):
+    """Tên định dạng theo đuôi file (None nếu không nhận ra)."""
+    return FORMAT_EXTENSIONS.get(os.path.splitext(filename or '')[1].lower())
+
+
+def import_graph(source, fmt=None, filename=None, **options):
+    """
+    Nạp đồ thị từ file theo định dạng fmt (hoặc đoán theo filename / đường dẫn).
+    options được chuyển cho importer tương ứng (directed, keep_parallel, output_path...).
+    Trả về (CSRGraph, info).
+    """
+    if fmt is None:
+        fmt = guess_format(filename or (source if isinstance(source, (str, os.PathLike)) else None))
+    importer = IMPORTERS.get(fmt)
+    if importer is None:
+        raise GraphImportError(f"Unknown graph file format: {fmt}")
+    return importer(source, **options)
@@ -0,0 +1,144 @@
+# file graph/ingest.py
+from itertools import repeat
+from operator import itemgetter
+
+import numpy as np
+
+from .csr_graph import CSRGraph
+
+
+class GraphPayloadError(ValueError):
+    """Dữ liệu đồ thị gửi lên không hợp lệ (thiếu trường, ID không phải số...)."""
+
+
+def parse_graph_payload(data, directed=None, keep_parallel=False):
+    """
+    Đọc JSON đồ thị của Frontend ({nodes, edges, directed}) thẳng vào CSRGraph,
+    không qua GraphModel/Vertex/Edge. Mỗi trường được tách thành một cột và
+    chuyển kiểu hàng loạt bằng NumPy; chỉ khi cột có giá trị lạ mới xử lý từng phần tử.
+
+    Quy tắc giống rebuild_graph cũ:
+    - Trọng số ép về int, thiếu/lỗi thì mặc định 1.
+    - Bỏ cạnh trỏ tới đỉnh không tồn tại và cạnh trùng (vô hướng: (u, v) trùng (v, u)).
+    directed: ghi đè cờ 'directed' trong payload (vd. Max Flow luôn xét có hướng).
+    keep_parallel: giữ cạnh song song (Max Flow cộng dồn dung lượng của chúng).
+    """
+    if not isinstance(data, dict):
+        raise GraphPayloadError("Graph data must be an object with 'nodes' and 'edges'.")
+    nodes = data.get('nodes') or []
+    edges = data.get('edges') or []
+    is_directed = bool(data.get('directed', False)) if directed is None else directed
+
+    node_ids = _int_column(nodes, 'id')
+    xs = _float_column(nodes, 'x')
+    ys = _float_column(nodes, 'y')
+    labels = [str(node.get('label', node['id'])) for node in nodes]
+
+    src_ids = _int_column(edges, 'source')
+    dst_ids = _int_column(edges, 'target')
+    weights = _weight_column(edges)
+
+    # Sắp đỉnh theo ID; ID trùng thì giữ lần xuất hiện đầu tiên
+    node_ids, first = np.unique(node_ids, return_index=True)
+    xs, ys = xs[first], ys[first]
+    labels = [labels[i] for i in first.tolist()]
+
+    src, dst, keep = map_edge_ids(node_ids, src_ids, dst_ids, is_directed, dedupe=not keep_parallel)
+    return CSRGraph(node_ids, src, dst, weights[keep], is_directed, xs=xs, ys=ys, labels=labels)
+
+
+def map_edge_ids(node_ids, src_ids, dst_ids, is_directed, dedupe=True):
+    """
+    Ánh xạ ID đầu/cuối cạnh sang chỉ số đỉnh (node_ids đã sắp xếp), bỏ cạnh
+    trỏ tới đỉnh không tồn tại và (nếu dedupe) cạnh trùng (vô hướng: (u, v) trùng (v, u)).
+    Trả về (src, dst, keep) với keep là chỉ số các cạnh được giữ lại.
+    """
+    n = len(node_ids)
+    if n == 0 or len(src_ids) == 0:
+        empty = np.empty(0, dtype=np.int32)
+        return empty, empty, np.empty(0, dtype=np.int64)
+
+    low, span = int(node_ids[0]), int(node_ids[-1] - node_ids[0]) + 1
+    if span <= 4 * n:
+        # ID gần liên tục (trường hợp thường gặp): tra bảng O(1) thay cho tìm nhị phân
+        lookup = np.full(span + 1, -1, dtype=np.int64) # Ô cuối: ID ngoài khoảng
+        lookup[node_ids - low] = np.arange(n)
+        src = lookup[np.clip(src_ids - low, -1, span) % (span + 1)]
+        dst = lookup[np.clip(dst_ids - low, -1, span) % (span + 1)]
+        valid = (src >= 0) & (dst >= 0)
+    else:
+        src = np.searchsorted(node_ids, src_ids)
+        dst = np.searchsorted(node_ids, dst_ids)
+        valid = (src < n) & (dst < n)
+        valid[valid] &= (node_ids[src[valid]] == src_ids[valid]) & (node_ids[dst[valid]] == dst_ids[valid])
+    keep = np.flatnonzero(valid)
+    src, dst = src[keep], dst[keep]
+    if not dedupe:
+        return src.astype(np.int32), dst.astype(np.int32), keep
+
+    lo, hi = (src, dst) if is_directed else (np.minimum(src, dst), np.maximum(src, dst))
+    _, first = np.unique(lo.astype(np.int64) * n + hi, return_index=True)
+    first.sort()
+    return src[first].astype(np.int32), dst[first].astype(np.int32), keep[first]
+
+
+def _column(items, key):
+    try:
+        return list(map(itemgetter(key), items))
+    except KeyError:
+        raise GraphPayloadError(f"Missing field '{key}' in graph data.")
+    except TypeError:
+        raise GraphPayloadError("Graph nodes and edges must be objects.")
+
+
+def _int_column(items, key):
+    """Cột số nguyên (ID đỉnh, đầu/cuối cạnh)."""
+    values = _column(items, key)
+    try:
+        return np.array(values, dtype=np.int64)
+    except (TypeError, ValueError):
+        pass
+    # Cột lẫn kiểu (vd. "3" và 3.0): chuyển từng phần tử như int() cũ
+    try:
+        return np.array([int(v) for v in values], dtype=np.int64)
+    except (TypeError, ValueError):
+        raise GraphPayloadError(f"Field '{key}' must contain integer IDs.")
+
+
+def _float_column(items, key):
+    """Cột tọa độ; thiếu hoặc lỗi thì coi là 0."""
+    values = list(map(dict.get, items, repeat(key), repeat(0)))
+    try:
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.array([_to_float(v) for v in values], dtype=np.float64)
+
+
+def _weight_column(edges):
+    """Cột trọng số: ép int, thiếu/lỗi thì mặc định 1 (như rebuild_graph)."""
+    values = list(map(dict.get, edges, repeat('weight')))
+    column = np.array(values)
+    if column.dtype.kind in 'iu':
+        return column.astype(np.float64)
+    if column.dtype.kind == 'f':
+        column = np.trunc(column)
+        column[~np.isfinite(column)] = 1
+        return column
+    return np.array([parse_weight(v) for v in values], dtype=np.float64)
+
+
+def parse_weight(value):
+    """Trọng số của một cạnh: ép int, thiếu/lỗi thì mặc định 1."""
+    if value is None:
+        return 1
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        return 1
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
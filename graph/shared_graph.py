@@ -0,0 +1,69 @@
+# file graph/shared_graph.py
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .csr_graph import CSRGraph
+
+# Các mảng của CSRGraph được đưa vào shared memory (nhãn chỉ dùng để hiển thị -> bỏ qua)
+SHARED_ARRAYS = ('node_ids', 'src', 'dst', 'weights', 'offsets', 'targets',
+                 'slot_weights', 'slot_edges', 'xs', 'ys')
+
+
+class SharedCSRGraph:
+    """
+    Bản sao các mảng của một CSRGraph trong MỘT khối shared memory, để nhiều tiến trình
+    con dùng chung đồ thị mà không phải pickle/sao chép hay dựng lại chỉ mục CSR.
+
+    - handle: mô tả nhỏ, pickle được (tên khối, vị trí từng mảng, hướng...) để gửi cho tiến trình con.
+    - attach_graph(handle) (phía tiến trình con) -> (CSRGraph chỉ đọc, khối shared memory).
+    Tiến trình tạo ra khối chịu trách nhiệm close() (giải phóng khối); dùng được với "with".
+    """
+
+    def __init__(self, csr):
+        layout = []
+        total = 0
+        for name in SHARED_ARRAYS:
+            array = getattr(csr, name)
+            if array is None:
+                continue
+            total = (total + 7) // 8 * 8 # Căn lề 8 byte cho int64/float64
+            layout.append((name, array.dtype.str, array.shape, total))
+            total += array.nbytes
+
+        self._shm = shared_memory.SharedMemory(create=True, size=max(total, 1))
+        for name, dtype, shape, offset in layout:
+            view = np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=offset)
+            view[...] = getattr(csr, name)
+
+        self.handle = {
+            "name": self._shm.name,
+            "layout": layout,
+            "is_directed": csr.is_directed,
+            "integer_weights": csr.integer_weights,
+        }
+
+    def close(self):
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_graph(handle):
+    """
+    Mở khối shared memory theo handle và dựng CSRGraph trỏ thẳng vào đó (không sao chép).
+    Trả về (graph, shm): giữ shm sống cùng graph, gọi shm.close() khi không dùng nữa.
+    """
+    shm = shared_memory.SharedMemory(name=handle["name"])
+    arrays = {}
+    for name, dtype, shape, offset in handle["layout"]:
+        array = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+        array.flags.writeable = False
+        arrays[name] = array
+    graph = CSRGraph.from_arrays(arrays, handle["is_directed"], handle["integer_weights"])
+    return graph, shm
@@ -0,0 +1,5 @@
+# file tests/conftest.py
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,37 @@
+# file tests/test_all_pairs.py
+import numpy as np
+
+from app import app, matrix_cache
+
+N = 1500
+
+
+def chain_payload(n):
+    return {
+        "directed": False,
+        "nodes": [{"id": i, "x": 0, "y": 0, "label": str(i)} for i in range(n)],
+        "edges": [{"source": i, "target": i + 1, "weight": 1} for i in range(n - 1)],
+    }
+
+
+def test_pages_are_slices_of_one_computation():
+    client = app.test_client()
+    graph_id = client.post('/api/graphs', json={"graph": chain_payload(N)}).get_json()["graph_id"]
+    matrix_cache.clear()
+    before = matrix_cache.stats()
+
+    rows = []
+    for row_start in (0, 100, 1400):
+        page = client.post('/api/all_pairs', json={
+            "graphId": graph_id, "method": "dijkstra", "rowStart": row_start, "rowCount": 100,
+        }).get_json()
+        assert page["status"] == "success" and page["row_start"] == row_start
+        rows.extend(page["rows"])
+
+    stats = matrix_cache.stats()
+    assert stats["misses"] - before["misses"] == 1
+    assert stats["hits"] - before["hits"] == 2
+    assert stats["entries"] == 1
+    # Chuỗi 0-1-...-(N-1): khoảng cách = |i - j|
+    expected = np.abs(np.subtract.outer(np.r_[0:200, 1400:1500], np.arange(N)))
+    assert np.array_equal(np.array(rows), expected)
@@ -0,0 +1,98 @@
+# file tests/test_binary_format.py
+import io
+import struct
+
+import numpy as np
+import pytest
+
+from graph.binary_format import graph_to_bytes, read_graph, save_graph, load_graph_file, GraphFormatError
+from graph.binary_format import _HEADER, _ENTRY
+from graph.ingest import parse_graph_payload
+
+PAYLOAD = {
+    "directed": False,
+    "nodes": [{"id": i * 10, "x": i, "y": -i, "label": f"đỉnh {i}"} for i in range(5)],
+    "edges": [{"source": 0, "target": 10, "weight": 2}, {"source": 10, "target": 20, "weight": 3},
+              {"source": 20, "target": 20, "weight": 1}, {"source": 30, "target": 40, "weight": 7}],
+}
+
+
+def assert_same_graph(a, b):
+    assert a.content_hash() == b.content_hash()
+    assert a.is_directed == b.is_directed and a.integer_weights == b.integer_weights
+    for name in ('node_ids', 'src', 'dst', 'weights', 'offsets', 'targets', 'slot_weights', 'slot_edges', 'xs', 'ys'):
+        assert np.array_equal(getattr(a, name), getattr(b, name)), name
+    assert a.labels == b.labels
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_bytes_round_trip(directed):
+    graph = parse_graph_payload(PAYLOAD, directed=directed)
+    assert_same_graph(graph, read_graph(graph_to_bytes(graph)))
+
+
+def test_file_round_trip_uses_mmap(tmp_path):
+    graph = parse_graph_payload(PAYLOAD)
+    path = tmp_path / "g.graph"
+    save_graph(graph, path)
+    loaded = load_graph_file(str(path))
+    assert_same_graph(graph, loaded)
+    assert not loaded.src.flags.writeable # View chỉ đọc trên vùng nhớ của file
+
+
+def test_stream_without_fileno_is_read_into_memory():
+    graph = parse_graph_payload(PAYLOAD)
+    assert_same_graph(graph, load_graph_file(io.BytesIO(graph_to_bytes(graph))))
+
+
+def test_empty_graph_round_trip():
+    graph = parse_graph_payload({"nodes": [], "edges": []})
+    loaded = read_graph(graph_to_bytes(graph))
+    assert loaded.num_vertices == 0 and loaded.num_edges == 0
+
+
+def test_rejects_bad_magic_and_version():
+    data = bytearray(graph_to_bytes(parse_graph_payload(PAYLOAD)))
+    with pytest.raises(GraphFormatError, match="Not a binary graph file"):
+        read_graph(b"JUNK" + bytes(data[4:]))
+    struct.pack_into('<H', data, 4, 99)
+    with pytest.raises(GraphFormatError, match="version"):
+        read_graph(bytes(data))
+
+
+def test_rejects_truncated_file():
+    data = graph_to_bytes(parse_graph_payload(PAYLOAD))
+    with pytest.raises(GraphFormatError):
+        read_graph(data[:len(data) - 8])
+    with pytest.raises(GraphFormatError):
+        read_graph(data[:40])
+
+
+def section_position(data, name):
+    """Vị trí (byte) của section name, đọc từ bảng mục lục sau header."""
+    count = _HEADER.unpack_from(data)[5]
+    for k in range(count):
+        raw_name, _, position, _ = _ENTRY.unpack_from(data, _HEADER.size + k * _ENTRY.size)
+        if raw_name.rstrip(b'\0').decode('ascii') == name:
+            return position
+    raise KeyError(name)
+
+
+def test_rejects_out_of_range_indices():
+    data = bytearray(graph_to_bytes(parse_graph_payload(PAYLOAD)))
+    struct.pack_into('<i', data, section_position(data, 'dst'), 99) # Chỉ số đỉnh không tồn tại
+    with pytest.raises(GraphFormatError, match="out-of-range"):
+        read_graph(bytes(data))
+
+
+def test_rejects_broken_offsets():
+    data = bytearray(graph_to_bytes(parse_graph_payload(PAYLOAD)))
+    struct.pack_into('<i', data, section_position(data, 'offsets'), 1)
+    with pytest.raises(GraphFormatError, match="offsets"):
+        read_graph(bytes(data))
+
+
+def test_labels_with_nul_are_rejected():
+    payload = dict(PAYLOAD, nodes=[{"id": 1, "x": 0, "y": 0, "label": "a\0b"}], edges=[])
+    with pytest.raises(GraphFormatError):
+        graph_to_bytes(parse_graph_payload(payload))
@@ -0,0 +1,55 @@
+# file tests/test_graph_store.py
+import pytest
+
+from app import app
+from graph.graph_store import GraphStore, GraphNotFoundError
+from graph.ingest import parse_graph_payload
+
+PAYLOAD = {
+    "directed": False,
+    "nodes": [{"id": i, "x": 0, "y": 0, "label": str(i)} for i in range(3)],
+    "edges": [{"source": 0, "target": 1, "weight": 1}, {"source": 1, "target": 2, "weight": 1}],
+}
+
+
+def test_each_upload_gets_its_own_entry():
+    store = GraphStore()
+    first = store.put(parse_graph_payload(PAYLOAD))
+    second = store.put(parse_graph_payload(PAYLOAD))
+    assert first != second
+
+    edited = store.get(first).without_edge(0, 1)
+    store.replace(first, edited)
+    assert store.get(first).num_edges == 1
+    assert store.get(second).num_edges == 2
+
+
+def test_delete_and_missing_id():
+    store = GraphStore()
+    graph_id = store.put(parse_graph_payload(PAYLOAD))
+    store.delete(graph_id)
+    with pytest.raises(GraphNotFoundError):
+        store.get(graph_id)
+
+
+def test_lru_eviction():
+    store = GraphStore(max_graphs=2)
+    ids = [store.put(parse_graph_payload(PAYLOAD)) for _ in range(3)]
+    with pytest.raises(GraphNotFoundError):
+        store.get(ids[0])
+    assert store.get(ids[2]).num_edges == 2
+
+
+def test_edit_then_reupload_round_trip():
+    client = app.test_client()
+    graph_id = client.post('/api/graphs', json={"graph": PAYLOAD}).get_json()["graph_id"]
+    client.delete(f'/api/graphs/{graph_id}/edges/0/1')
+
+    uploaded = client.post('/api/graphs', json={"graph": PAYLOAD}).get_json()
+    assert uploaded["graph_id"] != graph_id
+    assert uploaded["num_edges"] == 2
+
+    fresh = client.post('/api/bfs', json={"graphId": uploaded["graph_id"], "startId": 0}).get_json()
+    edited = client.post('/api/bfs', json={"graphId": graph_id, "startId": 0}).get_json()
+    assert fresh["path"] == [0, 1, 2]
+    assert edited["path"] == [0]
@@ -0,0 +1,166 @@
+# file tests/test_history.py
+import random
+
+import pytest
+
+from graph.graph_model import GraphModel
+from graph.history import GraphHistory
+
+
+def snapshot(graph):
+    """Toàn bộ trạng thái quan sát được, kể cả thứ tự đỉnh, cạnh và chỉ mục kề."""
+    pair = lambda edge: (edge.start_vertex.id, edge.end_vertex.id, edge.weight)
+    return (
+        [(v.id, v.x, v.y, v.label) for v in graph.vertices.values()],
+        [pair(edge) for edge in graph.edges],
+        [(u, [pair(edge) for edge in adjacent]) for u, adjacent in graph.out_edges.items()],
+        [(v, [pair(edge) for edge in adjacent]) for v, adjacent in graph.in_edges.items()],
+        [[n for n, _ in graph.get_neighbors(v)] for v in graph.vertices],
+        graph.next_id,
+    )
+
+
+def square():
+    graph = GraphModel()
+    for _ in range(4):
+        graph.add_vertex(0, 0)
+    for u, v in [(0, 1), (1, 2), (2, 3), (0, 3)]:
+        graph.add_edge(u, v)
+    return graph
+
+
+# --- GraphHistory ---
+def test_limit_drops_oldest_steps():
+    history = GraphHistory(limit=3)
+    for i in range(5):
+        history.record(('op', i))
+    assert len(history) == 3
+    assert [history.undo_step() for _ in range(3)] == [[('op', 4)], [('op', 3)], [('op', 2)]]
+    assert history.undo_step() is None
+
+
+def test_limit_zero_disables_history():
+    history = GraphHistory(limit=0)
+    history.record(('op', 1))
+    assert len(history) == 0 and not history.can_undo
+
+
+def test_group_makes_one_step_and_nests():
+    history = GraphHistory()
+    with history.group():
+        history.record(('op', 1))
+        with history.group():
+            history.record(('op', 2))
+        history.record(('op', 3))
+    with history.group():
+        pass # Khối rỗng không tạo bước
+    assert len(history) == 1
+    assert history.undo_step() == [('op', 1), ('op', 2), ('op', 3)]
+
+
+def test_new_step_drops_redo_branch_and_its_checkpoints():
+    history = GraphHistory()
+    history.record(('op', 1))
+    history.record(('op', 2))
+    on_branch = history.checkpoint()
+    history.undo_step()
+    assert history.steps_to(on_branch) == 1
+    history.record(('op', 3)) # Cùng phiên bản nhưng khác nhánh
+    with pytest.raises(ValueError):
+        history.steps_to(on_branch)
+
+
+def test_checkpoints_trimmed_by_limit_or_clear_are_invalid():
+    history = GraphHistory(limit=2)
+    start = history.checkpoint()
+    history.record(('op', 1))
+    kept = history.checkpoint()
+    history.record(('op', 2))
+    history.record(('op', 3))
+    with pytest.raises(ValueError):
+        history.steps_to(start)
+    assert history.steps_to(kept) == -2
+    history.clear()
+    with pytest.raises(ValueError):
+        history.steps_to(kept)
+
+
+# --- GraphModel: _revert / _replay ---
+def test_undo_remove_vertex_restores_order():
+    graph = square()
+    before = snapshot(graph)
+    state = graph.get_state()
+    graph.remove_vertex(1)
+    graph.restore_state(state)
+    assert snapshot(graph) == before
+    assert [(e.start_vertex.id, e.end_vertex.id) for e in graph.edges] == [(0, 1), (1, 2), (2, 3), (0, 3)]
+
+
+def test_undo_remove_edge_restores_order():
+    graph = square()
+    before = snapshot(graph)
+    graph.remove_edge(graph.get_edge(1, 2))
+    graph.undo()
+    assert snapshot(graph) == before
+
+
+def test_add_edges_is_one_step():
+    graph = square()
+    before = snapshot(graph)
+    graph.add_edges([(0, 2), (1, 3), (0, 2)])
+    assert graph.undo() and snapshot(graph) == before
+    assert graph.redo() and len(graph.edges) == 6
+
+
+def test_clear_and_move_round_trip():
+    graph = square()
+    before = snapshot(graph)
+    graph.move_vertex(2, 5, 7)
+    moved = snapshot(graph)
+    graph.clear()
+    assert snapshot(graph) == ([], [], [], [], [], 0)
+    graph.undo()
+    assert snapshot(graph) == moved
+    graph.undo()
+    assert snapshot(graph) == before
+    graph.redo()
+    graph.redo()
+    assert snapshot(graph) == ([], [], [], [], [], 0)
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_random_edits_restore_every_state_exactly(directed):
+    rng = random.Random(7 if directed else 3)
+    graph = GraphModel(is_directed=directed)
+    states = []
+    for step in range(300):
+        states.append((graph.get_state(), snapshot(graph)))
+        ids = list(graph.vertices)
+        action = rng.random()
+        if action < 0.25 or len(ids) < 2:
+            graph.add_vertex(rng.random(), rng.random())
+        elif action < 0.55:
+            graph.add_edges([(rng.choice(ids), rng.choice(ids), rng.randint(1, 9)) for _ in range(3)])
+        elif action < 0.7:
+            graph.remove_vertex(rng.choice(ids))
+        elif action < 0.85 and graph.edges:
+            graph.remove_edge(rng.choice(graph.edges))
+        elif action < 0.9:
+            graph.move_vertex(rng.choice(ids), rng.random(), rng.random())
+        elif action < 0.93:
+            graph.clear()
+        else:
+            graph.undo() # Lần sửa tiếp theo bỏ nhánh redo -> checkpoint trên nhánh đó hết hạn
+    final_state, final = graph.get_state(), snapshot(graph)
+
+    valid = 0
+    for state, expected in reversed(states):
+        try:
+            graph.restore_state(state)
+        except ValueError:
+            continue
+        valid += 1
+        assert snapshot(graph) == expected
+    assert valid > 50
+    graph.restore_state(final_state) # Quay lại được cả trạng thái cuối bằng redo
+    assert snapshot(graph) == final
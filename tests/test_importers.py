@@ -0,0 +1,115 @@
+# file tests/test_importers.py
+import io
+
+import numpy as np
+import pytest
+
+from graph.importers import import_graph, guess_format, GraphImportError
+
+
+def load(text, fmt, **options):
+    return import_graph(io.BytesIO(text.encode('utf-8')), fmt, **options)
+
+
+def edges_of(graph):
+    return graph.edge_pairs(range(graph.num_edges))
+
+
+def test_csv_edge_list_with_header_and_comments():
+    graph, info = load("# chú thích\nfrom,to,cost\n1,2,3\n2,3,4.5\n", 'edgelist')
+    assert info == {"format": "edgelist"}
+    assert graph.node_ids.tolist() == [1, 2, 3]
+    assert edges_of(graph) == [(1, 2), (2, 3)]
+    assert graph.weights.tolist() == [3.0, 4.5]
+    assert not graph.is_directed
+
+
+def test_edge_list_duplicates_and_keep_parallel():
+    text = "% konect\n1 2\n2 3\n2 3\n3 2\n"
+    assert load(text, 'edgelist')[0].num_edges == 2
+    assert load(text, 'edgelist', keep_parallel=True)[0].num_edges == 4
+    assert load(text, 'edgelist', directed=True)[0].num_edges == 3
+
+
+def test_edge_list_reports_line_of_bad_row():
+    with pytest.raises(GraphImportError):
+        load("1 2\n2 x\n", 'edgelist')
+
+
+def test_chunked_and_spilled_import_matches_in_memory(tmp_path):
+    rng = np.random.default_rng(0)
+    rows = rng.integers(0, 50, (500, 2))
+    text = "".join(f"{u} {v} {w}\n" for (u, v), w in zip(rows.tolist(), rng.integers(1, 9, 500).tolist()))
+    expected, _ = load(text, 'edgelist')
+    spilled, _ = load(text, 'edgelist', chunk_lines=7, spill_edges=10, spill_dir=str(tmp_path))
+    assert spilled.content_hash() == expected.content_hash()
+    on_disk, _ = load(text, 'edgelist', output_path=str(tmp_path / "g.graph"))
+    assert on_disk.content_hash() == expected.content_hash()
+
+
+def test_matrix_market_symmetric_is_undirected():
+    text = "%%MatrixMarket matrix coordinate real symmetric\n% x\n4 4 2\n1 2 5\n3 1 2\n"
+    graph, info = load(text, 'matrix_market')
+    assert info["symmetry"] == "symmetric"
+    assert graph.node_ids.tolist() == [1, 2, 3, 4] # Đỉnh cô lập 4 vẫn được giữ
+    assert edges_of(graph) == [(1, 2), (3, 1)]
+    assert not graph.is_directed
+
+
+def test_matrix_market_pattern_general():
+    graph, _ = load("%%MatrixMarket matrix coordinate pattern general\n2 2 1\n2 1\n", 'matrix_market')
+    assert graph.is_directed and graph.weights.tolist() == [1.0]
+
+
+def test_matrix_market_rejects_array_layout():
+    with pytest.raises(GraphImportError):
+        load("%%MatrixMarket matrix array real general\n2 2\n1\n2\n3\n4\n", 'matrix_market')
+
+
+def test_dimacs_max_flow_problem():
+    graph, info = load("c x\np max 4 3\nn 1 s\nn 4 t\na 1 2 5\na 2 4 3\na 1 4 1\n", 'dimacs')
+    assert info == {"format": "dimacs", "problem": "max", "source": 1, "sink": 4}
+    assert graph.is_directed
+    assert edges_of(graph) == [(1, 2), (2, 4), (1, 4)]
+    assert graph.weights.tolist() == [5.0, 3.0, 1.0]
+
+
+def test_dimacs_requires_problem_line():
+    with pytest.raises(GraphImportError):
+        load("a 1 2 5\n", 'dimacs')
+
+
+GRAPHML = """<?xml version="1.0"?>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+  <key id="d0" for="edge" attr.name="weight"/>
+  <key id="d1" for="node" attr.name="x"/>
+  <graph edgedefault="undirected">
+    <node id="a"><data key="d1">1.5</data></node>
+    <node id="b"/>
+    <edge source="a" target="b"><data key="d0">2.5</data></edge>
+    <edge source="b" target="c"/>
+  </graph>
+</graphml>"""
+
+
+def test_graphml_string_ids_become_labels():
+    graph, _ = load(GRAPHML, 'graphml')
+    assert graph.node_ids.tolist() == [0, 1, 2]
+    assert graph.labels == ['a', 'b', 'c']
+    assert graph.xs.tolist() == [1.5, 0.0, 0.0]
+    assert edges_of(graph) == [(0, 1), (1, 2)]
+    assert graph.weights.tolist() == [2.5, 1.0]
+    assert not graph.is_directed
+
+
+def test_graphml_parse_error():
+    with pytest.raises(GraphImportError):
+        load("<graphml><graph>", 'graphml')
+
+
+def test_format_guessing_and_unknown_format():
+    assert guess_format("road.gr") == 'dimacs'
+    assert guess_format("A.MTX") == 'matrix_market'
+    assert guess_format("graph.bin") is None
+    with pytest.raises(GraphImportError):
+        load("1 2\n", 'pajek')
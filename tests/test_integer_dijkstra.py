@@ -0,0 +1,61 @@
+# file tests/test_integer_dijkstra.py
+import random
+
+import numpy as np
+import pytest
+
+from algorithms.dijkstra import dijkstra_tree_csr
+from algorithms.integer_dijkstra import select_queue, queue_supports
+from graph.csr_graph import CSRGraph
+
+
+@pytest.mark.parametrize("weights, expected", [
+    ([0, 1, 1, 0], 'dial'),  # 0/1: Dial, không phải 0-1 BFS (xem đầu integer_dijkstra.py)
+    ([1, 1, 1], 'dial'),
+    ([3, 1000], 'dial'),
+    ([3, 1001], 'heap'),
+    ([1.5, 2], 'heap'),
+    ([-1, 2], 'heap'),
+    ([], 'dial'),
+])
+def test_select_queue(weights, expected):
+    assert select_queue(np.array(weights, dtype=np.float64)) == expected
+
+
+def test_queue_supports():
+    weights = np.array([0, 1, 2], dtype=np.float64)
+    assert queue_supports('dial', weights) and queue_supports('radix', weights)
+    assert not queue_supports('zero_one', weights)
+    assert not queue_supports('dial', np.array([0.5]))
+    assert not queue_supports('bogus', weights)
+
+
+@pytest.mark.parametrize("low, high, queues", [
+    (0, 1, ('auto', 'dial', 'radix', 'zero_one')),
+    (1, 20, ('auto', 'dial', 'radix')),
+    (0, 10 ** 7, ('auto', 'radix')),
+])
+def test_integer_queues_match_heapq_distances(low, high, queues):
+    rng = random.Random(high)
+    for trial in range(150):
+        n, m = rng.randint(1, 25), rng.randint(0, 70)
+        pairs = np.array([(rng.randrange(n), rng.randrange(n)) for _ in range(m)], dtype=np.int64).reshape(-1, 2)
+        weights = np.array([rng.randint(low, high) for _ in range(m)], dtype=np.float64)
+        graph = CSRGraph(np.arange(n), pairs[:, 0], pairs[:, 1], weights, bool(trial % 2))
+        expected = dijkstra_tree_csr(graph, 0, queue='heap')
+        for queue in queues:
+            tree = dijkstra_tree_csr(graph, 0, queue=queue)
+            assert np.array_equal(tree.distances, expected.distances), queue
+            if low > 0:
+                # Trọng số dương: cùng quy tắc chốt đỉnh -> cùng cây đường đi
+                assert np.array_equal(tree.predecessors, expected.predecessors), queue
+
+
+@pytest.mark.parametrize("queue", ['heap', 'dial', 'radix', 'zero_one'])
+def test_progress_reports_settled_vertices(queue):
+    n = 10_000
+    ids = np.arange(n)
+    graph = CSRGraph(ids, ids[:-1], ids[1:], np.ones(n - 1), True)
+    calls = []
+    dijkstra_tree_csr(graph, 0, queue=queue, progress=lambda name, value: calls.append((name, value)))
+    assert calls == [('vertices_settled', 4096), ('vertices_settled', 8192)]
@@ -0,0 +1,154 @@
+# file tests/test_jobs.py
+import time
+
+import pytest
+
+from app import app
+from utils.jobs import JobManager, JobNotFoundError, JobQueueFullError
+from utils.jobs import SUCCEEDED, FAILED, CANCELLED, TIMED_OUT
+
+
+# Target của job phải ở cấp module (spawn pickle theo tên)
+def add(progress, a, b):
+    progress('steps', 1)
+    return {"sum": a + b}
+
+
+def cooperative_loop(progress):
+    """Chạy mãi nhưng qua checkpoint thường xuyên -> dừng được bằng hủy / hết hạn."""
+    steps = 0
+    while True:
+        steps += 1
+        progress('steps', steps)
+        time.sleep(0.01)
+
+
+def sleeper(progress):
+    """Không bao giờ qua checkpoint -> chỉ dừng được bằng terminate()."""
+    time.sleep(60)
+
+
+def broken(progress):
+    raise RuntimeError("engine bug")
+
+
+def memory_hog(progress):
+    return {"size": len(bytearray(1024 ** 3))}
+
+
+def wait_done(manager, job, timeout=15):
+    deadline = time.monotonic() + timeout
+    version = None
+    while not job.done:
+        assert time.monotonic() < deadline, job.to_dict()
+        _, version = manager.wait_for_change(job, version, timeout=0.5)
+    return job
+
+
+@pytest.fixture
+def manager():
+    return JobManager(max_workers=1, max_pending=2, grace_seconds=0.5, poll_interval=0.05)
+
+
+def test_job_succeeds_with_result_and_progress(manager):
+    job = wait_done(manager, manager.submit('add', add, (2, 3)))
+    assert job.status == SUCCEEDED
+    assert job.result == {"sum": 5}
+    assert job.progress == {"steps": 1}
+
+
+def test_exception_marks_job_failed(manager):
+    job = wait_done(manager, manager.submit('broken', broken))
+    assert job.status == FAILED
+    assert job.error == "engine bug"
+
+
+def test_cancel_while_queued(manager):
+    running = manager.submit('sleep', sleeper)
+    queued = manager.submit('add', add, (1, 1))
+    manager.cancel(queued.id)
+    assert queued.status == CANCELLED and queued.started is None
+    manager.cancel(running.id)
+    wait_done(manager, running)
+
+
+def test_cancel_while_running_at_checkpoint(manager):
+    job = manager.submit('loop', cooperative_loop)
+    while not job.progress:
+        manager.wait_for_change(job, job.version, timeout=1)
+    manager.cancel(job.id)
+    wait_done(manager, job)
+    assert job.status == CANCELLED
+    assert job.progress["steps"] > 0 # Con tự dừng và gửi được tiến độ cuối
+
+
+def test_cancel_without_checkpoint_terminates(manager):
+    job = manager.submit('sleep', sleeper)
+    while job.status != 'running':
+        manager.wait_for_change(job, job.version, timeout=1)
+    started = time.monotonic()
+    manager.cancel(job.id)
+    wait_done(manager, job)
+    assert job.status == CANCELLED
+    assert time.monotonic() - started < 5
+
+
+def test_timeout_at_checkpoint(manager):
+    job = wait_done(manager, manager.submit('loop', cooperative_loop, timeout=0.5))
+    assert job.status == TIMED_OUT
+    assert job.error == "Job exceeded its time budget."
+
+
+def test_timeout_without_checkpoint_terminates(manager):
+    job = wait_done(manager, manager.submit('sleep', sleeper, timeout=0.3))
+    assert job.status == TIMED_OUT
+    # Hết hạn (0.3s) + grace (0.5s) rồi mới terminate
+    assert job.finished - job.started >= 0.8
+
+
+def test_memory_budget(manager):
+    job = wait_done(manager, manager.submit('hog', memory_hog, memory_limit=64 * 1024 ** 2))
+    assert job.status == FAILED
+    assert job.error == "Job exceeded its memory budget."
+
+
+def test_queue_full_and_unknown_id(manager):
+    running = manager.submit('sleep', sleeper)
+    while running.status != 'running':
+        manager.wait_for_change(running, running.version, timeout=1)
+    manager.submit('add', add, (1, 1))
+    manager.submit('add', add, (1, 1))
+    with pytest.raises(JobQueueFullError):
+        manager.submit('add', add, (1, 1))
+    with pytest.raises(JobNotFoundError):
+        manager.get('missing')
+    manager.cancel(running.id)
+    wait_done(manager, running)
+
+
+def test_spawn_start_method():
+    manager = JobManager(max_workers=1, poll_interval=0.05, start_method='spawn')
+    job = wait_done(manager, manager.submit('add', add, (4, 5)), timeout=60)
+    assert job.status == SUCCEEDED and job.result == {"sum": 9}
+
+
+def test_api_job_matches_synchronous_result():
+    client = app.test_client()
+    graph = {
+        "directed": True,
+        "nodes": [{"id": i, "x": 0, "y": 0, "label": str(i)} for i in range(4)],
+        "edges": [{"source": 0, "target": 1, "weight": 3}, {"source": 1, "target": 3, "weight": 2},
+                  {"source": 0, "target": 2, "weight": 2}, {"source": 2, "target": 3, "weight": 4}],
+    }
+    body = {"graph": graph, "sourceId": 0, "sinkId": 3}
+    job_id = client.post('/api/jobs/max_flow', json=body).get_json()["job_id"]
+    lines = client.get(f'/api/jobs/{job_id}/stream').get_data(as_text=True).splitlines()
+    assert '"type": "done"' in lines[-1] and '"job_status": "succeeded"' in lines[-1]
+    result = client.get(f'/api/jobs/{job_id}/result').get_json()
+    assert result == client.post('/api/max_flow', json=body).get_json()
+    assert result["max_flow"] == 4
+
+
+def test_api_euler_job_on_empty_graph():
+    response = app.test_client().post('/api/jobs/euler', json={"graph": {"nodes": [], "edges": []}})
+    assert response.get_json() == {"status": "error", "message": "Graph is empty."}
@@ -0,0 +1,69 @@
+# file tests/test_result_cache.py
+import numpy as np
+
+from algorithms.biconnected import biconnected_csr
+from algorithms.bipartite import bipartite_csr
+from algorithms.components import weak_components_csr
+from graph.csr_graph import CSRGraph
+from utils.result_cache import ResultCache, _result_cost
+
+
+def path_graph(n):
+    ids = np.arange(n)
+    return CSRGraph(ids, ids[:-1], ids[1:], np.ones(n - 1), False)
+
+
+def test_biconnected_result_is_priced_by_size():
+    result = biconnected_csr(path_graph(20_000))
+    assert len(result.bridges) == 19_999
+    assert _result_cost(result) > 19_999 * 2
+
+    cache = ResultCache(max_cost=10_000)
+    cache.get_or_compute("g", 'biconnected', (), lambda: result)
+    assert cache.stats()["entries"] == 0 # Lớn hơn max_cost -> không cache
+
+
+def test_bipartite_result_is_priced_by_size():
+    even = bipartite_csr(path_graph(5000))
+    assert even.is_bipartite and _result_cost(even) > 5000
+
+    ids = np.arange(5)
+    odd = bipartite_csr(CSRGraph(ids, ids, (ids + 1) % 5, np.ones(5), False))
+    assert not odd.is_bipartite
+    assert _result_cost(odd) > 5 + 5 + 6 # Màu + cạnh và đỉnh của chu trình lẻ
+
+
+def test_component_labels_are_priced_by_vertex_count():
+    labels = weak_components_csr(path_graph(5000))
+    assert labels.count == 1
+    assert _result_cost(labels) > 5000
+
+
+class Unsized:
+    pass
+
+
+def test_unsized_results_are_not_cached():
+    cache = ResultCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return Unsized()
+
+    cache.get_or_compute("g", 'opaque', (), compute)
+    cache.get_or_compute("g", 'opaque', (), compute)
+    assert len(calls) == 2
+    assert cache.stats()["entries"] == 0 and cache.stats()["rejected"] == 2
+
+    # None (vd. không tìm thấy đỉnh nguồn) và số vẫn được cache
+    assert cache.get_or_compute("g", 'none', (), lambda: None) is None
+    assert cache.get_or_compute("g", 'none', (), lambda: 1 / 0) is None
+    assert cache.get_or_compute("g", 'count', (), lambda: 3) == 3
+
+
+def test_custom_cost_hook():
+    cache = ResultCache(max_cost=100, cost=lambda result: result.nbytes)
+    cache.get_or_compute("g", 'small', (), lambda: np.zeros(4))
+    cache.get_or_compute("g", 'large', (), lambda: np.zeros(40))
+    assert cache.stats()["entries"] == 1 and cache.stats()["cost"] == 32
@@ -35,3 +35,53 @@ MODE_ALGO_KRUSKAL = "mode_algo_kruskal"
 MODE_ALGO_FLEURY = "mode_algo_fleury"
 MODE_ALGO_FORD_FULKERSON = "mode_algo_ford_fulkerson"
 MODE_ALGO_HIERHOLZER = "mode_algo_hierholzer"
+
+# Kho đồ thị phía server (upload 1 lần, chạy thuật toán theo graph_id)
+GRAPH_STORE_MAX_GRAPHS = 64                 # Số đồ thị tối đa giữ trong bộ nhớ
+GRAPH_STORE_TTL_SECONDS = 30 * 60           # Không dùng quá 30 phút -> hết hạn
+GRAPH_STORE_MAX_BYTES = 512 * 1024 * 1024   # Tổng dung lượng tối đa (ước lượng)
+
+# Cache kết quả thuật toán (theo băm nội dung đồ thị + tham số)
+RESULT_CACHE_MAX_ENTRIES = 256              # Số kết quả tối đa
+RESULT_CACHE_MAX_COST = 2_000_000           # Tổng số phần tử (list/dict/chuỗi) tối đa trong cache
+
+# Đường đi ngắn nhất mọi cặp đỉnh (ma trận n x n)
+ALL_PAIRS_MAX_VERTICES = 5000               # Ma trận float64 5000 x 5000 ~ 200MB
+ALL_PAIRS_FLOYD_MAX_VERTICES = 3000         # Floyd-Warshall chỉ dùng khi n không vượt quá mức này...
+ALL_PAIRS_DENSE_RATIO = 0.1                 # ...và số cạnh >= tỉ lệ này * n^2 (đồ thị dày)
+ALL_PAIRS_ROW_CHUNK = 100                   # Số hàng mặc định mỗi lần trả JSON
+ALL_PAIRS_CACHE_MAX_MATRICES = 4            # Ma trận đã tính giữ lại để các trang sau chỉ cắt hàng...
+ALL_PAIRS_CACHE_MAX_BYTES = 512 * 1024 ** 2 # ...trong tổng dung lượng này (cache riêng, tính theo byte)
+
+# Batch nhiều truy vấn (BFS/DFS/Dijkstra) trên cùng một đồ thị
+BATCH_MAX_QUERIES = 5000                    # Số truy vấn tối đa mỗi batch
+BATCH_MIN_PARALLEL_QUERIES = 8              # Ít truy vấn hơn -> chạy tuần tự, không mở process pool
+
+# Phản hồi NDJSON (stream): số đỉnh / cạnh tối đa trong mỗi dòng
+STREAM_CHUNK_SIZE = 1000
+
+# Trace từng bước cho hoạt cảnh (/api/trace)
+TRACE_DEFAULT_STEPS = 100_000               # Số sự kiện giữ lại mặc định
+TRACE_MAX_STEPS = 1_000_000                 # Trần của "maxSteps" client gửi lên
+
+# Nạp file đồ thị lớn (edge list, Matrix Market, DIMACS, GraphML)
+IMPORT_SPILL_EDGES = 20_000_000             # Quá số cạnh này thì cột cạnh được ghi tạm ra đĩa khi parse
+
+# Chuyển đổi biểu diễn (/api/convert)
+CONVERT_MATRIX_PAGE_SIZE = 200              # Ma trận kề dạng chữ: số hàng/cột mặc định mỗi trang khi đồ thị lớn
+CONVERT_DENSE_MAX_VERTICES = 2000           # Ma trận dày (format "dense") chỉ cho đồ thị không quá số đỉnh này
+
+# Cây khung nhỏ nhất (/api/mst)
+MST_PARALLEL_MIN_EDGES = 500_000            # Borůvka chia cạnh cho nhiều tiến trình từ số cạnh này
+
+# Dijkstra với trọng số nguyên không âm (/api/dijkstra)
+DIJKSTRA_DIAL_MAX_WEIGHT = 1000             # Trọng số lớn nhất không quá mức này -> hàng đợi xô Dial thay cho heapq
+
+# Job nền cho thuật toán chạy lâu (/api/jobs)
+JOB_MAX_WORKERS = 2                         # Số job chạy cùng lúc (mỗi job một tiến trình con)
+JOB_MAX_PENDING = 64                        # Số job chờ tối đa; quá thì từ chối
+JOB_KEEP_FINISHED = 256                     # Số job đã xong giữ lại để client lấy kết quả
+JOB_DEFAULT_TIMEOUT_SECONDS = 300           # Ngân sách thời gian mặc định mỗi job
+JOB_MAX_TIMEOUT_SECONDS = 3600              # Trần của "timeout" client gửi lên
+JOB_MEMORY_LIMIT_BYTES = 2 * 1024 ** 3      # Bộ nhớ thêm tối đa mỗi job (ngoài phần kế thừa khi fork)
+JOB_CANCEL_GRACE_SECONDS = 2.0              # Hủy / quá hạn mà chưa tới checkpoint sau chừng này giây -> terminate
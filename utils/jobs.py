@@ -0,0 +1,346 @@
+# file utils/jobs.py
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from multiprocessing.connection import wait
+
+# Trạng thái của một job
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TIMED_OUT = "timeout"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED, TIMED_OUT)
+
+
+class JobNotFoundError(KeyError):
+    """job_id không tồn tại hoặc đã bị xóa khỏi danh sách job đã xong."""
+
+    def __str__(self):
+        return f"Unknown or expired job id: {self.args[0]}"
+
+
+class JobQueueFullError(RuntimeError):
+    """Hàng đợi job đã đầy (quá max_pending job đang chờ)."""
+
+
+class JobCancelled(Exception):
+    """Ném ra tại checkpoint khi job bị hủy (hoặc hết thời gian) - thuật toán dừng giữa chừng."""
+
+
+class JobTimeout(JobCancelled):
+    pass
+
+
+class Checkpoint:
+    """
+    Hook tiến độ truyền cho thuật toán (tham số progress, giống trace): thuật toán gọi
+    progress(tên, giá trị) ở các điểm dừng tự nhiên (mỗi đường tăng luồng, mỗi 4096 đỉnh
+    được chốt...). Mỗi lần gọi:
+    - cập nhật bộ đếm tên -> giá trị;
+    - mỗi interval giây: gửi bộ đếm về tiến trình cha và là điểm hủy hợp tác
+      (job bị hủy -> JobCancelled, quá hạn -> JobTimeout).
+    """
+
+    def __init__(self, conn, cancel_event, deadline, interval=0.25, clock=time.monotonic):
+        self.counters = {}
+        self._conn = conn
+        self._cancel_event = cancel_event
+        self._deadline = deadline
+        self._interval = interval
+        self._clock = clock
+        self._last_sent = 0.0
+
+    def __call__(self, name, value):
+        self.counters[name] = value
+        now = self._clock()
+        if now - self._last_sent < self._interval:
+            return # Gọi dày đặc vẫn rẻ: chỉ gửi / kiểm tra hủy mỗi interval giây
+        self._last_sent = now
+        self._conn.send(("progress", dict(self.counters)))
+        if self._cancel_event.is_set():
+            raise JobCancelled("Job was cancelled.")
+        if self._deadline is not None and now > self._deadline:
+            raise JobTimeout("Job exceeded its time budget.")
+
+
+class Job:
+    """Một lần chạy thuật toán nền: trạng thái, tiến độ, kết quả (dict JSON) hoặc lỗi."""
+
+    def __init__(self, job_id, kind, target, args, timeout, memory_limit):
+        self.id = job_id
+        self.kind = kind
+        self.target = target
+        self.args = args
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.status = QUEUED
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.version = 0 # Tăng mỗi lần trạng thái / tiến độ đổi (cho stream)
+        # Phía tiến trình cha khi đang chạy
+        self.process = None
+        self.conn = None
+        self.cancel_event = None
+        self.kill_at = None
+
+    @property
+    def done(self):
+        return self.status in FINISHED_STATES
+
+    def to_dict(self):
+        end = self.finished or time.time()
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "job_status": self.status,
+            "progress": dict(self.progress),
+            "elapsed": round(end - self.started, 3) if self.started else 0,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """
+    Hàng đợi job chạy thuật toán dài ngoài request Flask.
+
+    - Mỗi job chạy trong một tiến trình con; tối đa max_workers job chạy cùng lúc,
+      còn lại xếp hàng FIFO (tối đa max_pending).
+    - start_method: mặc định "fork" (con kế thừa đồ thị đã parse, không pickle); nền tảng
+      không có fork (Windows) dùng "spawn" - khi đó target và args phải pickle được
+      (hàm cấp module, CSRGraph).
+    - Ngân sách mỗi job: timeout (giây) kiểm tra ở checkpoint, và giới hạn bộ nhớ
+      (RLIMIT_AS của tiến trình con, tính thêm trên phần đã dùng lúc fork).
+    - Hủy: đặt cờ cho checkpoint; thuật toán không dừng trong grace_seconds
+      (hoặc quá hạn mà không qua checkpoint nào) thì tiến trình con bị terminate().
+    - Một luồng điều phối nhận tiến độ / kết quả qua pipe và khởi chạy job chờ.
+    - Job đã xong được giữ lại tối đa keep_finished job (cũ nhất bị xóa trước).
+    """
+
+    def __init__(self, max_workers=2, max_pending=64, keep_finished=256, grace_seconds=2.0,
+                 poll_interval=0.2, start_method=None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.keep_finished = keep_finished
+        self.grace_seconds = grace_seconds
+        self.poll_interval = poll_interval
+        if start_method is None:
+            start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+        self.start_method = start_method
+        self._context = multiprocessing.get_context(start_method)
+        self._jobs = OrderedDict() # job_id -> Job
+        self._queue = []
+        self._running = []
+        self._condition = threading.Condition()
+        self._dispatcher = None
+        self._ids = itertools.count(1)
+
+    # ------------------------------------------------------------------
+    # API phía request
+    # ------------------------------------------------------------------
+    def submit(self, kind, target, args=(), timeout=None, memory_limit=None):
+        """
+        Xếp hàng target(progress, *args) (trả về dict JSON). Trả về Job (chưa chạy).
+        progress là Checkpoint (xem trên); target nên truyền nó xuống thuật toán.
+        """
+        job_id = f"{next(self._ids)}-{uuid.uuid4().hex[:12]}"
+        job = Job(job_id, kind, target, args, timeout, memory_limit)
+        with self._condition:
+            if len(self._queue) >= self.max_pending:
+                raise JobQueueFullError("Too many queued jobs, try again later.")
+            self._jobs[job_id] = job
+            self._queue.append(job)
+            self._prune()
+            self._ensure_dispatcher()
+            self._condition.notify_all()
+        return job
+
+    def get(self, job_id):
+        with self._condition:
+            if job_id not in self._jobs:
+                raise JobNotFoundError(job_id)
+            return self._jobs[job_id]
+
+    def list(self):
+        with self._condition:
+            return [job.to_dict() for job in self._jobs.values()]
+
+    def cancel(self, job_id):
+        """Hủy job: đang chờ -> bỏ khỏi hàng; đang chạy -> báo checkpoint, quá grace thì terminate."""
+        with self._condition:
+            job = self.get(job_id)
+            if job.status == QUEUED:
+                self._queue.remove(job)
+                self._finish(job, CANCELLED, error="Job was cancelled.")
+            elif job.status == RUNNING and not job.cancel_event.is_set():
+                job.cancel_event.set()
+                job.kill_at = min(job.kill_at or float('inf'), time.monotonic() + self.grace_seconds)
+            self._condition.notify_all()
+            return job
+
+    def wait_for_change(self, job, version, timeout=None):
+        """Chờ tới khi job.version khác version (hoặc hết timeout). Trả về (bản dict, version mới)."""
+        with self._condition:
+            self._condition.wait_for(lambda: job.version != version, timeout=timeout)
+            return job.to_dict(), job.version
+
+    def stats(self):
+        with self._condition:
+            return {
+                "start_method": self.start_method,
+                "queued": len(self._queue),
+                "running": len(self._running),
+                "jobs": len(self._jobs),
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+            }
+
+    # ------------------------------------------------------------------
+    # Điều phối (luồng nền)
+    # ------------------------------------------------------------------
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name="job-dispatcher", daemon=True)
+            self._dispatcher.start()
+
+    def _dispatch_loop(self):
+        while True:
+            with self._condition:
+                while self._queue and len(self._running) < self.max_workers:
+                    self._start(self._queue.pop(0))
+                if not self._running:
+                    if not self._condition.wait(timeout=30) and not self._queue:
+                        self._dispatcher = None
+                        return # Không có việc -> luồng tự kết thúc, submit sau sẽ tạo lại
+                    continue
+                connections = [job.conn for job in self._running]
+
+            ready = wait(connections, timeout=self.poll_interval)
+            with self._condition:
+                for job in list(self._running):
+                    if job.conn in ready:
+                        self._receive(job)
+                    if job.status == RUNNING:
+                        self._enforce_budget(job)
+
+    def _start(self, job):
+        parent_conn, child_conn = self._context.Pipe(duplex=False)
+        job.conn = parent_conn
+        job.cancel_event = self._context.Event()
+        job.started = time.time()
+        deadline = time.monotonic() + job.timeout if job.timeout else None
+        if deadline is not None:
+            job.kill_at = deadline + self.grace_seconds
+        job.process = self._context.Process(
+            target=_run_job, name=f"job-{job.id}",
+            args=(child_conn, job.cancel_event, deadline, job.memory_limit, job.target, job.args),
+            daemon=True,
+        )
+        # Với fork, con chỉ có luồng điều phối nhưng chép mọi khóa ở đúng trạng thái lúc fork:
+        # self._condition (đang giữ ở đây) và khóa của các đối tượng khác mà luồng request đang giữ.
+        # Con không bao giờ dùng tới self._condition; target không được đụng tới đối tượng dùng
+        # chung có khóa (result_cache, graph_store...) - xem các hàm *_job trong app.py.
+        job.process.start()
+        child_conn.close()
+        job.target = job.args = None # Tiến trình con đã giữ bản sao (fork)
+        job.status = RUNNING
+        job.version += 1
+        self._running.append(job)
+        self._condition.notify_all()
+
+    def _receive(self, job):
+        try:
+            while job.conn.poll():
+                kind, payload = job.conn.recv()
+                if kind == "progress":
+                    job.progress = payload
+                    job.version += 1
+                else:
+                    status, progress, data = payload
+                    job.progress = progress
+                    if status == SUCCEEDED:
+                        self._finish(job, SUCCEEDED, result=data)
+                    else:
+                        self._finish(job, status, error=data)
+                    return
+        except (EOFError, OSError):
+            # Tiến trình con chết mà không gửi kết quả (bị kill, hết bộ nhớ khi đang gửi...)
+            job.process.join(timeout=1)
+            status = CANCELLED if job.cancel_event.is_set() else FAILED
+            self._finish(job, status, error=f"Job process exited unexpectedly (exit code {job.process.exitcode}).")
+        self._condition.notify_all()
+
+    def _enforce_budget(self, job):
+        """Thuật toán không qua checkpoint kịp sau khi bị hủy / quá hạn -> dừng cưỡng bức."""
+        if job.kill_at is None or time.monotonic() < job.kill_at:
+            return
+        job.process.terminate()
+        job.process.join(timeout=1)
+        if job.cancel_event.is_set():
+            self._finish(job, CANCELLED, error="Job was cancelled.")
+        else:
+            self._finish(job, TIMED_OUT, error="Job exceeded its time budget.")
+
+    def _finish(self, job, status, result=None, error=None):
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished = time.time()
+        job.version += 1
+        if job in self._running:
+            self._running.remove(job)
+            job.conn.close()
+            if job.process.is_alive():
+                job.process.join(timeout=1)
+            job.process = job.conn = None
+        self._prune()
+        self._condition.notify_all()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(len(finished) - self.keep_finished, 0)]:
+            del self._jobs[job_id]
+
+
+def _run_job(conn, cancel_event, deadline, memory_limit, target, args):
+    """Thân tiến trình con: đặt giới hạn bộ nhớ, chạy target, gửi (trạng thái, tiến độ, kết quả/lỗi)."""
+    progress = Checkpoint(conn, cancel_event, deadline)
+    try:
+        if memory_limit:
+            _limit_memory(memory_limit)
+        outcome = (SUCCEEDED, target(progress, *args))
+    except JobTimeout as e:
+        outcome = (TIMED_OUT, str(e))
+    except JobCancelled as e:
+        outcome = (CANCELLED, str(e))
+    except MemoryError:
+        outcome = (FAILED, "Job exceeded its memory budget.")
+    except Exception as e:
+        outcome = (FAILED, str(e) or type(e).__name__)
+    try:
+        conn.send(("done", (outcome[0], progress.counters, outcome[1])))
+    except MemoryError:
+        conn.send(("done", (FAILED, progress.counters, "Job exceeded its memory budget.")))
+    conn.close()
+
+
+def _limit_memory(extra_bytes):
+    """RLIMIT_AS = vùng nhớ ảo hiện có (kế thừa khi fork) + extra_bytes. Không hỗ trợ -> bỏ qua."""
+    try:
+        import resource
+
+        with open('/proc/self/statm') as f:
+            current = int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+        limit = current + extra_bytes
+        resource.setrlimit(resource.RLIMIT_AS, (limit, resource.getrlimit(resource.RLIMIT_AS)[1]))
+    except (ImportError, OSError, ValueError):
+        pass
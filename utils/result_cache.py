@@ -0,0 +1,113 @@
+# file utils/result_cache.py
+import threading
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    Cache kết quả thuật toán (LRU), khóa = (băm nội dung đồ thị, tên thuật toán, tham số).
+
+    - max_entries: số kết quả tối đa.
+    - max_cost: tổng "kích thước" tối đa, tính bằng số phần tử của các list/dict/chuỗi
+      trong kết quả (kết quả lớn hơn giới hạn này không được cache).
+    - cost: hàm tính kích thước một kết quả (mặc định _result_cost), vd. số byte của ma trận.
+      Kết quả không tính được kích thước (cost trả về None) không được cache.
+    - invalidate(graph_hash): xóa mọi kết quả của một đồ thị (khi đồ thị bị sửa).
+    """
+
+    def __init__(self, max_entries=256, max_cost=2_000_000, cost=None):
+        self.max_entries = max_entries
+        self.max_cost = max_cost
+        self._cost = cost or _result_cost
+        self._entries = OrderedDict() # khóa -> (kết quả, cost)
+        self._by_graph = {}           # graph_hash -> set(khóa)
+        self._total_cost = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejected = 0 # Kết quả không cache (quá lớn hoặc không rõ kích thước)
+
+    def get_or_compute(self, graph_hash, algo, params, compute):
+        """Trả kết quả đã cache, hoặc gọi compute() rồi lưu lại."""
+        key = (graph_hash, algo, tuple(params))
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+            self.misses += 1
+
+        result = compute() # Chạy ngoài khóa để không chặn các request khác
+        self.put(key, result)
+        return result
+
+    def put(self, key, result):
+        cost = self._cost(result)
+        if cost is None or cost > self.max_cost:
+            self.rejected += 1
+            return
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (result, cost)
+            self._by_graph.setdefault(key[0], set()).add(key)
+            self._total_cost += cost
+            while len(self._entries) > self.max_entries or self._total_cost > self.max_cost:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, graph_hash):
+        """Xóa toàn bộ kết quả của một đồ thị. Trả về số mục đã xóa."""
+        with self._lock:
+            keys = self._by_graph.pop(graph_hash, set())
+            for key in keys:
+                self._discard(key)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_graph.clear()
+            self._total_cost = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "cost": self._total_cost,
+                "max_entries": self.max_entries,
+                "max_cost": self.max_cost,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "rejected": self.rejected,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _discard(self, key):
+        """Gỡ một khóa (gọi khi đã giữ khóa)."""
+        _, cost = self._entries.pop(key)
+        self._total_cost -= cost
+        keys = self._by_graph.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_graph[key[0]]
+
+
+def _result_cost(result):
+    """
+    Kích thước ước lượng của kết quả: dict -> 1 + tổng số phần tử các list/dict/chuỗi cấp 1;
+    đối tượng có len() (list, chuỗi, cây đường đi...) -> 1 + len(); None / số -> 1.
+    Đối tượng khác -> None (không cache): lớp kết quả muốn được cache phải định nghĩa __len__
+    là tổng số phần tử nó giữ, thay vì bị coi là nhỏ.
+    """
+    if isinstance(result, dict):
+        return 1 + sum(len(v) if isinstance(v, (list, dict, str)) else 1 for v in result.values())
+    if hasattr(result, '__len__'):
+        return 1 + len(result)
+    if result is None or isinstance(result, (bool, int, float)):
+        return 1
+    return None
@@ -0,0 +1,192 @@
+# file utils/trace.py
+import math
+import struct
+from array import array
+
+# Mã sự kiện (1 byte). a, b: ID đỉnh; value: khoảng cách / trọng số / lượng luồng
+DISCOVER = 1    # a được phát hiện (b: đỉnh cha)
+VISIT = 2       # a được lấy ra khỏi hàng đợi / chốt khoảng cách
+RELAX = 3       # nới lỏng cạnh a -> b, khoảng cách mới = value
+PUSH = 4        # đẩy a vào heap với khóa value (b: đỉnh đi tới a)
+POP = 5         # lấy a khỏi heap với khóa value
+UNION = 6       # hợp hai tập có gốc a và b
+SELECT = 7      # chọn cạnh a - b (trọng số value) vào kết quả
+REJECT = 8      # bỏ cạnh a - b (tạo chu trình / đỉnh đã thăm)
+AUGMENT = 9     # tăng luồng value dọc đường từ a tới b (theo sau là các sự kiện FLOW)
+FLOW = 10       # cạnh a -> b nhận thêm value đơn vị luồng
+
+EVENT_NAMES = {
+    DISCOVER: "discover", VISIT: "visit", RELAX: "relax", PUSH: "push", POP: "pop",
+    UNION: "union", SELECT: "select", REJECT: "reject", AUGMENT: "augment", FLOW: "flow",
+}
+
+_NO_VERTEX = -(1 << 63)
+_HAS_B = 0x10
+_HAS_VALUE = 0x20
+_FLOAT_VALUE = 0x40
+
+
+class Trace:
+    """
+    Bản ghi từng bước của một thuật toán, dùng cho hoạt cảnh phía Frontend.
+
+    Mỗi sự kiện là một "delta" nhỏ (mã, a, b, value) thay vì trạng thái cả đồ thị, lưu
+    trong các mảng array (~25 byte/sự kiện). max_steps giới hạn số sự kiện được giữ:
+    vượt quá thì truncated = True và các sự kiện sau chỉ được đếm (thuật toán vẫn chạy hết).
+
+    Hai cách xuất:
+    - to_columns(): JSON dạng cột {"code": [...], "a": [...], "b": [...], "value": [...]}.
+    - to_bytes(): nhị phân gọn, a/b mã hóa chênh lệch với sự kiện trước bằng varint
+      (10^6 sự kiện thường chỉ vài MB). Giải mã: decode_trace().
+    """
+
+    def __init__(self, max_steps=None):
+        self.max_steps = max_steps
+        self.codes = array('B')
+        self.first = array('q')
+        self.second = array('q')
+        self.values = array('d')
+        self.total_steps = 0
+        self.truncated = False
+
+    def __len__(self):
+        return len(self.codes)
+
+    def emit(self, code, a, b=None, value=None):
+        self.total_steps += 1
+        if self.max_steps is not None and len(self.codes) >= self.max_steps:
+            self.truncated = True
+            return
+        self.codes.append(code)
+        self.first.append(a)
+        self.second.append(_NO_VERTEX if b is None else b)
+        self.values.append(math.nan if value is None else value)
+
+    # --- Tên gọi theo ngữ nghĩa (thuật toán chỉ cần gọi các hàm này) ---
+    def discover(self, v, parent=None):
+        self.emit(DISCOVER, v, parent)
+
+    def visit(self, v):
+        self.emit(VISIT, v)
+
+    def relax(self, u, v, distance):
+        self.emit(RELAX, u, v, distance)
+
+    def push(self, v, key, via=None):
+        self.emit(PUSH, v, via, key)
+
+    def pop(self, v, key):
+        self.emit(POP, v, None, key)
+
+    def union(self, root_a, root_b):
+        self.emit(UNION, root_a, root_b)
+
+    def select(self, u, v, weight):
+        self.emit(SELECT, u, v, weight)
+
+    def reject(self, u, v, weight):
+        self.emit(REJECT, u, v, weight)
+
+    def augment(self, path, amount):
+        """Một đường tăng luồng: AUGMENT(đầu, cuối, lượng) rồi FLOW cho từng cạnh trên đường."""
+        self.emit(AUGMENT, path[0], path[-1], amount)
+        for u, v in zip(path, path[1:]):
+            self.emit(FLOW, u, v, amount)
+
+    # --- Xuất ---
+    def to_columns(self):
+        b = self.second.tolist()
+        values = self.values.tolist()
+        return {
+            "code": self.codes.tolist(),
+            "a": self.first.tolist(),
+            "b": [None if x == _NO_VERTEX else x for x in b],
+            "value": [None if v != v else _compact_number(v) for v in values],
+        }
+
+    def to_bytes(self):
+        """
+        b"TRC1" | uint32 số sự kiện | uint8 truncated | các sự kiện:
+        1 byte (mã | cờ) | varint zigzag(a - a trước) | [varint zigzag(b - b trước)]
+        | [varint zigzag(value) hoặc float64 nếu value không nguyên].
+        """
+        out = bytearray(b"TRC1")
+        out += struct.pack('<IB', len(self.codes), 1 if self.truncated else 0)
+        prev_a = prev_b = 0
+        pack_double = struct.Struct('<d').pack
+        for code, a, b, value in zip(self.codes, self.first, self.second, self.values):
+            flags = code
+            if b != _NO_VERTEX:
+                flags |= _HAS_B
+            if value == value:
+                flags |= _HAS_VALUE
+                if not _is_small_integer(value):
+                    flags |= _FLOAT_VALUE
+            out.append(flags)
+            _write_varint(out, a - prev_a)
+            prev_a = a
+            if flags & _HAS_B:
+                _write_varint(out, b - prev_b)
+                prev_b = b
+            if flags & _HAS_VALUE:
+                if flags & _FLOAT_VALUE:
+                    out += pack_double(value)
+                else:
+                    _write_varint(out, int(value))
+        return bytes(out)
+
+
+def decode_trace(data):
+    """Giải mã to_bytes() -> (list (mã, a, b, value), truncated). b/value vắng mặt -> None."""
+    if data[:4] != b"TRC1":
+        raise ValueError("Not a trace stream.")
+    count, truncated = struct.unpack_from('<IB', data, 4)
+    pos = 9
+    prev_a = prev_b = 0
+    events = []
+    for _ in range(count):
+        flags = data[pos]
+        pos += 1
+        delta, pos = _read_varint(data, pos)
+        prev_a += delta
+        b = value = None
+        if flags & _HAS_B:
+            delta, pos = _read_varint(data, pos)
+            prev_b += delta
+            b = prev_b
+        if flags & _HAS_VALUE:
+            if flags & _FLOAT_VALUE:
+                value = struct.unpack_from('<d', data, pos)[0]
+                pos += 8
+            else:
+                value, pos = _read_varint(data, pos)
+        events.append((flags & 0x0F, prev_a, b, value))
+    return events, bool(truncated)
+
+
+def _is_small_integer(value):
+    return math.isfinite(value) and value == int(value) and abs(value) <= 2 ** 53
+
+
+def _compact_number(value):
+    return int(value) if _is_small_integer(value) else value
+
+
+def _write_varint(out, n):
+    n = -2 * n - 1 if n < 0 else 2 * n # zigzag: số âm nhỏ -> số dương nhỏ
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(data, pos):
+    shift = result = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            break
+        shift += 7
+    return -(result + 1) // 2 if result & 1 else result // 2, pos